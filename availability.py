@@ -0,0 +1,272 @@
+# availability.py
+import threading
+import time
+from bisect import insort
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+# Opening hours per weekday (Mon=0), minutes since midnight; None = closed
+BUSINESS_HOURS = {day: (8 * 60, 19 * 60) for day in range(7)}
+
+
+def to_minutes(value):
+    """TIME column value (timedelta from mysql.connector, time, or 'HH:MM[:SS]') -> minutes."""
+    if isinstance(value, timedelta):
+        return int(value.total_seconds()) // 60
+    if isinstance(value, str):
+        parts = [int(p) for p in value.split(":")]
+        return parts[0] * 60 + parts[1]
+    return value.hour * 60 + value.minute
+
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+
+@dataclass
+class Slot:
+    """An open booking window; employee_id is the staff member it was found free for."""
+    day: date
+    start: int  # minutes since midnight
+    end: int
+    employee_id: int = None
+
+    @property
+    def start_time(self):
+        return format_minutes(self.start)
+
+    @property
+    def end_time(self):
+        return format_minutes(self.end)
+
+    def __str__(self):
+        return f"{self.day:%a %Y-%m-%d}  {self.start_time[:5]}-{self.end_time[:5]}"
+
+
+class IntervalIndex:
+    """Busy intervals of one resource on one day, sorted by start (minutes)."""
+    def __init__(self):
+        self.intervals = []
+
+    def add(self, start, end):
+        insort(self.intervals, (start, end))
+
+    def conflicts(self, start, end, closed=False):
+        """
+        True if [start, end] overlaps a busy interval. closed=True also treats
+        touching intervals as overlapping, matching prevent_overbooking's BETWEEN.
+        """
+        for busy_start, busy_end in self.intervals:
+            if busy_start > end:
+                break
+            if closed:
+                if start <= busy_end and end >= busy_start:
+                    return True
+            elif start < busy_end and end > busy_start:
+                return True
+        return False
+
+
+class DaySchedule:
+    """Per-employee and per-vehicle interval indexes for one day."""
+    def __init__(self, day):
+        self.day = day
+        self.employees = {}    # EmployeeID -> IntervalIndex
+        self.vehicles = {}     # VehicleID -> IntervalIndex (includes canceled rows, like the trigger)
+        self.unassigned = IntervalIndex()  # active appointments without an employee
+        self.loaded_at = time.monotonic()
+
+    def add(self, employee_id, vehicle_id, start, end, canceled=False):
+        self.vehicles.setdefault(vehicle_id, IntervalIndex()).add(start, end)
+        if canceled:
+            return
+        if employee_id is None:
+            self.unassigned.add(start, end)
+        else:
+            self.employees.setdefault(employee_id, IntervalIndex()).add(start, end)
+
+    def free_employee(self, employee_ids, start, end):
+        """An employee free for [start, end) after leaving room for unassigned work, else None."""
+        free = [e for e in employee_ids
+                if e not in self.employees or not self.employees[e].conflicts(start, end)]
+        overlapping_unassigned = sum(1 for s, e in self.unassigned.intervals if start < e and end > s)
+        if len(free) <= overlapping_unassigned:
+            return None
+        return free[overlapping_unassigned]
+
+
+class AvailabilityEngine:
+    """
+    Finds open appointment slots without waiting for prevent_overbooking to reject them.
+
+    A day's (or week's) appointments are read with one range query on
+    idx_appts_date and kept as per-employee and per-vehicle interval indexes;
+    slot searches then run in memory. A slot is open when the vehicle has no
+    appointment touching it (the trigger's inclusive BETWEEN rule) and an active
+    employee is free for it. Loaded days are re-read after `max_age` seconds.
+
+    Args:
+        get_connection: callable returning a mysql connection
+        granularity: minutes between candidate start times
+        max_age: seconds a loaded day is trusted
+        hours: {weekday: (open_minute, close_minute) or None}
+    """
+    APPOINTMENTS_QUERY = """
+        SELECT AppointmentDate, EmployeeID, VehicleID, StartTime, EndTime, Status
+        FROM Appointments
+        WHERE AppointmentDate >= %s AND AppointmentDate < %s
+    """
+
+    def __init__(self, get_connection, granularity=15, max_age=30, hours=None):
+        self.get_connection = get_connection
+        self.granularity = granularity
+        self.max_age = max_age
+        self.hours = hours or BUSINESS_HOURS
+        self._lock = threading.RLock()
+        self._days = {}
+        self.services = []    # [(ServiceID, name, minutes, price)]
+        self.addons = []      # [(AddOnID, name, minutes, price)]
+        self.employee_ids = []
+
+    # ---------- Loading (worker thread) ----------
+    def _query(self, sql, params=()):
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+            cur.close()
+            return rows
+        finally:
+            conn.close()
+
+    def load_catalog(self):
+        """Read services, add-ons and active employees (small tables)."""
+        services = self._query("SELECT ServiceID, ServiceName, IFNULL(EstimatedTime, 0), BasePrice "
+                               "FROM Services WHERE Active ORDER BY ServiceName")
+        addons = self._query("SELECT AddOnID, AddOnName, IFNULL(EstimatedAdditionalTime, 0), Price "
+                             "FROM ServiceAddOns WHERE Active ORDER BY AddOnName")
+        employees = self._query("SELECT EmployeeID FROM Employees WHERE Active ORDER BY EmployeeID")
+        with self._lock:
+            self.services = [tuple(r) for r in services]
+            self.addons = [tuple(r) for r in addons]
+            self.employee_ids = [r[0] for r in employees]
+        return self
+
+    def load(self, start_day, days=7):
+        """Load appointments for [start_day, start_day + days) into the index."""
+        rows = self._query(self.APPOINTMENTS_QUERY, (start_day, start_day + timedelta(days=days)))
+        schedules = {start_day + timedelta(days=i): DaySchedule(start_day + timedelta(days=i))
+                     for i in range(days)}
+        for day, employee_id, vehicle_id, start, end, status in rows:
+            schedules[day].add(employee_id, vehicle_id, to_minutes(start), to_minutes(end),
+                               canceled=(status == "canceled"))
+        with self._lock:
+            self._days.update(schedules)
+
+    def _schedule(self, day):
+        with self._lock:
+            schedule = self._days.get(day)
+        if schedule is None or time.monotonic() - schedule.loaded_at > self.max_age:
+            self.load(day - timedelta(days=day.weekday()))  # the whole week in one query
+            with self._lock:
+                schedule = self._days[day]
+        return schedule
+
+    def invalidate(self, catalog=True):
+        """Drop the cached schedules and, unless catalog is False, the services, add-ons and employees."""
+        with self._lock:
+            self._days.clear()
+            if catalog:
+                self.services, self.addons, self.employee_ids = [], [], []
+
+    # ---------- Searching ----------
+    def duration(self, service_ids=(), addon_ids=()):
+        """Minutes needed: Services.EstimatedTime plus add-on time, rounded up to the granularity."""
+        minutes = sum(m for sid, _, m, _ in self.services if sid in service_ids)
+        minutes += sum(m for aid, _, m, _ in self.addons if aid in addon_ids)
+        minutes = max(minutes, self.granularity)
+        return -(-minutes // self.granularity) * self.granularity
+
+    def open_slots(self, day, duration, vehicle_id=None, not_before=None, limit=None):
+        """Open slots on `day` for a job of `duration` minutes, earliest first."""
+        hours = self.hours.get(day.weekday())
+        if not hours or not self.employee_ids:
+            return []
+        opening, closing = hours
+        schedule = self._schedule(day)
+        vehicle = schedule.vehicles.get(vehicle_id) if vehicle_id is not None else None
+
+        start = opening
+        if not_before is not None and day == not_before.date():
+            now = not_before.hour * 60 + not_before.minute
+            start = max(start, -(-now // self.granularity) * self.granularity)
+
+        slots = []
+        while start + duration <= closing:
+            end = start + duration
+            if vehicle is None or not vehicle.conflicts(start, end, closed=True):
+                employee = schedule.free_employee(self.employee_ids, start, end)
+                if employee is not None:
+                    slots.append(Slot(day, start, end, employee))
+                    if limit and len(slots) >= limit:
+                        break
+            start += self.granularity
+        return slots
+
+    def next_slots(self, duration, vehicle_id=None, after=None, count=5, horizon_days=60):
+        """The next `count` open slots from `after` (default now), looking up to horizon_days ahead."""
+        after = after or datetime.now()
+        slots = []
+        day = after.date()
+        for _ in range(horizon_days):
+            slots += self.open_slots(day, duration, vehicle_id, not_before=after, limit=count - len(slots))
+            if len(slots) >= count:
+                break
+            day += timedelta(days=1)
+        return slots
+
+    # ---------- Booking ----------
+    def book(self, slot, vehicle_id, service_ids=(), addon_ids=(), customer_id=None):
+        """
+        Insert the appointment and its service / add-on lines in one transaction.
+        The vehicle's owner is used when customer_id is None. Returns the new AppointmentID;
+        database errors (e.g. prevent_overbooking after a concurrent booking) are raised.
+        """
+        prices = {sid: price for sid, _, _, price in self.services}
+        addon_prices = {aid: price for aid, _, _, price in self.addons}
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            if customer_id is None:
+                cur.execute("SELECT CustomerID FROM Vehicles WHERE VehicleID = %s", (vehicle_id,))
+                row = cur.fetchone()
+                if row is None:
+                    raise ValueError(f"Vehicle {vehicle_id} does not exist.")
+                customer_id = row[0]
+            cur.execute("""INSERT INTO Appointments
+                    (CustomerID, VehicleID, EmployeeID, AppointmentDate, StartTime, EndTime, Status)
+                    VALUES (%s,%s,%s,%s,%s,%s,'scheduled')""",
+                        (customer_id, vehicle_id, slot.employee_id, slot.day, slot.start_time, slot.end_time))
+            appointment_id = cur.lastrowid
+            if service_ids:
+                cur.executemany("INSERT INTO AppointmentServices (AppointmentID, ServiceID, ActualPrice) "
+                                "VALUES (%s,%s,%s)",
+                                [(appointment_id, sid, prices.get(sid)) for sid in service_ids])
+            if addon_ids:
+                cur.executemany("INSERT INTO AppointmentAddOns (AppointmentID, AddOnID, ActualPrice) "
+                                "VALUES (%s,%s,%s)",
+                                [(appointment_id, aid, addon_prices.get(aid)) for aid in addon_ids])
+            conn.commit()
+            cur.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        with self._lock:
+            schedule = self._days.get(slot.day)
+            if schedule is not None:
+                schedule.add(slot.employee_id, vehicle_id, slot.start, slot.end)
+        return appointment_id
@@ -0,0 +1,412 @@
+# benchmark.py
+"""
+Latency benchmark for page loads and dashboard refreshes.
+
+    python benchmark.py --sizes 1000,10000,100000 --repeats 20 --json results.json
+    python benchmark.py --no-generate --compare results_main.json
+
+For each dataset size it (re)generates the data (generate_data.py; this replaces
+every row in --database), then drives the real page loaders and dashboard
+actions in a Tk window. A run lasts from the call until the background runner
+is idle and Tk has processed pending draws. Each run's time is split into:
+  • sql        - time inside cursor.execute / fetch* (worker threads)
+  • python     - the rest of the background work (row processing)
+  • widget     - Tk-thread time building pages and applying results
+  • matplotlib - canvas draws
+Background work can overlap, so the parts need not add up to the wall time.
+
+Results (p50 / p95 / p99 / mean, in ms) are printed and optionally saved as
+JSON; --compare flags scenarios whose p50 or p95 got worse than --tolerance.
+Without a DISPLAY it starts Xvfb itself (or run it under xvfb-run).
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import tkinter as tk
+from datetime import datetime
+
+PARTS = ("wall", "sql", "python", "widget", "matplotlib")
+
+
+# ---------- Virtual display ----------
+def ensure_display():
+    """Start Xvfb on a free display when there is no DISPLAY; returns the display name."""
+    if os.environ.get("DISPLAY") or sys.platform.startswith("win") or sys.platform == "darwin":
+        return os.environ.get("DISPLAY")
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        raise SystemExit("No DISPLAY and Xvfb not found; install Xvfb or run under xvfb-run.")
+    for number in range(99, 199):
+        if not os.path.exists(f"/tmp/.X{number}-lock"):
+            break
+    display = f":{number}"
+    proc = subprocess.Popen([xvfb, display, "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    atexit.register(proc.terminate)
+    for _ in range(50):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            break
+        time.sleep(0.1)
+    os.environ["DISPLAY"] = display
+    return display
+
+
+# ---------- Timing ----------
+class Timings:
+    """
+    Thread-safe totals for one run: sql, matplotlib, worker (all background work)
+    and tk (all Tk-thread work), in seconds.
+    """
+    RAW = ("sql", "matplotlib", "worker", "tk")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.totals = dict.fromkeys(self.RAW, 0.0)
+
+    def reset(self):
+        with self._lock:
+            self.totals = dict.fromkeys(self.RAW, 0.0)
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.totals[name] += seconds
+
+    def finish(self, wall):
+        """Per-part milliseconds for the run, deriving python / widget from the raw totals."""
+        with self._lock:
+            t = self.totals
+            return {"wall": wall * 1000, "sql": t["sql"] * 1000,
+                    "python": max(t["worker"] - t["sql"], 0) * 1000,
+                    "widget": max(t["tk"] - t["matplotlib"], 0) * 1000,
+                    "matplotlib": t["matplotlib"] * 1000}
+
+
+class TimedCursor:
+    def __init__(self, cursor, timings):
+        self._cursor = cursor
+        self._timings = timings
+
+    def _timed(self, name):
+        method = getattr(self._cursor, name)
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._timings.add("sql", time.perf_counter() - start)
+        return call
+
+    def __getattr__(self, name):
+        if name in ("execute", "executemany", "fetchone", "fetchmany", "fetchall", "callproc"):
+            return self._timed(name)
+        if name == "stored_results":
+            return lambda: [TimedCursor(r, self._timings) for r in self._cursor.stored_results()]
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class TimedConnection:
+    def __init__(self, conn, timings):
+        self._conn = conn
+        self._timings = timings
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._conn.cursor(*args, **kwargs), self._timings)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _wrap(owner, name, timings, part):
+    """Replace owner.name with a version that adds its duration to `part`; returns an undo callable."""
+    original = getattr(owner, name)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            timings.add(part, time.perf_counter() - start)
+    setattr(owner, name, timed)
+    return lambda: setattr(owner, name, original)
+
+
+# ---------- Harness ----------
+class Bench:
+    """Tk root plus the app wired to instrumented connections."""
+    def __init__(self, app, warm=False):
+        from dashboard import DashboardFrame
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from task_runner import BackgroundRunner
+
+        self.app = app
+        self.warm = warm
+        self.timings = Timings()
+        self.root = tk.Tk()
+        self.root.geometry("1400x900")
+        self.frame = tk.Frame(self.root)
+        self.frame.pack(fill="both", expand=True)
+        self.runner = BackgroundRunner(self.root, poll_ms=5)
+        app.runner = self.runner
+
+        pooled = app.get_connection
+        app.get_connection = lambda: TimedConnection(pooled(), self.timings)
+        self.get_connection = app.get_connection
+        # Streamed reports and exports use their own connections
+        dedicated = app.open_dedicated_connection
+        app.open_dedicated_connection = lambda: TimedConnection(dedicated(), self.timings)
+
+        self._undo = [
+            lambda: setattr(app, "get_connection", pooled),
+            lambda: setattr(app, "open_dedicated_connection", dedicated),
+            _wrap(BackgroundRunner, "_invoke", self.timings, "tk"),
+            _wrap(FigureCanvasTkAgg, "draw", self.timings, "matplotlib"),
+        ]
+        original_run = BackgroundRunner._run
+        timings = self.timings
+        def timed_run(runner, task, fn, args, pass_task):
+            start = time.perf_counter()
+            try:
+                return original_run(runner, task, fn, args, pass_task)
+            finally:
+                timings.add("worker", time.perf_counter() - start)
+        BackgroundRunner._run = timed_run
+        self._undo.append(lambda: setattr(BackgroundRunner, "_run", original_run))
+
+        self.dashboard_class = DashboardFrame
+        self.dashboard = None
+        self.pages = None
+        self.settled = lambda: True  # extra "work finished" check for wait_idle()
+
+    def close(self):
+        for undo in self._undo:
+            undo()
+        self.runner.shutdown()
+        self.root.destroy()
+
+    def wait_idle(self, timeout=120):
+        deadline = time.perf_counter() + timeout
+        self.root.update()
+        while self.runner.is_busy() or not self.settled():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("background work did not finish")
+            self.root.update()
+            time.sleep(0.001)
+        self.settled = lambda: True
+        self.root.update_idletasks()
+
+    def _clear_caches(self):
+        if not self.warm:
+            self.app.row_cache.clear()
+            self.app.dashboard_cache.clear()
+
+    def measure(self, action):
+        """Run action() once on the Tk thread and return its per-part timings in ms."""
+        self._clear_caches()
+        self.wait_idle()
+        self.timings.reset()
+        start = time.perf_counter()
+        action()
+        self.timings.add("tk", time.perf_counter() - start)
+        self.wait_idle()
+        return self.timings.finish(time.perf_counter() - start)
+
+    # ---------- Scenarios ----------
+    def page(self, loader):
+        """Build a page from scratch (what a first visit, or one after eviction, costs)."""
+        def build():
+            self.app.clear_frame(self.frame)
+            loader(self.frame)
+        return build
+
+    def page_switch(self):
+        """Switch between two already-built pages (PageManager.show on a fresh page)."""
+        if self.pages is None or not self.pages.container.winfo_exists():
+            from page_manager import PageManager
+            self.app.clear_frame(self.frame)
+            container = tk.Frame(self.frame)
+            container.pack(fill="both", expand=True)
+            self.pages = PageManager(container)
+            self.pages.add("customers", self.app.load_customers)
+            self.pages.add("payments", self.app.load_payments)
+            for name in ("payments", "customers"):
+                self.pages.show(name)
+                self.wait_idle()
+        self.pages.show("payments" if self.pages.current == "customers" else "customers")
+
+    def reports(self):
+        self.app.clear_frame(self.frame)
+        self.app.load_reports(self.frame)
+        controls = [w for w in self.frame.winfo_children() if isinstance(w, tk.Frame)][0]
+        entry = next(w for w in controls.winfo_children() if isinstance(w, tk.Entry))
+        button = next(w for w in controls.winfo_children()
+                      if isinstance(w, tk.Button) and w.cget("text") == "Run Report")
+        stats = [w for w in self.frame.winfo_children() if isinstance(w, tk.Label)][-1]
+        entry.insert(0, "30")
+        button.invoke()
+        # Rows are inserted progressively after the worker finishes; wait for the last slice
+        self.settled = lambda: "loading" not in stats.cget("text")
+
+    def dashboard_open(self):
+        self.app.clear_frame(self.frame)
+        self.dashboard = self.dashboard_class(self.frame, get_connection=self.get_connection,
+                                              get_is_dark=lambda: True, runner=self.runner,
+                                              cache=self.app.dashboard_cache)
+        self.dashboard.pack(fill="both", expand=True)
+        self.dashboard.refresh_all()
+
+    def dashboard_refresh(self):
+        if self.dashboard is None or not self.dashboard.winfo_exists():
+            self.dashboard_open()
+            self.wait_idle()
+        self.dashboard.refresh_all()
+
+    def dashboard_service_mix(self):
+        if self.dashboard is None or not self.dashboard.winfo_exists():
+            self.dashboard_open()
+            self.wait_idle()
+        self.dashboard.chart_selector.set("Service Mix")
+        self.dashboard.on_chart_change("Service Mix")
+        # The chart switch is debounced; wait for the refresh it schedules
+        dashboard = self.dashboard
+        self.settled = lambda: not dashboard.refresh_pending
+
+    def scenarios(self):
+        app = self.app
+        return {
+            "customers": self.page(app.load_customers),
+            "vehicles": self.page(app.load_vehicles),
+            "appointments": self.page(app.load_appointments),
+            "payments": self.page(app.load_payments),
+            "pages.switch": self.page_switch,
+            "reports": self.reports,
+            "dashboard.open": self.dashboard_open,
+            "dashboard.refresh_all": self.dashboard_refresh,
+            "dashboard.service_mix": self.dashboard_service_mix,
+        }
+
+
+# ---------- Statistics ----------
+def percentile(values, p):
+    """Linear-interpolated percentile (p in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(runs):
+    out = {}
+    for part in PARTS:
+        values = [r[part] for r in runs]
+        out[part] = {"p50": percentile(values, 50), "p95": percentile(values, 95),
+                     "p99": percentile(values, 99), "mean": sum(values) / len(values)}
+    return out
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path, tolerance):
+    """Print p50/p95 wall-time changes against a previous JSON; returns the number of regressions."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["scenario"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for r in results:
+        old = baseline.get((r["scenario"], r["size"]))
+        if old is None:
+            continue
+        for stat in ("p50", "p95"):
+            before, after = old["stats"]["wall"][stat], r["stats"]["wall"][stat]
+            change = (after - before) / before if before else 0.0
+            flag = "REGRESSION" if change > tolerance else ""
+            regressions += bool(flag)
+            print(f"  {r['scenario']:24} {r['size']:>10} {stat} {before:9.1f} -> {after:9.1f} ms "
+                  f"({change:+.0%}) {flag}")
+    return regressions
+
+
+# ---------- Main ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page loads and dashboard refreshes.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="appointment counts to generate")
+    parser.add_argument("--no-generate", action="store_true", help="use the data already in --database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", help="database to use (default: the app's)")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--warm", action="store_true", help="keep row / result caches between runs")
+    parser.add_argument("--json", help="write results here")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown for --compare")
+    args = parser.parse_args(argv)
+
+    display = ensure_display()
+    import nathan_auto_ui as app
+    from generate_data import DatabaseWriter, generate
+    import mysql.connector
+
+    if args.database:
+        app.DB_CONFIG["database"] = args.database
+        app.db_pool.config["database"] = args.database
+
+    sizes = [None] if args.no_generate else [int(s) for s in args.sizes.split(",")]
+    results = []
+    for size in sizes:
+        if size is not None:
+            print(f"Generating {size:,} appointments...")
+            conn = mysql.connector.connect(**app.DB_CONFIG)
+            try:
+                generate(DatabaseWriter(conn), size, seed=args.seed)
+            finally:
+                conn.close()
+            app.db_pool.close_all()
+
+        bench = Bench(app, warm=args.warm)
+        try:
+            scenarios = bench.scenarios()
+            names = args.only.split(",") if args.only else list(scenarios)
+            for name in names:
+                action = scenarios[name]
+                for _ in range(args.warmup):
+                    bench.measure(action)
+                runs = [bench.measure(action) for _ in range(args.repeats)]
+                stats = summarize(runs)
+                results.append({"scenario": name, "size": size, "runs": len(runs), "stats": stats})
+                wall = stats["wall"]
+                print(f"  {name:24} {str(size):>10}  p50 {wall['p50']:8.1f}  p95 {wall['p95']:8.1f}  "
+                      f"p99 {wall['p99']:8.1f} ms  (sql {stats['sql']['p50']:.1f} / "
+                      f"python {stats['python']['p50']:.1f} / widget {stats['widget']['p50']:.1f} / "
+                      f"mpl {stats['matplotlib']['p50']:.1f})")
+        finally:
+            bench.close()
+
+    if args.json:
+        meta = {"commit": git_commit(), "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(), "platform": platform.platform(),
+                "display": display, "repeats": args.repeats, "warm": args.warm, "seed": args.seed}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
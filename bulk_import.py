@@ -0,0 +1,431 @@
+# bulk_import.py
+"""
+Bulk CSV import for customers, vehicles and appointments.
+
+    python bulk_import.py customers customers.csv
+    python bulk_import.py vehicles vehicles.csv --batch-size 2000
+    python bulk_import.py appointments appointments.csv --rejects bad_rows.csv
+
+The first CSV row names the columns, using the table's column names (any case,
+any order); see IMPORTS for the accepted and required ones. The file is streamed
+in --batch-size chunks. Each chunk is validated in Python first:
+  • field formats and lengths, and the 10-digit phone rule of validate_phone_*
+  • unique email (customers), plate and VIN (vehicles), against the file and the
+    database
+  • vehicles belong to an existing customer, appointments to an existing vehicle
+    (the customer defaults to the vehicle's owner)
+  • appointment times don't touch another booking of the same vehicle that day,
+    the same rule prevent_overbooking enforces
+The rows that pass are written with one executemany INSERT, and each chunk is
+its own transaction. Committed chunks stay if a later chunk fails or the import
+is cancelled. Rejected rows go to <file>.rejects.csv with their line number and
+the reason.
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+
+import mysql.connector
+
+from availability import IntervalIndex, to_minutes
+
+PHONE_RE = re.compile(r"^[0-9]{10}$")  # same pattern as validate_phone_insert
+
+
+# ---------- Field parsers (raise ValueError with the reason) ----------
+def text(max_length):
+    def parse(value):
+        if len(value) > max_length:
+            raise ValueError(f"longer than {max_length} characters")
+        return value
+    return parse
+
+
+def phone(value):
+    if not PHONE_RE.match(value):
+        raise ValueError("must be 10 digits, no symbols")
+    return value
+
+
+def integer(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError("not a whole number") from None
+
+
+def day(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("not a YYYY-MM-DD date") from None
+
+
+def clock(value):
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            pass
+    raise ValueError("not an HH:MM[:SS] time")
+
+
+def choice(*options):
+    def parse(value):
+        if value not in options:
+            raise ValueError(f"must be one of {', '.join(options)}")
+        return value
+    return parse
+
+
+@dataclass
+class Field:
+    name: str
+    parse: object
+    required: bool = False
+    default: object = None   # used when the cell is empty (NOT NULL columns with defaults)
+
+
+@dataclass
+class ImportSpec:
+    table: str
+    fields: list
+
+
+IMPORTS = {
+    "customers": ImportSpec("Customers", [
+        Field("CustomerID", integer),
+        Field("FirstName", text(50), required=True),
+        Field("LastName", text(50), required=True),
+        Field("Email", text(100), required=True),
+        Field("Phone", phone, required=True),
+        Field("Address", text(255)),
+        Field("City", text(50)),
+        Field("State", text(50)),
+        Field("ZipCode", text(10)),
+        Field("JoinDate", day, default=date.today),
+        Field("ReferralSource", text(100)),
+    ]),
+    "vehicles": ImportSpec("Vehicles", [
+        Field("VehicleID", integer),
+        Field("CustomerID", integer, required=True),
+        Field("Make", text(50), required=True),
+        Field("Model", text(50), required=True),
+        Field("Year", integer),
+        Field("Color", text(30)),
+        Field("LicensePlate", text(20), required=True),
+        Field("VIN", text(50)),
+        Field("VehicleType", choice("sedan", "SUV", "truck")),
+        Field("SpecialNotes", text(65535)),
+    ]),
+    "appointments": ImportSpec("Appointments", [
+        Field("AppointmentID", integer),
+        Field("CustomerID", integer),
+        Field("VehicleID", integer, required=True),
+        Field("EmployeeID", integer),
+        Field("AppointmentDate", day, required=True),
+        Field("StartTime", clock, required=True),
+        Field("EndTime", clock, required=True),
+        Field("Status", choice("scheduled", "in progress", "completed", "canceled"), default="scheduled"),
+    ]),
+}
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    fraction: float = 0.0       # share of the file read so far
+    rejects_path: str = None    # set once a row has been rejected
+
+
+def default_rejects_path(path):
+    stem, _ext = os.path.splitext(path)
+    return stem + ".rejects.csv"
+
+
+class BulkImporter:
+    """
+    Streams one CSV file into one table (see the module docstring).
+
+    Args:
+        conn: mysql connection (autocommit off); the importer commits per batch
+        kind: key of IMPORTS ("customers", "vehicles" or "appointments")
+        batch_size: rows per validation / executemany / transaction
+        rejects_path: CSV for rejected rows (default <file>.rejects.csv)
+    """
+    def __init__(self, conn, kind, batch_size=1000, rejects_path=None):
+        self.conn = conn
+        self.kind = kind
+        self.spec = IMPORTS[kind]
+        self.batch_size = batch_size
+        self.rejects_path = rejects_path
+        self._rejects_file = None
+        self._rejects = None
+        self._header = None
+
+    # ---------- Driver ----------
+    def run(self, path, progress=None, cancelled=None):
+        """
+        Import `path` and return an ImportResult. progress(ImportResult) is called after
+        every batch; cancelled() is checked before each one.
+        """
+        result = ImportResult()
+        self.rejects_path = self.rejects_path or default_rejects_path(path)
+        size = max(os.path.getsize(path), 1)
+        read = 0
+
+        def lines(f):
+            nonlocal read
+            for line in f:
+                read += len(line)
+                yield line
+
+        cur = self.conn.cursor()
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.reader(lines(f))
+                self._header = next(reader, None)
+                if self._header is None:
+                    raise ValueError(f"{path} is empty.")
+                columns = self._columns(self._header)
+
+                batch = []
+                for raw in reader:
+                    if not any(cell.strip() for cell in raw):
+                        continue
+                    batch.append((reader.line_num, raw))
+                    if len(batch) >= self.batch_size:
+                        if cancelled is not None and cancelled():
+                            break
+                        self._import_batch(cur, columns, batch, result)
+                        batch = []
+                        result.fraction = min(read / size, 1.0)
+                        if progress is not None:
+                            progress(replace(result))
+                else:
+                    if batch:
+                        self._import_batch(cur, columns, batch, result)
+                    result.fraction = 1.0
+                    if progress is not None:
+                        progress(replace(result))
+        finally:
+            cur.close()
+            if self._rejects_file is not None:
+                self._rejects_file.close()
+        return result
+
+    def _columns(self, header):
+        """Map CSV positions to Fields; raise ValueError for unknown or missing columns."""
+        by_name = {fld.name.lower(): fld for fld in self.spec.fields}
+        columns = []
+        unknown = []
+        for name in header:
+            fld = by_name.get(name.strip().lower())
+            if fld is None:
+                unknown.append(name)
+            columns.append(fld)
+        if unknown:
+            raise ValueError(f"Unknown {self.kind} column(s): {', '.join(unknown)}")
+        present = {fld.name for fld in columns}
+        missing = [fld.name for fld in self.spec.fields if fld.required and fld.name not in present]
+        if missing:
+            raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+        return columns
+
+    # ---------- One batch ----------
+    def _import_batch(self, cur, columns, batch, result):
+        result.rows += len(batch)
+        rows = []
+        for line, raw in batch:
+            try:
+                rows.append((line, raw, self._parse(columns, raw)))
+            except ValueError as e:
+                self._reject(line, raw, str(e), result)
+
+        check = getattr(self, f"_check_{self.kind}")
+        rows = [r for r in check(cur, rows, result) if r is not None]
+        if rows:
+            self._insert(cur, rows, result)
+
+    def _parse(self, columns, raw):
+        if len(raw) != len(columns):
+            raise ValueError(f"expected {len(columns)} fields, found {len(raw)}")
+        values = {}
+        for fld, cell in zip(columns, raw):
+            cell = cell.strip()
+            if not cell:
+                if fld.required:
+                    raise ValueError(f"{fld.name} is required")
+                values[fld.name] = fld.default() if callable(fld.default) else fld.default
+                continue
+            try:
+                values[fld.name] = fld.parse(cell)
+            except ValueError as e:
+                raise ValueError(f"{fld.name}: {e}") from None
+        return values
+
+    def _insert(self, cur, rows, result):
+        """executemany the batch in one transaction; on a DB error retry row by row to find the bad ones."""
+        names = list(rows[0][2])
+        sql = (f"INSERT INTO {self.spec.table} ({', '.join(names)}) "
+               f"VALUES ({', '.join(['%s'] * len(names))})")
+        try:
+            cur.executemany(sql, [[values[n] for n in names] for _, _, values in rows])
+            self.conn.commit()
+            result.inserted += len(rows)
+            return
+        except mysql.connector.Error:
+            self.conn.rollback()
+
+        # A failed statement only rolls back itself, so the good rows still share one transaction
+        for line, raw, values in rows:
+            try:
+                cur.execute(sql, [values[n] for n in names])
+                result.inserted += 1
+            except mysql.connector.Error as err:
+                self._reject(line, raw, err.msg, result)
+        self.conn.commit()
+
+    def _reject(self, line, raw, reason, result):
+        if self._rejects is None:
+            self._rejects_file = open(self.rejects_path, "w", newline="", encoding="utf-8")
+            self._rejects = csv.writer(self._rejects_file)
+            self._rejects.writerow(["line", "error"] + self._header)
+            result.rejects_path = self.rejects_path
+        self._rejects.writerow([line, reason] + raw)
+        result.rejected += 1
+
+    # ---------- Checks against the file and the database ----------
+    # Earlier batches are already committed, so "the database" covers them too.
+    def _existing(self, cur, table, column, values, select=None):
+        """Rows of `table` whose `column` is in `values` (one IN query on an indexed column)."""
+        values = list({v for v in values if v is not None})
+        if not values:
+            return []
+        cur.execute(f"SELECT {select or column} FROM {table} "
+                    f"WHERE {column} IN ({', '.join(['%s'] * len(values))})", values)
+        return cur.fetchall()
+
+    def _check_unique(self, cur, rows, result, column, label):
+        """Reject rows whose `column` is already used (case-insensitive, like the utf8mb4 collation)."""
+        candidates = [r[2].get(column) for r in rows if r is not None]
+        taken = {str(v).casefold() for (v,) in self._existing(cur, self.spec.table, column, candidates)}
+        for i, row in enumerate(rows):
+            if row is None or row[2].get(column) is None:
+                continue
+            value = str(row[2][column]).casefold()
+            if value in taken:
+                self._reject(row[0], row[1], f"{label} {row[2][column]} already exists", result)
+                rows[i] = None
+            else:
+                taken.add(value)
+        return rows
+
+    def _check_customers(self, cur, rows, result):
+        rows = self._check_unique(cur, rows, result, "CustomerID", "CustomerID")
+        return self._check_unique(cur, rows, result, "Email", "Email")
+
+    def _check_vehicles(self, cur, rows, result):
+        owners = {cid for (cid,) in self._existing(cur, "Customers", "CustomerID",
+                                                   [r[2]["CustomerID"] for r in rows])}
+        for i, row in enumerate(rows):
+            if row[2]["CustomerID"] not in owners:
+                self._reject(row[0], row[1], f"Customer {row[2]['CustomerID']} does not exist", result)
+                rows[i] = None
+        rows = self._check_unique(cur, rows, result, "VehicleID", "VehicleID")
+        rows = self._check_unique(cur, rows, result, "LicensePlate", "License plate")
+        return self._check_unique(cur, rows, result, "VIN", "VIN")
+
+    def _check_appointments(self, cur, rows, result):
+        vehicles = self._existing(cur, "Vehicles", "VehicleID", [r[2]["VehicleID"] for r in rows],
+                                  select="VehicleID, CustomerID")
+        owner = dict(vehicles)
+        employees = {eid for (eid,) in self._existing(cur, "Employees", "EmployeeID",
+                                                      [r[2].get("EmployeeID") for r in rows])}
+        for i, (line, raw, values) in enumerate(rows):
+            vid = values["VehicleID"]
+            if vid not in owner:
+                reason = f"Vehicle {vid} does not exist"
+            elif values.get("CustomerID") not in (None, owner[vid]):
+                reason = f"Vehicle {vid} belongs to customer {owner[vid]}, not {values['CustomerID']}"
+            elif values.get("EmployeeID") is not None and values["EmployeeID"] not in employees:
+                reason = f"Employee {values['EmployeeID']} does not exist"
+            elif values["EndTime"] <= values["StartTime"]:
+                reason = "EndTime must be after StartTime"
+            else:
+                values["CustomerID"] = owner[vid]
+                continue
+            self._reject(line, raw, reason, result)
+            rows[i] = None
+        rows = self._check_unique(cur, rows, result, "AppointmentID", "AppointmentID")
+
+        live = [r for r in rows if r is not None]
+        if not live:
+            return rows
+        # Bookings already in the database for these vehicles and dates (idx_appts_vehicle)
+        booked = {}
+        vids = sorted({r[2]["VehicleID"] for r in live})
+        days = [r[2]["AppointmentDate"] for r in live]
+        cur.execute(f"SELECT VehicleID, AppointmentDate, StartTime, EndTime FROM Appointments "
+                    f"WHERE VehicleID IN ({', '.join(['%s'] * len(vids))}) "
+                    f"AND AppointmentDate BETWEEN %s AND %s", vids + [min(days), max(days)])
+        for vid, booked_day, start, end in cur.fetchall():
+            booked.setdefault((vid, booked_day), IntervalIndex()).add(to_minutes(start), to_minutes(end))
+
+        for i, row in enumerate(rows):
+            if row is None:
+                continue
+            values = row[2]
+            start, end = to_minutes(values["StartTime"]), to_minutes(values["EndTime"])
+            index = booked.setdefault((values["VehicleID"], values["AppointmentDate"]), IntervalIndex())
+            if index.conflicts(start, end, closed=True):
+                self._reject(row[0], row[1], "Overlaps another appointment for this vehicle", result)
+                rows[i] = None
+            else:
+                index.add(start, end)
+        return rows
+
+
+def import_csv(get_connection, kind, path, batch_size=1000, rejects_path=None, progress=None, cancelled=None):
+    """Run a BulkImporter on a connection from get_connection() and return its ImportResult."""
+    conn = get_connection()
+    try:
+        return BulkImporter(conn, kind, batch_size, rejects_path).run(path, progress, cancelled)
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    from nathan_auto_ui import DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="Bulk import customers, vehicles or appointments from CSV.")
+    parser.add_argument("kind", choices=sorted(IMPORTS))
+    parser.add_argument("path", help="CSV file with a header row of column names")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per INSERT / transaction")
+    parser.add_argument("--rejects", help="where to write rejected rows (default <file>.rejects.csv)")
+    parser.add_argument("--database", default=DB_CONFIG["database"])
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    def progress(r):
+        rate = r.rows / max(time.perf_counter() - started, 1e-6)
+        print(f"\r{r.fraction:6.1%}  {r.inserted:,} inserted, {r.rejected:,} rejected ({rate:,.0f} rows/s)",
+              end="", flush=True)
+
+    result = import_csv(lambda: mysql.connector.connect(**dict(DB_CONFIG, database=args.database)),
+                        args.kind, args.path, args.batch_size, args.rejects, progress)
+    print(f"\nDone in {time.perf_counter() - started:.1f}s: {result.inserted:,} of {result.rows:,} rows imported")
+    if result.rejects_path:
+        print(f"Rejected rows: {result.rejects_path}")
+    return 0 if result.rejected == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,173 @@
 # dashboard.py
+import math
+from bisect import insort
 import tkinter as tk
 import customtkinter as ctk
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from tkinter import messagebox
+from matplotlib import rcParams
 from matplotlib.figure import Figure
+from matplotlib.patches import Wedge
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from dashboard_config import LOADER_TABLES, create_result_cache
+from schema_catalog import get_catalog
+from task_runner import BackgroundRunner
+from theme import THEMES
 
-DARK_BG = "#242424"
-DARK_AX = "#1e1e1e"
-LIGHT_BG = "#ffffff"
-LIGHT_AX = "#ffffff"
+# Quiet period after the last date keystroke / chart switch / Refresh click before loading
+REFRESH_DEBOUNCE_MS = 300
+
+@dataclass
+class KPISnapshot:
+    """Every KPI card value for one date range."""
+    total_revenue: float = 0.0
+    total_appointments: int = 0
+    unique_customers: int = 0
+    completed_appointments: int = 0
+    pending_appointments: int = 0
+    top_service: str = "No Data"
+
+    @property
+    def avg_appointment_value(self):
+        return self.total_revenue / max(self.total_appointments, 1)
+
+    @property
+    def completion_rate(self):
+        return (self.completed_appointments / max(self.total_appointments, 1)) * 100
+
+# Revenue trend resolution: (widest range in days, bucket); wider ranges use months
+TREND_BUCKETS = ((180, "day"), (1100, "week"))
+TREND_TITLES = {"day": "Daily", "week": "Weekly", "month": "Monthly"}
+TREND_MARKER_LIMIT = 60  # draw point markers only for sparse series
+
+def trend_bucket(start_date, end_date):
+    """'day', 'week' or 'month', chosen so the trend has roughly 30 .. 180 points."""
+    days = (end_date - start_date).days + 1
+    for max_days, bucket in TREND_BUCKETS:
+        if days <= max_days:
+            return bucket
+    return "month"
+
+@dataclass
+class TrendSeries:
+    """Revenue per bucket; dates are the bucket starts (Mondays for weeks, 1st for months)."""
+    bucket: str = "day"
+    points: list = None  # [(date_str, revenue)]
+
+def lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling of [(x, y)] to at most `threshold`
+    points. Returns the indices kept (first and last always are). Each kept point is
+    the one forming the largest triangle with its neighbours, so spikes survive.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    kept = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nxt_lo, nxt_hi = hi, min(int((i + 2) * every) + 1, n)
+        avg_x = sum(points[j][0] for j in range(nxt_lo, nxt_hi)) / (nxt_hi - nxt_lo)
+        avg_y = sum(points[j][1] for j in range(nxt_lo, nxt_hi)) / (nxt_hi - nxt_lo)
+        ax, ay = points[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (points[j][1] - ay) - (ax - points[j][0]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+# ---------- KPI panel ----------
+@dataclass
+class KPICardSpec:
+    """One KPI card: title, value formatter (KPISnapshot -> str), value color and font size."""
+    title: str
+    value: object
+    color: str
+    size: int = 18
+
+def _short(text, limit=15):
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+# Sections of the KPI panel: (heading, heading color, cards laid out two per row)
+KPI_SECTIONS = (
+    ("💰 REVENUE & FINANCE", "#4CAF50", (
+        KPICardSpec("Total Revenue", lambda k: f"${k.total_revenue:,.2f}", "#4CAF50"),
+        KPICardSpec("Average Value", lambda k: f"${k.avg_appointment_value:.2f}", "#FF9800"),
+    )),
+    ("📅 APPOINTMENTS", "#2196F3", (
+        KPICardSpec("Total Appointments", lambda k: f"{k.total_appointments:,}", "#2196F3"),
+        KPICardSpec("Completed", lambda k: f"{k.completed_appointments:,}", "#4CAF50"),
+        KPICardSpec("Pending/Scheduled", lambda k: f"{k.pending_appointments:,}", "#FF9800"),
+        KPICardSpec("Completion Rate", lambda k: f"{k.completion_rate:.1f}%", "#9C27B0"),
+    )),
+    ("👥 CUSTOMERS & SERVICES", "#9C27B0", (
+        KPICardSpec("Unique Customers", lambda k: f"{k.unique_customers:,}", "#9C27B0"),
+        KPICardSpec("Top Service", lambda k: _short(k.top_service), "#FF5722", size=14),
+    )),
+)
+
+class KPICard(ctk.CTkFrame):
+    """A titled value whose label is bound to a StringVar; show() only touches it when the text changes."""
+    def __init__(self, parent, spec, title_font, value_font):
+        super().__init__(parent)
+        self.spec = spec
+        self.value = tk.StringVar(master=self, value="—")
+        ctk.CTkLabel(self, text=spec.title, font=title_font).pack(pady=(8, 2))
+        ctk.CTkLabel(self, textvariable=self.value, font=value_font,
+                     text_color=spec.color).pack(pady=(0, 8))
+
+    def show(self, kpi):
+        text = self.spec.value(kpi)
+        if text != self.value.get():
+            self.value.set(text)
+
+class KPIPanel(ctk.CTkFrame):
+    """
+    The KPI section of the dashboard, built once from KPI_SECTIONS. Refreshes call
+    show(kpi), which updates the card values in place instead of rebuilding widgets;
+    add a card by adding a KPICardSpec.
+    """
+    def __init__(self, parent, sections=KPI_SECTIONS):
+        super().__init__(parent)
+        ctk.CTkLabel(self, text="📊 Business Dashboard",
+                     font=ctk.CTkFont(size=20, weight="bold")).pack(pady=(15, 10))
+
+        # Create metrics container (no scroll bar), 2 columns
+        metrics_frame = ctk.CTkFrame(self, fg_color="transparent")
+        metrics_frame.pack(fill="both", expand=True, padx=15, pady=10)
+        metrics_frame.grid_columnconfigure(0, weight=1)
+        metrics_frame.grid_columnconfigure(1, weight=1)
+
+        # Fonts are shared by every card instead of created per label
+        section_font = ctk.CTkFont(size=14, weight="bold")
+        title_font = ctk.CTkFont(size=11, weight="bold")
+        value_fonts = {}
+
+        self.cards = []
+        row = 0
+        for index, (heading, color, specs) in enumerate(sections):
+            ctk.CTkLabel(metrics_frame, text=heading, font=section_font, text_color=color).grid(
+                row=row, column=0, columnspan=2, pady=(10 if index == 0 else 15, 5), sticky="w")
+            row += 1
+            for i, spec in enumerate(specs):
+                if spec.size not in value_fonts:
+                    value_fonts[spec.size] = ctk.CTkFont(size=spec.size, weight="bold")
+                card = KPICard(metrics_frame, spec, title_font, value_fonts[spec.size])
+                card.grid(row=row + i // 2, column=i % 2, sticky="nsew",
+                          padx=(0, 5) if i % 2 == 0 else (5, 0), pady=3)
+                self.cards.append(card)
+            row += (len(specs) + 1) // 2
+
+    def show(self, kpi):
+        for card in self.cards:
+            card.show(kpi)
 
 class DashboardFrame(ctk.CTkFrame):
     """
@@ -18,15 +176,34 @@ class DashboardFrame(ctk.CTkFrame):
       • Top 5 services by revenue (bar)
       • Service mix (pie)
 
+    Loads go through one refresh pipeline: date edits, chart switches and Refresh
+    clicks are debounced into a single pass (schedule_refresh), each panel asks for
+    the (loader, range) it needs, identical requests share one query, and a panel
+    already showing the cached result for its inputs is left alone.
+
     Args:
         parent: tk widget
         get_connection: callable returning a mysql connection
         get_is_dark: callable returning True if dark mode is on
+        runner: BackgroundRunner used for queries (a private one is created if omitted)
+        cache: ResultCache that outlives the frame (see create_result_cache); the owner
+               invalidates it on writes. A private one is created if omitted.
     """
-    def __init__(self, parent, get_connection, get_is_dark=lambda: False):
+    def __init__(self, parent, get_connection, get_is_dark=lambda: False, runner=None, cache=None):
         super().__init__(parent)
         self.get_connection = get_connection
         self.get_is_dark = get_is_dark
+        self.catalog = get_catalog(get_connection)
+        self._owns_runner = runner is None
+        self.runner = runner or BackgroundRunner(self)
+        self._inflight = {}    # (loader, args) -> [(slot, on_done)] waiting for one query
+        self._wanted = {}      # slot -> (loader, args) it should show now
+        self._shown = {}       # slot -> ((loader, args), value) currently drawn
+        self._refresh_after = None
+        self._refresh_interactive = False
+        self._kpi = KPISnapshot()
+        self._top_service = "No Data"
+        self.cache = cache or create_result_cache()
 
         # Controls
         controls = ctk.CTkFrame(self)
@@ -34,9 +211,11 @@ class DashboardFrame(ctk.CTkFrame):
 
         ctk.CTkLabel(controls, text="Start (YYYY-MM-DD):").pack(side="left", padx=(5, 4))
         self.start_entry = ctk.CTkEntry(controls, width=140); self.start_entry.pack(side="left")
+        self.start_entry.bind("<KeyRelease>", lambda e: self.schedule_refresh())
 
         ctk.CTkLabel(controls, text="End (YYYY-MM-DD):").pack(side="left", padx=(10, 4))
         self.end_entry = ctk.CTkEntry(controls, width=140); self.end_entry.pack(side="left")
+        self.end_entry.bind("<KeyRelease>", lambda e: self.schedule_refresh())
 
         end_default = datetime.today().date()
         start_default = end_default - timedelta(days=90)
@@ -51,7 +230,12 @@ class DashboardFrame(ctk.CTkFrame):
         self.chart_selector.pack(side="right", padx=(0, 10))
         self.chart_selector.set("Revenue Trend")  # Default selection
 
-        ctk.CTkButton(controls, text="Refresh", command=self.refresh_all).pack(side="right", padx=8, pady=6)
+        ctk.CTkButton(controls, text="Refresh", command=lambda: self.schedule_refresh(interactive=True)).pack(
+            side="right", padx=8, pady=6)
+
+        # Busy indicator (shown while queries run in the background)
+        self.status_label = ctk.CTkLabel(controls, text="", text_color="#FF9800")
+        self.status_label.pack(side="left", padx=(12, 4))
 
         # Chart grid - now 2 columns: KPI (wide), Selected Chart
         self.charts_frame = ctk.CTkFrame(self)
@@ -67,72 +251,144 @@ class DashboardFrame(ctk.CTkFrame):
         self.charts_frame.grid_rowconfigure(0, weight=1)
         self.charts_frame.grid_rowconfigure(1, weight=1)
 
-        # Canvas placeholders
-        self.canvas_kpi = None
-        self.canvas_right_chart = None  # This will hold either revenue trend or service mix
+        # KPI panel (built once, values updated in place) and the chart slot (built on first draw)
+        self.kpi_panel = KPIPanel(self.charts_frame)
+        self.kpi_panel.grid(row=0, column=0, rowspan=2, sticky="nsew", padx=6, pady=6)
+        self.canvas_right_chart = None  # One canvas for both the revenue trend and the service mix
 
         # Delay initial refresh to ensure widgets are fully initialized
         self.after(100, self.initial_refresh)
     
     def on_chart_change(self, selection):
-        """Handle chart selector dropdown change."""
-        # Get current date range
-        start_s = self.start_entry.get().strip()
-        end_s = self.end_entry.get().strip()
-        
+        """Handle chart selector dropdown change (only the chart panel's inputs change)."""
+        self.schedule_refresh()
+
+    # ---------- Refresh pipeline ----------
+    def schedule_refresh(self, interactive=False, delay=REFRESH_DEBOUNCE_MS):
+        """
+        Refresh once input has been quiet for `delay` ms; calls in the meantime restart
+        the wait. interactive=True reports invalid dates (typing half a date does not).
+        """
+        self._refresh_interactive = self._refresh_interactive or interactive
+        if self._refresh_after is not None:
+            self.after_cancel(self._refresh_after)
+        self._refresh_after = self.after(delay, self._run_refresh)
+
+    @property
+    def refresh_pending(self):
+        """True while a scheduled refresh or one of its queries has not finished."""
+        return self._refresh_after is not None or bool(self._inflight)
+
+    def _read_dates(self, interactive):
         try:
-            start_date = datetime.strptime(start_s, "%Y-%m-%d").date()
-            end_date = datetime.strptime(end_s, "%Y-%m-%d").date()
-            
-            # Clear existing right chart
-            if self.canvas_right_chart:
-                try:
-                    if hasattr(self.canvas_right_chart, 'get_tk_widget'):
-                        self.canvas_right_chart.get_tk_widget().destroy()
-                    else:
-                        self.canvas_right_chart.destroy()
-                except:
-                    pass
-                self.canvas_right_chart = None
-            
-            # Draw selected chart
-            if selection == "Revenue Trend":
-                self.draw_revenue_trend_chart(start_date, end_date)
-            elif selection == "Service Mix":
-                services = self.load_service_revenue(start_date, end_date)
-                self.draw_service_mix_pie(services)
-                
+            start_date = datetime.strptime(self.start_entry.get().strip(), "%Y-%m-%d").date()
+            end_date = datetime.strptime(self.end_entry.get().strip(), "%Y-%m-%d").date()
+            if end_date < start_date:
+                raise ValueError("End date is before start date.")
         except Exception as e:
-            print(f"Chart change error: {e}")
+            if interactive:
+                messagebox.showerror("Invalid Dates", f"Please use YYYY-MM-DD.\n\n{e}")
+            return None
+        return start_date, end_date
+
+    def _run_refresh(self):
+        self._refresh_after = None
+        interactive, self._refresh_interactive = self._refresh_interactive, False
+        dates = self._read_dates(interactive)
+        if dates is None:
+            return
+        # Each panel names the loader and range it needs. The KPI panel's top service
+        # comes from the same load_service_revenue result the Service Mix chart uses.
+        chart = self.chart_selector.get()
+        self._request("kpi", self.load_kpi_snapshot, dates, self.draw_kpi_metrics)
+        self._request("top_service", self.load_service_revenue, dates, self._show_top_service)
+        if chart == "Revenue Trend":
+            self._request("chart", self.load_daily_revenue_trend, dates, self.draw_revenue_trend_chart)
+        elif chart == "Service Mix":
+            self._request("chart", self.load_service_revenue, dates, self.draw_service_mix_pie)
+
+    def _request(self, slot, fn, args, on_done):
+        """
+        Show fn(*args) in `slot`. Skipped when the slot already shows the cached value;
+        served from the result cache when fresh; otherwise joins an identical query
+        already in flight or starts one.
+        """
+        name = fn.__name__
+        key = (name, args)
+        self._wanted[slot] = key
+        hit, cached = self.cache.lookup(name, args)
+        if hit:
+            shown = self._shown.get(slot)
+            if shown is None or shown[0] != key or shown[1] is not cached:
+                self._deliver(slot, key, on_done, cached)
+            return
+
+        waiters = self._inflight.get(key)
+        if waiters is not None:
+            waiters.append((slot, on_done))
+            return
+        # A newer range for the same loader supersedes the running one (same channel)
+        for stale in [k for k in self._inflight if k[0] == name]:
+            del self._inflight[stale]
+        self._inflight[key] = [(slot, on_done)]
+        self.status_label.configure(text="Loading…")
+        generation = self.cache.generation()
+
+        def load(*load_args):
+            result = fn(*load_args)
+            self.cache.store(name, load_args, result, LOADER_TABLES.get(name, ()), generation)
+            return result
+
+        def done(result):
+            for waiting_slot, callback in self._finish(key):
+                if self._wanted.get(waiting_slot) == key:
+                    self._deliver(waiting_slot, key, callback, result)
+
+        def failed(err):
+            self._finish(key)
+            messagebox.showerror("DB Error", f"{err}")
+
+        self.runner.submit(load, *args, channel=self._channel(name), owner=self,
+                           on_done=done, on_error=failed)
+
+    def _deliver(self, slot, key, on_done, value):
+        self._shown[slot] = (key, value)
+        on_done(value)
+
+    def _finish(self, key):
+        waiters = self._inflight.pop(key, [])
+        if not self._inflight:
+            self.status_label.configure(text="")
+        return waiters
+
+    def _channel(self, name):
+        # Channels are per dashboard instance so a rebuilt dashboard never sees stale results
+        return f"dashboard.{id(self)}.{name}"
+
+    def destroy(self):
+        self.runner.cancel_prefix(f"dashboard.{id(self)}.")
+        if self._owns_runner:
+            self.runner.shutdown()
+        super().destroy()
 
     # ---------- DB helper ----------
+    # Runs on a worker thread: errors are raised and reported by _request on the Tk thread.
     def _fetch(self, query, params=None):
-        conn = None
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
             cur = conn.cursor()
             cur.execute(query, params or ())
             rows = cur.fetchall()
             cur.close()
             return rows
-        except Exception as e:
-            messagebox.showerror("DB Error", f"{e}")
-            return []
         finally:
-            if conn:
-                conn.close()
+            conn.close()
 
     # ---------- Schema helpers ----------
+    # Column checks are served by the shared SchemaCatalog, which reads
+    # INFORMATION_SCHEMA once per session instead of once per check.
     def _has_col(self, table, column):
-        q = """
-            SELECT COUNT(*)
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = %s
-              AND COLUMN_NAME = %s
-        """
-        rows = self._fetch(q, (table, column))
-        return bool(rows and rows[0][0] > 0)
+        return self.catalog.has_col(table, column)
 
     def _service_name_col(self):
         for cand in ("Name", "ServiceName", "Title", "Service_Title"):
@@ -140,30 +396,45 @@ class DashboardFrame(ctk.CTkFrame):
                 return cand
         return None
 
+    def _service_revenue_query(self):
+        """Service revenue SQL for the current schema, picked once and memoized in the catalog."""
+        return self.catalog.memo("service_revenue_query", self._build_service_revenue_query)
+
+    def _revenue_source(self):
+        """
+        (table, date_col, amount_col) for revenue by day: the trigger-maintained
+        DailyRevenue rollup when the schema has it, otherwise raw Payments.
+        """
+        if self.catalog.has_table("DailyRevenue"):
+            return "DailyRevenue", "RevenueDate", "TotalAmount"
+        return "Payments", "PaymentDate", "Amount"
+
     # ---------- Data loaders ----------
     def load_monthly_sales(self, start_date, end_date):
-        q = """
-            SELECT DATE_FORMAT(PaymentDate, '%Y-%m-01') AS month_start,
-                   SUM(Amount) AS total_sales
-            FROM Payments
-            WHERE PaymentDate >= %s AND PaymentDate < DATE_ADD(%s, INTERVAL 1 DAY)
-            GROUP BY DATE_FORMAT(PaymentDate, '%Y-%m-01')
+        table, date_col, amount_col = self._revenue_source()
+        q = f"""
+            SELECT DATE_FORMAT({date_col}, '%Y-%m-01') AS month_start,
+                   SUM({amount_col}) AS total_sales
+            FROM {table}
+            WHERE {date_col} >= %s AND {date_col} < DATE_ADD(%s, INTERVAL 1 DAY)
+            GROUP BY DATE_FORMAT({date_col}, '%Y-%m-01')
             ORDER BY month_start ASC;
         """
         rows = self._fetch(q, (start_date, end_date))
         return [(str(m)[:7], float(t or 0)) for (m, t) in rows]
 
-    def load_service_revenue(self, start_date, end_date):
+    def _build_service_revenue_query(self):
         """
-        Returns [(service_name, revenue_or_count), ...]
+        Returns the SQL (params: start, end) yielding (service_name, value) rows,
+        best first, or None if there is nothing to aggregate.
         Tries in order:
-          1) AppointmentServices.LineTotal
+          1) AppointmentServices.ActualPrice
           2) Appointments.TotalPrice with Appointments.ServiceID
           3) Fallback: count of uses in AppointmentServices
         """
         name_col = self._service_name_col()
         if not name_col:
-            return [("Unknown", 0.0)]
+            return None
 
         has_as = self._has_col("AppointmentServices", "ServiceID")
         has_line_total = self._has_col("AppointmentServices", "ActualPrice")
@@ -171,7 +442,7 @@ class DashboardFrame(ctk.CTkFrame):
         has_total_price = self._has_col("Appointments", "TotalPrice")
 
         if has_as and has_line_total:
-            q = f"""
+            return f"""
                 SELECT s.{name_col} AS service_name,
                        IFNULL(SUM(asv.ActualPrice), 0) AS revenue
                 FROM AppointmentServices asv
@@ -180,13 +451,11 @@ class DashboardFrame(ctk.CTkFrame):
                 WHERE a.AppointmentDate >= %s
                   AND a.AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
                 GROUP BY s.{name_col}
-                ORDER BY revenue DESC;
+                ORDER BY revenue DESC
             """
-            rows = self._fetch(q, (start_date, end_date))
-            return [(r[0], float(r[1] or 0)) for r in rows]
 
         if has_appt_serviceid and has_total_price:
-            q = f"""
+            return f"""
                 SELECT s.{name_col} AS service_name,
                        IFNULL(SUM(a.TotalPrice), 0) AS revenue
                 FROM Appointments a
@@ -194,13 +463,11 @@ class DashboardFrame(ctk.CTkFrame):
                 WHERE a.AppointmentDate >= %s
                   AND a.AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
                 GROUP BY s.{name_col}
-                ORDER BY revenue DESC;
+                ORDER BY revenue DESC
             """
-            rows = self._fetch(q, (start_date, end_date))
-            return [(r[0], float(r[1] or 0)) for r in rows]
 
         if has_as:
-            q = f"""
+            return f"""
                 SELECT s.{name_col} AS service_name,
                        COUNT(*) AS uses
                 FROM AppointmentServices asv
@@ -209,340 +476,254 @@ class DashboardFrame(ctk.CTkFrame):
                 WHERE a.AppointmentDate >= %s
                   AND a.AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
                 GROUP BY s.{name_col}
-                ORDER BY uses DESC;
+                ORDER BY uses DESC
             """
-            rows = self._fetch(q, (start_date, end_date))
-            return [(r[0], float(r[1] or 0)) for r in rows]
-
-        return []
-
-    # ---------- KPI Data Loaders ----------
-    def get_total_revenue(self, start_date, end_date):
-        """Get total revenue from payments in the date range."""
-        q = """
-            SELECT IFNULL(SUM(Amount), 0) AS total_revenue
-            FROM Payments
-            WHERE PaymentDate >= %s AND PaymentDate < DATE_ADD(%s, INTERVAL 1 DAY)
-        """
-        rows = self._fetch(q, (start_date, end_date))
-        return float(rows[0][0]) if rows else 0.0
-    
-    def get_total_appointments(self, start_date, end_date):
-        """Get total number of appointments in the date range."""
-        q = """
-            SELECT COUNT(*) AS total_appointments
-            FROM Appointments
-            WHERE AppointmentDate >= %s AND AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
-        """
+
+        return None
+
+    def load_service_revenue(self, start_date, end_date):
+        """Returns [(service_name, revenue_or_count), ...]"""
+        q = self._service_revenue_query()
+        if not q:
+            return [("Unknown", 0.0)] if not self._service_name_col() else []
         rows = self._fetch(q, (start_date, end_date))
-        return int(rows[0][0]) if rows else 0
-    
-    def get_total_customers(self, start_date, end_date):
-        """Get count of unique customers who had appointments in the date range."""
-        q = """
-            SELECT COUNT(DISTINCT a.CustomerID) AS unique_customers
-            FROM Appointments a
-            WHERE a.AppointmentDate >= %s AND a.AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
+        return [(r[0], float(r[1] or 0)) for r in rows]
+
+    # ---------- KPI engine ----------
+    def load_kpi_snapshot(self, start_date, end_date):
         """
-        rows = self._fetch(q, (start_date, end_date))
-        return int(rows[0][0]) if rows else 0
-    
-    def get_completed_appointments(self, start_date, end_date):
-        """Get count of completed appointments in the date range."""
-        q = """
-            SELECT COUNT(*) AS completed_appointments
-            FROM Appointments
-            WHERE AppointmentDate >= %s AND AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
-              AND Status = 'completed'
+        Compute the KPI cards for the date range in one round trip: a
+        conditional-aggregation pass over Appointments and one SUM over Payments.
+        The top service is not loaded here; the dashboard takes it from the
+        load_service_revenue result it shares with the Service Mix chart.
         """
-        rows = self._fetch(q, (start_date, end_date))
-        return int(rows[0][0]) if rows else 0
-    
-    def get_pending_appointments(self, start_date, end_date):
-        """Get count of pending/scheduled appointments in the date range."""
-        q = """
-            SELECT COUNT(*) AS pending_appointments
-            FROM Appointments
-            WHERE AppointmentDate >= %s AND AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
-              AND Status IN ('scheduled', 'pending')
+        revenue_table, date_col, amount_col = self._revenue_source()
+
+        q = f"""
+            SELECT pay.total_revenue,
+                   ap.total_appointments,
+                   ap.unique_customers,
+                   ap.completed_appointments,
+                   ap.pending_appointments
+            FROM (
+                SELECT COUNT(*) AS total_appointments,
+                       COUNT(DISTINCT CustomerID) AS unique_customers,
+                       IFNULL(SUM(Status = 'completed'), 0) AS completed_appointments,
+                       IFNULL(SUM(Status IN ('scheduled', 'pending')), 0) AS pending_appointments
+                FROM Appointments
+                WHERE AppointmentDate >= %s AND AppointmentDate < DATE_ADD(%s, INTERVAL 1 DAY)
+            ) ap
+            CROSS JOIN (
+                SELECT IFNULL(SUM({amount_col}), 0) AS total_revenue
+                FROM {revenue_table}
+                WHERE {date_col} >= %s AND {date_col} < DATE_ADD(%s, INTERVAL 1 DAY)
+            ) pay
         """
-        rows = self._fetch(q, (start_date, end_date))
-        return int(rows[0][0]) if rows else 0
-    
-    def get_top_service_name(self, start_date, end_date):
-        """Get the name of the top service by revenue."""
-        services = self.load_service_revenue(start_date, end_date)
-        if services and len(services) > 0:
-            return services[0][0]  # First service name
-        return "No Data"
-    
+        rows = self._fetch(q, (start_date, end_date, start_date, end_date))
+        if not rows:
+            return KPISnapshot()
+        revenue, appts, customers, completed, pending = rows[0]
+        return KPISnapshot(
+            total_revenue=float(revenue or 0),
+            total_appointments=int(appts or 0),
+            unique_customers=int(customers or 0),
+            completed_appointments=int(completed or 0),
+            pending_appointments=int(pending or 0),
+        )
+
     def load_daily_revenue_trend(self, start_date, end_date):
-        """Load daily revenue trend data for the date range."""
-        q = """
-            SELECT DATE(PaymentDate) as payment_date,
-                   IFNULL(SUM(Amount), 0) as daily_revenue
-            FROM Payments
-            WHERE PaymentDate >= %s AND PaymentDate < DATE_ADD(%s, INTERVAL 1 DAY)
-            GROUP BY DATE(PaymentDate)
-            ORDER BY payment_date ASC
+        """
+        Revenue trend for the date range as a TrendSeries, grouped by day, week or
+        month (trend_bucket) in SQL so long ranges return a few hundred rows at most.
+        """
+        table, date_col, amount_col = self._revenue_source()
+        bucket = trend_bucket(start_date, end_date)
+        bucket_expr = {
+            "day": date_col,
+            "week": f"DATE_SUB({date_col}, INTERVAL WEEKDAY({date_col}) DAY)",
+            "month": f"DATE_FORMAT({date_col}, '%Y-%m-01')",
+        }[bucket]
+        q = f"""
+            SELECT {bucket_expr} as bucket_start,
+                   IFNULL(SUM({amount_col}), 0) as revenue
+            FROM {table}
+            WHERE {date_col} >= %s AND {date_col} < DATE_ADD(%s, INTERVAL 1 DAY)
+            GROUP BY bucket_start
+            ORDER BY bucket_start ASC
         """
         rows = self._fetch(q, (start_date, end_date))
-        return [(str(date), float(revenue)) for date, revenue in rows]
+        return TrendSeries(bucket, [(str(day), float(revenue)) for day, revenue in rows])
 
     # ---------- Matplotlib theming ----------
+    def _palette(self):
+        return THEMES["dark" if self.get_is_dark() else "light"]
+
     def _style_fig_ax(self, fig, ax):
-        dark = bool(self.get_is_dark())
-        fig.patch.set_facecolor(DARK_BG if dark else LIGHT_BG)
-        ax.set_facecolor(DARK_AX if dark else LIGHT_AX)
-        fg = "#eaeaea" if dark else "#000000"
-        grid_c = "#666666" if dark else "#cccccc"
+        p = self._palette()
+        fig.patch.set_facecolor(p.chart_bg)
+        ax.set_facecolor(p.chart_ax)
         for spine in ax.spines.values():
-            spine.set_color(fg)
-        ax.tick_params(colors=fg)
-        ax.xaxis.label.set_color(fg)
-        ax.yaxis.label.set_color(fg)
-        ax.title.set_color(fg)
-        ax.grid(True, alpha=0.35, color=grid_c)
+            spine.set_color(p.chart_fg)
+        ax.tick_params(colors=p.chart_fg)
+        ax.xaxis.label.set_color(p.chart_fg)
+        ax.yaxis.label.set_color(p.chart_fg)
+        ax.title.set_color(p.chart_fg)
+        ax.grid(True, alpha=0.35, color=p.chart_grid)
 
     # ---------- Charts ----------
-    def draw_kpi_metrics(self, start_date, end_date):
-        if self.canvas_kpi:
-            try:
-                self.canvas_kpi.destroy()
-            except:
-                pass
-        
-        # Create expanded KPI metrics section - spans both rows
-        kpi_frame = ctk.CTkFrame(self.charts_frame)
-        kpi_frame.grid(row=0, column=0, rowspan=2, sticky="nsew", padx=6, pady=6)
-        
-        # Title
-        title_label = ctk.CTkLabel(kpi_frame, text="📊 Business Dashboard", 
-                                 font=ctk.CTkFont(size=20, weight="bold"))
-        title_label.pack(pady=(15, 10))
-        
-        # Get metrics data
-        total_revenue = self.get_total_revenue(start_date, end_date)
-        total_appointments = self.get_total_appointments(start_date, end_date)
-        avg_appointment_value = total_revenue / max(total_appointments, 1)
-        total_customers = self.get_total_customers(start_date, end_date)
-        completed_appointments = self.get_completed_appointments(start_date, end_date)
-        pending_appointments = self.get_pending_appointments(start_date, end_date)
-        top_service = self.get_top_service_name(start_date, end_date)
-        
-        # Create metrics container (no scroll bar)
-        metrics_frame = ctk.CTkFrame(kpi_frame, fg_color="transparent")
-        metrics_frame.pack(fill="both", expand=True, padx=15, pady=10)
-        
-        # Configure grid for metrics (2 columns, multiple rows)
-        metrics_frame.grid_columnconfigure(0, weight=1)
-        metrics_frame.grid_columnconfigure(1, weight=1)
-        
-        row = 0
-        
-        # Revenue Metrics Section
-        revenue_section = ctk.CTkLabel(metrics_frame, text="💰 REVENUE & FINANCE", 
-                                     font=ctk.CTkFont(size=14, weight="bold"), 
-                                     text_color="#4CAF50")
-        revenue_section.grid(row=row, column=0, columnspan=2, pady=(10, 5), sticky="w")
-        row += 1
-        
-        # Total Revenue
-        revenue_card = ctk.CTkFrame(metrics_frame)
-        revenue_card.grid(row=row, column=0, sticky="nsew", padx=(0, 5), pady=3)
-        ctk.CTkLabel(revenue_card, text="Total Revenue", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        ctk.CTkLabel(revenue_card, text=f"${total_revenue:,.2f}", 
-                    font=ctk.CTkFont(size=18, weight="bold"), 
-                    text_color="#4CAF50").pack(pady=(0, 8))
-        
-        # Average Appointment Value
-        avg_card = ctk.CTkFrame(metrics_frame)
-        avg_card.grid(row=row, column=1, sticky="nsew", padx=(5, 0), pady=3)
-        ctk.CTkLabel(avg_card, text="Average Value", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        ctk.CTkLabel(avg_card, text=f"${avg_appointment_value:.2f}", 
-                    font=ctk.CTkFont(size=18, weight="bold"), 
-                    text_color="#FF9800").pack(pady=(0, 8))
-        row += 1
-        
-        # Appointments Section
-        appt_section = ctk.CTkLabel(metrics_frame, text="📅 APPOINTMENTS", 
-                                  font=ctk.CTkFont(size=14, weight="bold"), 
-                                  text_color="#2196F3")
-        appt_section.grid(row=row, column=0, columnspan=2, pady=(15, 5), sticky="w")
-        row += 1
-        
-        # Total Appointments
-        total_appt_card = ctk.CTkFrame(metrics_frame)
-        total_appt_card.grid(row=row, column=0, sticky="nsew", padx=(0, 5), pady=3)
-        ctk.CTkLabel(total_appt_card, text="Total Appointments", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        ctk.CTkLabel(total_appt_card, text=f"{total_appointments:,}", 
-                    font=ctk.CTkFont(size=18, weight="bold"), 
-                    text_color="#2196F3").pack(pady=(0, 8))
-        
-        # Completed Appointments
-        completed_card = ctk.CTkFrame(metrics_frame)
-        completed_card.grid(row=row, column=1, sticky="nsew", padx=(5, 0), pady=3)
-        ctk.CTkLabel(completed_card, text="Completed", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        ctk.CTkLabel(completed_card, text=f"{completed_appointments:,}", 
-                    font=ctk.CTkFont(size=18, weight="bold"), 
-                    text_color="#4CAF50").pack(pady=(0, 8))
-        row += 1
-        
-        # Pending Appointments (in new row)
-        pending_card = ctk.CTkFrame(metrics_frame)
-        pending_card.grid(row=row, column=0, sticky="nsew", padx=(0, 5), pady=3)
-        ctk.CTkLabel(pending_card, text="Pending/Scheduled", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        ctk.CTkLabel(pending_card, text=f"{pending_appointments:,}", 
-                    font=ctk.CTkFont(size=18, weight="bold"), 
-                    text_color="#FF9800").pack(pady=(0, 8))
-        
-        # Completion Rate
-        completion_rate = (completed_appointments / max(total_appointments, 1)) * 100
-        completion_card = ctk.CTkFrame(metrics_frame)
-        completion_card.grid(row=row, column=1, sticky="nsew", padx=(5, 0), pady=3)
-        ctk.CTkLabel(completion_card, text="Completion Rate", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        ctk.CTkLabel(completion_card, text=f"{completion_rate:.1f}%", 
-                    font=ctk.CTkFont(size=18, weight="bold"), 
-                    text_color="#9C27B0").pack(pady=(0, 8))
-        row += 1
-        
-        # Customer & Service Section
-        customer_section = ctk.CTkLabel(metrics_frame, text="👥 CUSTOMERS & SERVICES", 
-                                      font=ctk.CTkFont(size=14, weight="bold"), 
-                                      text_color="#9C27B0")
-        customer_section.grid(row=row, column=0, columnspan=2, pady=(15, 5), sticky="w")
-        row += 1
-        
-        # Total Customers
-        customer_card = ctk.CTkFrame(metrics_frame)
-        customer_card.grid(row=row, column=0, sticky="nsew", padx=(0, 5), pady=3)
-        ctk.CTkLabel(customer_card, text="Unique Customers", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        ctk.CTkLabel(customer_card, text=f"{total_customers:,}", 
-                    font=ctk.CTkFont(size=18, weight="bold"), 
-                    text_color="#9C27B0").pack(pady=(0, 8))
-        
-        # Top Service
-        service_card = ctk.CTkFrame(metrics_frame)
-        service_card.grid(row=row, column=1, sticky="nsew", padx=(5, 0), pady=3)
-        ctk.CTkLabel(service_card, text="Top Service", 
-                    font=ctk.CTkFont(size=11, weight="bold")).pack(pady=(8, 2))
-        service_text = top_service if len(top_service) <= 15 else top_service[:12] + "..."
-        ctk.CTkLabel(service_card, text=service_text, 
-                    font=ctk.CTkFont(size=14, weight="bold"), 
-                    text_color="#FF5722").pack(pady=(0, 8))
-        
-        self.canvas_kpi = kpi_frame  # Store reference for cleanup
-
-    def draw_revenue_trend_chart(self, start_date, end_date):
-        if self.canvas_right_chart:
-            try:
-                if hasattr(self.canvas_right_chart, 'get_tk_widget'):
-                    self.canvas_right_chart.get_tk_widget().destroy()
-                else:
-                    self.canvas_right_chart.destroy()
-            except:
-                pass
-        
-        # Get daily revenue trend data
-        revenue_data = self.load_daily_revenue_trend(start_date, end_date)
-        
+    def draw_kpi_metrics(self, kpi):
+        self._kpi = kpi
+        self.kpi_panel.show(replace(kpi, top_service=self._top_service))
+
+    def _show_top_service(self, service_rev):
+        self._top_service = service_rev[0][0] if service_rev and service_rev[0][1] > 0 else "No Data"
+        self.kpi_panel.show(replace(self._kpi, top_service=self._top_service))
+
+    def _chart_canvas(self):
+        """
+        The right-hand chart slot, built once: one Figure / FigureCanvasTkAgg holding
+        the axes of both charts. Refreshes update their artists in place and switching
+        charts only toggles which axes is visible, so neither pays for figure, canvas
+        or layout construction again.
+        """
+        if self.canvas_right_chart is not None:
+            return self.canvas_right_chart
+
         fig = Figure(figsize=(5, 6), dpi=100)  # Taller since it spans 2 rows
-        ax = fig.add_subplot(111)
-        
-        if revenue_data:
-            dates = [data[0] for data in revenue_data]
-            revenues = [data[1] for data in revenue_data]
-            
-            # Create line plot with markers
-            ax.plot(dates, revenues, marker='o', linewidth=2, markersize=6, 
-                   color='#4CAF50', markerfacecolor='#4CAF50', markeredgecolor='white')
-            
-            # Fill area under the curve for visual appeal
-            ax.fill_between(dates, revenues, alpha=0.3, color='#4CAF50')
-            
-            # Format x-axis dates
-            if len(dates) > 10:
-                # Show every nth date if too many points
-                step = max(1, len(dates) // 8)
-                ax.set_xticks(range(0, len(dates), step))
-                ax.set_xticklabels([dates[i][-5:] for i in range(0, len(dates), step)])  # Show MM-DD
-            else:
-                ax.set_xticklabels([d[-5:] for d in dates])  # Show MM-DD for all
-            
-            ax.tick_params(axis='x', rotation=45, labelsize=9)
-            
-            # Add value annotations on peaks
-            max_revenue = max(revenues) if revenues else 0
-            if max_revenue > 0:
-                max_idx = revenues.index(max_revenue)
-                ax.annotate(f'${max_revenue:.0f}', xy=(max_idx, max_revenue), 
-                           xytext=(5, 5), textcoords='offset points', 
-                           fontsize=8, fontweight='bold',
-                           bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7))
-        else:
-            # No data available
-            ax.text(0.5, 0.5, 'No Revenue Data\nfor Selected Period', 
-                   ha='center', va='center', transform=ax.transAxes,
-                   fontsize=14, fontweight='bold')
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-        
-        ax.set_title("Daily Revenue Trend", fontsize=14, fontweight='bold')
+        # Fixed margins instead of tight_layout() on every refresh
+        fig.subplots_adjust(left=0.16, right=0.95, top=0.92, bottom=0.14)
+
+        # Revenue trend: line with markers, filled area, peak annotation, "no data" message
+        ax = fig.add_subplot(111, label="trend")
+        self._trend_line, = ax.plot([], [], marker='o', linewidth=2, markersize=6,
+                                    color='#4CAF50', markerfacecolor='#4CAF50', markeredgecolor='white')
+        self._trend_fill = ax.fill_between([0, 1], [0, 0], alpha=0.3, color='#4CAF50')
+        self._trend_peak = ax.annotate("", xy=(0, 0), xytext=(5, 5), textcoords='offset points',
+                                       fontsize=8, fontweight='bold',
+                                       bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7))
+        self._trend_empty = ax.text(0.5, 0.5, 'No Revenue Data\nfor Selected Period',
+                                    ha='center', va='center', transform=ax.transAxes,
+                                    fontsize=14, fontweight='bold')
         ax.set_xlabel("Date", fontsize=10)
         ax.set_ylabel("Revenue ($)", fontsize=10)
-        ax.grid(True, alpha=0.3)
-        
-        # Style the chart
-        self._style_fig_ax(fig, ax)
-        fig.tight_layout(pad=1.2)
-        
+        ax.tick_params(axis='x', rotation=45, labelsize=9)
+        self._trend_ax = ax
+
+        # Service mix: wedges and their labels are pooled (see draw_service_mix_pie)
+        pie = fig.add_subplot(111, label="pie")
+        pie.set_aspect('equal')
+        pie.set_xlim(-1.4, 1.4)
+        pie.set_ylim(-1.3, 1.3)
+        pie.axis('off')
+        pie.set_title("Service Mix (Revenue Share)")
+        self._pie_ax = pie
+        self._pie_parts = []  # [(Wedge, name Text, percent Text)]
+
         self.canvas_right_chart = FigureCanvasTkAgg(fig, master=self.charts_frame)
-        self.canvas_right_chart.draw()
         self.canvas_right_chart.get_tk_widget().grid(row=0, column=1, rowspan=2, sticky="nsew", padx=6, pady=6)
+        return self.canvas_right_chart
+
+    def _show_chart(self, ax):
+        for chart_ax in (self._trend_ax, self._pie_ax):
+            chart_ax.set_visible(chart_ax is ax)
+
+    def draw_revenue_trend_chart(self, series):
+        canvas = self._chart_canvas()
+        ax = self._trend_ax
+        self._show_chart(ax)
+
+        revenue_data = series.points or []
+        dates = [data[0] for data in revenue_data]
+        revenues = [data[1] for data in revenue_data]
+        ax.set_title(f"{TREND_TITLES[series.bucket]} Revenue Trend", fontsize=14, fontweight='bold')
+
+        # Never draw more points than the axes is wide in pixels; LTTB keeps the spikes
+        width_px = max(int(ax.get_window_extent().width), 3)
+        xs = lttb(list(enumerate(revenues)), width_px)  # categorical x positions, as the date strings gave
+        if revenues and revenues.index(max(revenues)) not in xs:
+            insort(xs, revenues.index(max(revenues)))  # the annotated peak is always drawn
+        ys = [revenues[i] for i in xs]
+        self._trend_line.set_data(xs, ys)
+        self._trend_line.set_marker('o' if len(xs) <= TREND_MARKER_LIMIT else 'None')
+        self._trend_empty.set_visible(not revenue_data)
+
+        if revenue_data:
+            self._trend_fill.set_verts([[(xs[0], 0)] + list(zip(xs, ys)) + [(xs[-1], 0)]])
+
+            # About 8 date labels whatever the number of points
+            step = max(1, len(dates) // 8) if len(dates) > 10 else 1
+            ticks = list(range(0, len(dates), step))
+            ax.set_xticks(ticks)
+            # MM-DD for days and weeks, YYYY-MM for months
+            ax.set_xticklabels([dates[i][:7] if series.bucket == "month" else dates[i][5:10] for i in ticks])
+            ax.set_xlim(-0.5, max(len(dates) - 0.5, 0.5))
+            top = max(revenues)
+            ax.set_ylim(0, top * 1.12 if top > 0 else 1)
+
+            # Annotate the peak (found on the full series, not the downsampled one)
+            self._trend_peak.set_visible(top > 0)
+            if top > 0:
+                self._trend_peak.xy = (revenues.index(top), top)
+                self._trend_peak.set_text(f'${top:.0f}')
+        else:
+            self._trend_fill.set_verts([])
+            self._trend_peak.set_visible(False)
+            ax.set_xticks([])
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+
+        # Style the chart (dark mode may have changed since the last refresh)
+        self._style_fig_ax(canvas.figure, ax)
+        self._trend_empty.set_color(ax.title.get_color())
+        canvas.draw_idle()
 
     def draw_service_mix_pie(self, service_rev):
-        if self.canvas_right_chart:
-            try:
-                if hasattr(self.canvas_right_chart, 'get_tk_widget'):
-                    self.canvas_right_chart.get_tk_widget().destroy()
-                else:
-                    self.canvas_right_chart.destroy()
-            except:
-                pass
+        canvas = self._chart_canvas()
+        ax = self._pie_ax
+        self._show_chart(ax)
+
         labels = [n if len(n) < 18 else n[:15] + "..." for n, _ in service_rev]
         vals = [v for _, v in service_rev]
         if sum(vals) <= 0:
             labels, vals = ["No Data"], [1]
-        fig = Figure(figsize=(4, 3.2), dpi=100)  # Smaller width since moving to right
-        ax = fig.add_subplot(111)
-        dark = bool(self.get_is_dark())
-        text_color = "#eaeaea" if dark else "#000000"
-        
-        # Create pie chart with white text for dark theme
-        wedges, texts, autotexts = ax.pie(vals, labels=labels, autopct="%1.1f%%", 
-                                         startangle=90, textprops={'color': text_color})
-        
-        # Ensure percentage text is also white
-        for autotext in autotexts:
-            autotext.set_color(text_color)
-            autotext.set_fontweight('bold')
-        
-        ax.set_title("Service Mix (Revenue Share)")
-        fig.patch.set_facecolor(DARK_BG if dark else LIGHT_BG)
-        ax.set_facecolor(DARK_AX if dark else LIGHT_AX)
+        total = float(sum(vals))
+        p = self._palette()
+        text_color = p.chart_fg
+
+        # Grow the wedge pool when there are more services than ever shown before
+        colors = rcParams['axes.prop_cycle'].by_key()['color']
+        while len(self._pie_parts) < len(vals):
+            wedge = Wedge((0, 0), 1, 0, 0, facecolor=colors[len(self._pie_parts) % len(colors)])
+            ax.add_patch(wedge)
+            self._pie_parts.append((wedge, ax.text(0, 0, "", va='center'),
+                                    ax.text(0, 0, "", ha='center', va='center', fontweight='bold')))
+
+        # Same geometry as ax.pie(startangle=90): counter-clockwise, names at 1.1, percents at 0.6
+        angle = 90.0
+        for i, (wedge, name, pct) in enumerate(self._pie_parts):
+            shown = i < len(vals)
+            for artist in (wedge, name, pct):
+                artist.set_visible(shown)
+            if not shown:
+                continue
+            span = 360.0 * vals[i] / total
+            wedge.set_theta1(angle)
+            wedge.set_theta2(angle + span)
+            mid = math.radians(angle + span / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            name.set_position((1.1 * x, 1.1 * y))
+            name.set_horizontalalignment('left' if x > 0 else 'right')
+            name.set_text(labels[i])
+            name.set_color(text_color)
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{100 * vals[i] / total:.1f}%")
+            pct.set_color(text_color)
+            angle += span
+
+        canvas.figure.patch.set_facecolor(p.chart_bg)
+        ax.set_facecolor(p.chart_ax)
         ax.title.set_color(text_color)
-        
-        fig.tight_layout(pad=1.0)
-        self.canvas_right_chart = FigureCanvasTkAgg(fig, master=self.charts_frame)
-        self.canvas_right_chart.draw()
-        self.canvas_right_chart.get_tk_widget().grid(row=0, column=1, rowspan=2, sticky="nsew", padx=6, pady=6)
+        canvas.draw_idle()
 
     # ---------- Refresh ----------
     def initial_refresh(self):
@@ -561,26 +742,11 @@ class DashboardFrame(ctk.CTkFrame):
         self.refresh_all()
     
     def refresh_all(self):
-        start_s = self.start_entry.get().strip()
-        end_s = self.end_entry.get().strip()
-        try:
-            start_date = datetime.strptime(start_s, "%Y-%m-%d").date()
-            end_date = datetime.strptime(end_s, "%Y-%m-%d").date()
-            if end_date < start_date:
-                raise ValueError("End date is before start date.")
-        except Exception as e:
-            messagebox.showerror("Invalid Dates", f"Please use YYYY-MM-DD.\n\n{e}")
-            return
-        # Draw KPI metrics
-        self.draw_kpi_metrics(start_date, end_date)
-        
-        # Draw selected chart based on dropdown
-        selected_chart = self.chart_selector.get()
-        if selected_chart == "Revenue Trend":
-            self.draw_revenue_trend_chart(start_date, end_date)
-        elif selected_chart == "Service Mix":
-            services = self.load_service_revenue(start_date, end_date)
-            self.draw_service_mix_pie(services)
+        """Refresh now (no debounce), e.g. when the page is shown."""
+        if self._refresh_after is not None:
+            self.after_cancel(self._refresh_after)
+        self._refresh_interactive = True
+        self._run_refresh()
 
     # ---------- Public API ----------
     def set_dark_mode_getter(self, get_is_dark):
@@ -0,0 +1,26 @@
+# dashboard_config.py
+"""
+Dashboard cache settings, kept apart from dashboard.py so the main window can
+create its ResultCache without importing customtkinter and matplotlib.
+"""
+from result_cache import ResultCache
+
+# Tables each loader reads; writes to them invalidate its cached results
+LOADER_TABLES = {
+    "load_monthly_sales": ("Payments",),
+    "load_daily_revenue_trend": ("Payments",),
+    "load_service_revenue": ("Appointments", "AppointmentServices", "Services"),
+    "load_kpi_snapshot": ("Appointments", "Payments"),
+}
+
+# Seconds a cached result is trusted without a local write (bounds staleness from other clients)
+LOADER_TTLS = {
+    "load_kpi_snapshot": 60,
+    "load_daily_revenue_trend": 300,
+    "load_monthly_sales": 300,
+    "load_service_revenue": 300,
+}
+
+def create_result_cache():
+    """ResultCache configured for the dashboard loaders."""
+    return ResultCache(default_ttl=120, ttls=LOADER_TTLS)
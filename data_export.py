@@ -0,0 +1,279 @@
+# data_export.py
+"""
+Streaming export of payments, appointments and customers.
+
+    python data_export.py payments payments_2025.csv --from 2025-01-01 --to 2025-12-31
+    python data_export.py appointments appts.csv.gz --status completed,canceled
+    python data_export.py customers customers.parquet
+
+Rows are read with an unbuffered cursor in fetchmany() batches and written
+straight to the file, so memory stays flat whatever the table size. The format
+comes from the file name: .csv, .csv.gz or .parquet (needs pyarrow). The date
+filter is a range on the indexed date column (idx_payments_date,
+idx_appts_date), and rows come out in that index's order. Output goes to
+<file>.part and is renamed when complete, so a cancelled or failed export never
+leaves a truncated file behind.
+"""
+import argparse
+import csv
+import gzip
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import mysql.connector
+
+
+@dataclass
+class ExportSpec:
+    """
+    Args:
+        from_sql: FROM / JOIN clause
+        columns: [(header, sql expression, kind)]; kind is int, money, date, time or text
+        key: unique ordering column (tie-breaker after the date column)
+        date_column: column the date range filters on
+        status_column / statuses: column and allowed values for the status filter
+    """
+    from_sql: str
+    columns: list
+    key: str
+    date_column: str
+    status_column: str = None
+    statuses: tuple = ()
+
+
+EXPORTS = {
+    "payments": ExportSpec(
+        "Payments p JOIN Appointments a ON a.AppointmentID = p.AppointmentID "
+        "JOIN Customers c ON c.CustomerID = a.CustomerID",
+        [("PaymentID", "p.PaymentID", "int"),
+         ("PaymentDate", "p.PaymentDate", "date"),
+         ("AppointmentID", "p.AppointmentID", "int"),
+         ("CustomerID", "c.CustomerID", "int"),
+         ("Customer", "CONCAT(c.FirstName, ' ', c.LastName)", "text"),
+         ("Amount", "p.Amount", "money"),
+         ("PaymentMethod", "p.PaymentMethod", "text"),
+         ("TransactionID", "p.TransactionID", "text"),
+         ("Status", "p.Status", "text")],
+        key="p.PaymentID", date_column="p.PaymentDate",
+        status_column="p.Status", statuses=("pending", "completed", "refunded")),
+    "appointments": ExportSpec(
+        "Appointments a",
+        [("AppointmentID", "a.AppointmentID", "int"),
+         ("AppointmentDate", "a.AppointmentDate", "date"),
+         ("StartTime", "a.StartTime", "time"),
+         ("EndTime", "a.EndTime", "time"),
+         ("CustomerID", "a.CustomerID", "int"),
+         ("VehicleID", "a.VehicleID", "int"),
+         ("EmployeeID", "a.EmployeeID", "int"),
+         ("Status", "a.Status", "text")],
+        key="a.AppointmentID", date_column="a.AppointmentDate",
+        status_column="a.Status", statuses=("scheduled", "in progress", "completed", "canceled")),
+    "customers": ExportSpec(
+        "Customers c",
+        [("CustomerID", "c.CustomerID", "int"),
+         ("FirstName", "c.FirstName", "text"),
+         ("LastName", "c.LastName", "text"),
+         ("Email", "c.Email", "text"),
+         ("Phone", "c.Phone", "text"),
+         ("Address", "c.Address", "text"),
+         ("City", "c.City", "text"),
+         ("State", "c.State", "text"),
+         ("ZipCode", "c.ZipCode", "text"),
+         ("JoinDate", "c.JoinDate", "date"),
+         ("ReferralSource", "c.ReferralSource", "text")],
+        key="c.CustomerID", date_column="c.JoinDate"),
+}
+
+FORMATS = ("csv", "csv.gz", "parquet")
+
+
+def format_for(path):
+    """Export format from the file name (default csv)."""
+    name = path.lower()
+    if name.endswith(".csv.gz") or name.endswith(".gz"):
+        return "csv.gz"
+    if name.endswith(".parquet"):
+        return "parquet"
+    return "csv"
+
+
+def build_export_query(spec, date_from=None, date_to=None, statuses=()):
+    """
+    (sql, params, count_sql) for an export. With a date range the rows are ordered
+    by (date, key), which the date index already provides; otherwise by key.
+    """
+    where, params = [], []
+    if date_from is not None:
+        where.append(f"{spec.date_column} >= %s"); params.append(date_from)
+    if date_to is not None:
+        where.append(f"{spec.date_column} <= %s"); params.append(date_to)
+    if statuses:
+        unknown = [s for s in statuses if s not in spec.statuses]
+        if unknown or spec.status_column is None:
+            raise ValueError(f"Unknown status filter: {', '.join(unknown or statuses)}")
+        where.append(f"{spec.status_column} IN ({', '.join(['%s'] * len(statuses))})")
+        params.extend(statuses)
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+    order = f"{spec.date_column}, {spec.key}" if date_from is not None or date_to is not None else spec.key
+    select = ", ".join(expr for _, expr, _ in spec.columns)
+    sql = f"SELECT {select} FROM {spec.from_sql}{where_sql} ORDER BY {order}"
+    count_sql = f"SELECT COUNT(*) FROM {spec.from_sql}{where_sql}"
+    return sql, params, count_sql
+
+
+# ---------- Sinks ----------
+class CsvSink:
+    """Plain or gzip CSV; values are written as MySQL returns them (dates ISO, decimals exact)."""
+    def __init__(self, path, columns, compress=False):
+        if compress:
+            self.file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        else:
+            self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _, _ in columns])
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """One Parquet row group per fetched batch, with a fixed schema from the column kinds."""
+    def __init__(self, path, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).") from None
+        types = {"int": pa.int64(), "money": pa.decimal128(10, 2), "date": pa.date32(),
+                 "time": pa.duration("s"), "text": pa.string()}
+        self.pa = pa
+        self.schema = pa.schema([(name, types[kind]) for name, _, kind in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        arrays = [list(col) for col in zip(*rows)]
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(values, type=field.type) for values, field in zip(arrays, self.schema)],
+            schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def open_sink(fmt, path, columns):
+    if fmt == "parquet":
+        return ParquetSink(path, columns)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return CsvSink(path, columns, compress=(fmt == "csv.gz"))
+
+
+@dataclass
+class ExportResult:
+    rows: int = 0
+    total: int = 0          # COUNT(*) of the filtered rows, for progress
+    path: str = None
+    cancelled: bool = False
+
+
+def export(connect, kind, path, date_from=None, date_to=None, statuses=(), fmt=None,
+           batch_size=5000, progress=None, cancelled=None):
+    """
+    Stream one export to `path` and return an ExportResult.
+
+    Args:
+        connect: callable returning a dedicated mysql connection. Not a pooled one:
+                 a cancelled export abandons an unread result set, and the connection is dropped
+        kind: key of EXPORTS
+        date_from / date_to: inclusive date range (date or 'YYYY-MM-DD'), either may be None
+        statuses: status values to keep (empty = all)
+        fmt: one of FORMATS (default: from the file name)
+        progress: progress(ExportResult) after every batch
+        cancelled: checked before every batch; a cancelled export removes its partial file
+    """
+    spec = EXPORTS[kind]
+    fmt = fmt or format_for(path)
+    sql, params, count_sql = build_export_query(spec, date_from, date_to, statuses)
+    result = ExportResult(path=path)
+    part = path + ".part"
+
+    conn = connect()
+    sink = None
+    finished = False
+    try:
+        cur = conn.cursor()
+        cur.execute(count_sql, params)
+        result.total = cur.fetchone()[0]
+        # The server stops waiting on a slow reader after net_write_timeout
+        cur.execute("SET SESSION net_write_timeout = 600")
+        cur.close()
+
+        cur = conn.cursor(buffered=False)
+        cur.execute(sql, params)
+        sink = open_sink(fmt, part, spec.columns)
+        while True:
+            if cancelled is not None and cancelled():
+                result.cancelled = True
+                break
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            sink.write(rows)
+            result.rows += len(rows)
+            if progress is not None:
+                progress(ExportResult(result.rows, result.total, path))
+        finished = not result.cancelled
+        if finished:
+            cur.close()
+    finally:
+        if sink is not None:
+            sink.close()
+        if finished:
+            conn.close()
+            os.replace(part, path)
+        else:
+            # Skip reading the rest of an abandoned result set: drop the socket instead
+            try:
+                conn.shutdown()
+            except Exception:
+                try: conn.close()
+                except Exception: pass
+            if os.path.exists(part):
+                os.remove(part)
+    return result
+
+
+def main(argv=None):
+    from nathan_auto_ui import DB_CONFIG
+
+    date_arg = lambda s: datetime.strptime(s, "%Y-%m-%d").date()
+    parser = argparse.ArgumentParser(description="Export payments, appointments or customers.")
+    parser.add_argument("kind", choices=sorted(EXPORTS))
+    parser.add_argument("path", help="output file: .csv, .csv.gz or .parquet")
+    parser.add_argument("--from", dest="date_from", type=date_arg, help="first date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date_arg, help="last date (YYYY-MM-DD)")
+    parser.add_argument("--status", default="", help="comma-separated statuses to keep")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per fetchmany()")
+    parser.add_argument("--database", default=DB_CONFIG["database"])
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    def progress(r):
+        print(f"\r{r.rows:,} / {r.total:,} rows", end="", flush=True)
+
+    statuses = tuple(s.strip() for s in args.status.split(",") if s.strip())
+    result = export(lambda: mysql.connector.connect(**dict(DB_CONFIG, database=args.database)),
+                    args.kind, args.path, args.date_from, args.date_to, statuses,
+                    batch_size=args.batch_size, progress=progress)
+    print(f"\nWrote {result.rows:,} rows to {result.path} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+# data_grid.py
+import tkinter as tk
+from tkinter import messagebox, ttk
+from dataclasses import dataclass
+
+
+@dataclass
+class GridSpec:
+    """
+    Describes what a DataGrid shows.
+
+    columns: [(heading, sql_expr, sortable), ...]. The first column must be the
+             table's primary key; it doubles as the keyset tie-breaker.
+    from_sql: everything after FROM (joins allowed), e.g. "Vehicles v JOIN Customers c ON ..."
+    tables: [(table, key_column), ...] whose changes affect the rows shown; used to
+            fingerprint the grid for the RowCache (empty = never cached)
+    Sortable columns should be backed by an index on the driving table so each
+    page is an index range read instead of a filesort.
+    """
+    columns: list
+    from_sql: str
+    tables: tuple = ()
+
+    @property
+    def headings(self):
+        return [c[0] for c in self.columns]
+
+    @property
+    def key_expr(self):
+        return self.columns[0][1]
+
+
+def build_page_query(spec, sort_index=0, descending=False, after=None, limit=200,
+                     where=None, where_params=(), source=None, source_params=()):
+    """
+    Build (sql, params) for one keyset page.
+
+    after: (sort_value, key_value) of the last row already shown, or None for the first page.
+    source/source_params: replaces spec.from_sql, e.g. to restrict the grid to search hits.
+    Rows are ordered by the sort column, then the key, so paging is stable even when
+    the sort column has duplicates.
+    """
+    select = ", ".join(expr for _, expr, _ in spec.columns)
+    key = spec.key_expr
+    sort = spec.columns[sort_index][1]
+    op, direction = ("<", "DESC") if descending else (">", "ASC")
+
+    conditions, params = [], list(source_params) if source else []
+    if where:
+        conditions.append(f"({where})")
+        params.extend(where_params)
+    if after is not None:
+        sort_value, key_value = after
+        if sort == key:
+            conditions.append(f"{key} {op} %s")
+            params.append(key_value)
+        else:
+            # Leading range on the sort column keeps the predicate sargable
+            conditions.append(f"{sort} {op}= %s AND ({sort} {op} %s OR {key} {op} %s)")
+            params.extend([sort_value, sort_value, key_value])
+
+    sql = f"SELECT {select} FROM {source or spec.from_sql}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if sort == key:
+        sql += f" ORDER BY {key} {direction}"
+    else:
+        sql += f" ORDER BY {sort} {direction}, {key} {direction}"
+    sql += " LIMIT %s"
+    params.append(int(limit))
+    return sql, tuple(params)
+
+
+def build_row_query(spec, key_value, source=None, source_params=()):
+    """Build (sql, params) that fetches a single row by primary key (one indexed lookup)."""
+    select = ", ".join(expr for _, expr, _ in spec.columns)
+    params = (tuple(source_params) if source else ()) + (key_value,)
+    return f"SELECT {select} FROM {source or spec.from_sql} WHERE {spec.key_expr} = %s", params
+
+
+def _fetch_rows(get_connection, sql, params):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        cur.close()
+        return rows
+    finally:
+        conn.close()
+
+
+def _fetch_or_reuse(cache, key, tables, get_connection, sql, params):
+    """
+    Fingerprint the grid's tables and reuse the cached rows if they still match;
+    otherwise fetch the first page. Returns (fingerprint, entry_or_None, rows).
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        fingerprint = cache.fingerprint(cur, tables)
+        entry = cache.get(key, fingerprint)
+        rows = []
+        if entry is None:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        cur.close()
+        return fingerprint, entry, rows
+    finally:
+        conn.close()
+
+
+class DataGrid(tk.Frame):
+    """
+    Treeview that only holds what the user has scrolled to.
+
+    The first page (visible window plus a prefetch margin) is loaded on reload();
+    further pages are fetched with keyset pagination when the view scrolls near the
+    bottom. Clicking a sortable heading re-sorts on the server. Queries run on the
+    BackgroundRunner, so the UI never waits on them.
+
+    Args:
+        parent: tk widget
+        spec: GridSpec
+        get_connection: callable returning a mysql connection
+        runner: BackgroundRunner
+        page_size: rows fetched per page
+        prefetch: fetch the next page once the view is scrolled past this fraction
+        style: ttk style name for the Treeview
+        cache: RowCache shared across pages; reused rows skip the fetch when the
+               spec's tables are unchanged
+    """
+    def __init__(self, parent, spec, get_connection, runner, page_size=200, prefetch=0.8, style=None,
+                 cache=None):
+        super().__init__(parent)
+        self.spec = spec
+        self.get_connection = get_connection
+        self.runner = runner
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.cache = cache
+
+        self.sort_index = 0
+        self.descending = False
+        self._cursor = None       # (sort_value, key) of the last loaded row
+        self._rows = {}           # iid -> raw row, used to place patched rows
+        self._source = None       # (from_sql, params) overriding spec.from_sql, e.g. search hits
+        self._fingerprint = None  # fingerprint the loaded rows were cached under, if any
+        self._exhausted = False
+        self._loading = False
+        self._channel = f"grid.{id(self)}"
+
+        self.tree = ttk.Treeview(self, columns=spec.headings, show='headings')
+        if style:
+            self.tree.configure(style=style)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        for index, heading in enumerate(spec.headings):
+            if spec.columns[index][2]:
+                self.tree.heading(heading, text=heading, command=lambda i=index: self.sort_by(i))
+            else:
+                self.tree.heading(heading, text=heading)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+        self._update_headings()
+
+    # ---------- Loading ----------
+    def reload(self):
+        """Drop loaded rows and fetch the first page again."""
+        self._cursor = None
+        self._exhausted = False
+        self._fingerprint = None
+        if self._cacheable():
+            self._fetch_cached()
+        else:
+            self._fetch_page(replace=True)
+
+    def set_source(self, from_sql=None, params=()):
+        """Show rows from another FROM clause (None = the spec's own) and reload."""
+        self._source = (from_sql, tuple(params)) if from_sql else None
+        self.reload()
+
+    def _source_args(self):
+        if self._source is None:
+            return {}
+        return {"source": self._source[0], "source_params": self._source[1]}
+
+    def _fetch_page(self, replace=False):
+        sql, params = build_page_query(self.spec, self.sort_index, self.descending,
+                                       after=None if replace else self._cursor,
+                                       limit=self.page_size, **self._source_args())
+        self._loading = True
+        self.runner.submit(_fetch_rows, self.get_connection, sql, params,
+                           channel=self._channel, owner=self.tree,
+                           on_done=lambda rows: self._show_page(rows, replace),
+                           on_error=self._on_error)
+
+    # ---------- Row cache ----------
+    def _cacheable(self):
+        return self.cache is not None and bool(self.spec.tables) and self._source is None
+
+    def _cache_key(self):
+        return (self.spec.from_sql, self.sort_index, self.descending, self.page_size)
+
+    def _fetch_cached(self):
+        sql, params = build_page_query(self.spec, self.sort_index, self.descending,
+                                       limit=self.page_size)
+        self._loading = True
+        self.runner.submit(_fetch_or_reuse, self.cache, self._cache_key(), self.spec.tables,
+                           self.get_connection, sql, params,
+                           channel=self._channel, owner=self.tree,
+                           on_done=self._show_cached, on_error=self._on_error)
+
+    def _show_cached(self, result):
+        fingerprint, entry, rows = result
+        self._fingerprint = fingerprint
+        if entry is None:
+            return self._show_page(rows, replace=True)
+        self._loading = False
+        self.tree.delete(*self.tree.get_children())
+        self._rows.clear()
+        for row in entry.rows:
+            self.tree.insert('', 'end', iid=str(row[0]), values=row)
+            self._rows[str(row[0])] = row
+        self._cursor = entry.cursor
+        self._exhausted = entry.exhausted
+
+    def _remember(self, rows, replace):
+        if self._fingerprint is None:
+            return
+        if replace:
+            self.cache.put(self._cache_key(), self._fingerprint, rows, self._cursor, self._exhausted)
+        else:
+            self.cache.extend(self._cache_key(), self._fingerprint, rows, self._cursor, self._exhausted)
+
+    def _forget(self):
+        """The tree now differs from what was cached (a local write); drop the entry."""
+        if self._fingerprint is not None:
+            self.cache.discard(self._cache_key())
+            self._fingerprint = None
+
+    def _show_page(self, rows, replace):
+        self._loading = False
+        if replace:
+            self.tree.delete(*self.tree.get_children())
+            self._rows.clear()
+        for row in rows:
+            if not self.tree.exists(str(row[0])):
+                self.tree.insert('', 'end', iid=str(row[0]), values=row)
+                self._rows[str(row[0])] = row
+        if rows:
+            last = rows[-1]
+            self._cursor = (last[self.sort_index], last[0])
+        self._exhausted = len(rows) < self.page_size
+        self._remember(rows, replace)
+
+    def _on_error(self, err):
+        self._loading = False
+        messagebox.showerror("Database Error", str(err))
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._loading or self._exhausted or self._cursor is None:
+            return
+        if float(last) >= self.prefetch:
+            self._fetch_page()
+
+    # ---------- Incremental updates ----------
+    def refresh_row(self, key_value):
+        """
+        Re-read one row after a write and patch it in place: update it if it is
+        shown, insert it at its sorted position, or remove it if it no longer exists.
+        """
+        sql, params = build_row_query(self.spec, key_value, **self._source_args())
+        self.runner.submit(_fetch_rows, self.get_connection, sql, params,
+                           channel=f"{self._channel}.row.{key_value}", owner=self.tree,
+                           on_done=lambda rows: self._patch_row(key_value, rows[0] if rows else None),
+                           on_error=self._on_error)
+
+    def remove_row(self, key_value):
+        """Remove a deleted row without touching the database."""
+        self._forget()
+        iid = str(key_value)
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+        self._rows.pop(iid, None)
+
+    def _patch_row(self, key_value, row):
+        if row is None:
+            return self.remove_row(key_value)
+        self._forget()
+        iid = str(row[0])
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=row)
+            self._rows[iid] = row
+            return
+        index = self._sorted_position(row)
+        if index is None:
+            return  # sorts after the loaded window; paging will bring it in
+        self.tree.insert('', index, iid=iid, values=row)
+        self._rows[iid] = row
+
+    def _sorted_position(self, row):
+        """Index where `row` belongs among the loaded rows, or None if it is past the loaded window."""
+        def fold(value):
+            # Text columns use a case-insensitive collation on the server
+            return value.casefold() if isinstance(value, str) else value
+
+        def sort_key(r):
+            return (fold(r[self.sort_index]), r[0])
+
+        new_key = sort_key(row)
+        children = self.tree.get_children()
+        for index, iid in enumerate(children):
+            loaded = self._rows.get(iid)
+            if loaded is None:
+                continue
+            try:
+                after = sort_key(loaded) > new_key if not self.descending else sort_key(loaded) < new_key
+            except TypeError:
+                return len(children)
+            if after:
+                return index
+        return len(children) if self._exhausted else None
+
+    # ---------- Sorting ----------
+    def sort_by(self, index):
+        """Sort on the server by column `index`; clicking the same heading again flips direction."""
+        if index == self.sort_index:
+            self.descending = not self.descending
+        else:
+            self.sort_index, self.descending = index, False
+        self._update_headings()
+        self.reload()
+
+    def _update_headings(self):
+        for index, heading in enumerate(self.spec.headings):
+            arrow = ""
+            if index == self.sort_index:
+                arrow = " ▼" if self.descending else " ▲"
+            self.tree.heading(heading, text=heading + arrow)
+
+    # ---------- Selection ----------
+    def selected_key(self):
+        """Primary key of the selected row, or None."""
+        sel = self.tree.selection()
+        return self.tree.item(sel[0])['values'][0] if sel else None
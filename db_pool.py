@@ -0,0 +1,197 @@
+# db_pool.py
+import queue
+import threading
+import time
+import mysql.connector
+from mysql.connector import errors
+
+
+class PooledConnection:
+    """
+    Wraps a live mysql connection checked out of a ConnectionPool.
+    Behaves like the normal connection, except close() hands it back to the pool.
+    """
+    def __init__(self, pool, cnx):
+        self._pool = pool
+        self._cnx = cnx
+
+    def close(self):
+        if self._cnx is not None:
+            cnx, self._cnx = self._cnx, None
+            self._pool._release(cnx)
+
+    def __getattr__(self, name):
+        cnx = self.__dict__.get("_cnx")
+        if cnx is None:
+            raise errors.OperationalError("Connection was already returned to the pool")
+        return getattr(cnx, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of mysql connections.
+
+    Args:
+        config: kwargs for mysql.connector.connect
+        size: max number of open connections
+        health_check_interval: seconds a connection may sit idle before it is pinged on checkout
+        timeout: seconds to wait for a free connection when the pool is exhausted
+    """
+    def __init__(self, config, size=5, health_check_interval=30, timeout=10):
+        self.config = dict(config)
+        self.size = max(1, int(size))
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+        self.last_error = None
+
+        self._idle = queue.LifoQueue()  # (connection, last_used)
+        self._lock = threading.Lock()
+        self._open = 0
+        self._stats = {
+            "connects": 0,
+            "checkouts": 0,
+            "reuses": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_checks": 0,
+            "health_failures": 0,
+            "discarded": 0,
+        }
+
+    # ---------- Internals ----------
+    def _bump(self, key, n=1):
+        with self._lock:
+            self._stats[key] += n
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._open < self.size:
+                self._open += 1
+                return True
+            return False
+
+    def _connect(self):
+        """Open a brand-new connection for a slot that was already reserved."""
+        try:
+            cnx = mysql.connector.connect(**self.config)
+        except Exception as e:
+            with self._lock:
+                self._open -= 1
+            self.last_error = e
+            raise
+        self._bump("connects")
+        self.last_error = None
+        return cnx
+
+    def _discard(self, cnx):
+        try:
+            cnx.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._open -= 1
+            self._stats["discarded"] += 1
+
+    def _healthy(self, cnx, last_used):
+        """Ping connections that sat idle for a while; fresh ones are trusted."""
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        self._bump("health_checks")
+        try:
+            cnx.ping(reconnect=True, attempts=1, delay=0)
+            return True
+        except Exception as e:
+            self.last_error = e
+            self._bump("health_failures")
+            return False
+
+    def _release(self, cnx):
+        try:
+            if cnx.unread_result:
+                cnx.consume_results()
+            if cnx.in_transaction:
+                cnx.rollback()
+        except Exception:
+            self._discard(cnx)
+            return
+        self._idle.put((cnx, time.monotonic()))
+
+    # ---------- Public API ----------
+    def get_connection(self):
+        """Check out a connection; call close() on it to return it to the pool."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                cnx, last_used = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                if self._reserve_slot():
+                    cnx = self._connect()
+                    self._bump("checkouts")
+                    return PooledConnection(self, cnx)
+                self._bump("waits")
+                remaining = deadline - time.monotonic()
+                try:
+                    cnx, last_used = self._idle.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    self._bump("timeouts")
+                    raise errors.PoolError(
+                        f"No free connection after {self.timeout}s (pool size {self.size})")
+                reused = True
+
+            if not self._healthy(cnx, last_used):
+                self._discard(cnx)
+                continue
+            self._bump("checkouts")
+            if reused:
+                self._bump("reuses")
+            return PooledConnection(self, cnx)
+
+    def prewarm(self, count=None):
+        """Open up to `count` connections ahead of time (default: the full pool size)."""
+        count = self.size if count is None else min(int(count), self.size)
+        opened = 0
+        while True:
+            with self._lock:
+                if self._open >= count:
+                    break
+                self._open += 1
+            try:
+                cnx = self._connect()
+            except Exception as e:
+                print(f"Connection pool prewarm failed: {e}")
+                break
+            self._idle.put((cnx, time.monotonic()))
+            opened += 1
+        return opened
+
+    def stats(self):
+        """Snapshot of pool metrics."""
+        with self._lock:
+            data = dict(self._stats)
+            data["size"] = self.size
+            data["open"] = self._open
+        data["idle"] = self._idle.qsize()
+        data["in_use"] = data["open"] - data["idle"]
+        return data
+
+    def close_all(self):
+        """Close every idle connection (checked-out ones are closed when returned)."""
+        while True:
+            try:
+                cnx, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(cnx)
@@ -0,0 +1,405 @@
+# explain_audit.py
+"""
+Query plan regression check for every statement the app issues.
+
+Collects SQL from:
+  • dashboard.py      - the real DashboardFrame loaders, run against a recorder
+  • nathan_auto_ui.py - grid pages / row lookups / search, plus the UPDATE and
+                        DELETE statements of the CRUD pages
+  • data_export.py    - date-filtered payment and appointment exports
+  • schema.sql        - views, and the statements inside stored procedures and
+                        triggers (NEW./OLD. and procedure parameters are replaced
+                        with sample values)
+
+Writes are rewritten as the SELECT that finds their rows, and everything is run
+with EXPLAIN ANALYZE, so nothing is modified. A statement fails when its plan
+  • does a full table or index scan on a large table,
+  • sorts more than --sort-rows rows (filesort), or
+  • examines more rows than its budget.
+
+Run it against a database loaded with schema.sql and a scaled dataset, or let it
+generate one first (this replaces the data, see generate_data.py):
+    python explain_audit.py --database nathan_auto_detail_bench --generate 1000000
+Exit status is 1 when any statement fails.
+"""
+import argparse
+import ast
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import mysql.connector
+
+import nathan_auto_ui as app
+import search
+from dashboard import DashboardFrame, LOADER_TABLES
+from data_export import EXPORTS, build_export_query
+from data_grid import build_page_query, build_row_query
+from generate_data import DatabaseWriter, TABLE_COLUMNS, generate
+from schema_catalog import get_catalog
+
+LARGE_TABLE_ROWS = 1000     # tables smaller than this may be scanned
+SORT_ROWS = 10000           # most rows a filesort may take as input
+ROWS_BUDGET = 10000         # rows examined by a point / page query
+RANGE_ROWS_BUDGET = 250000  # rows examined by a dashboard date-range query
+
+# Statements that read a whole table by design; reported but never failed
+WAIVERS = {
+    "schema.view.Top3RatedServices": "ranks every reviewed service",
+    "schema.view.CurrentCustomers": "lists every customer with an active appointment",
+}
+
+ACCESS_OPS = re.compile(
+    r"^(Table scan|Index scan|Index range scan|Index lookup|Single-row index lookup|"
+    r"Single-row covering index lookup|Covering index (?:scan|lookup|range scan|skip scan)|"
+    r"Index skip scan|Full-text index search|Multi-range index scan)\b")
+SCAN_OPS = re.compile(r"^(?:Table scan|Index scan|Covering index scan) on (\S+)")
+SORT_OPS = re.compile(r"^Sort(?: row IDs)?:")
+EST_ROWS = re.compile(r"\(cost=[^)]*?rows=([\d.e+]+)\)")
+ACTUAL_ROWS = re.compile(r"\(actual time=[\d.e+]+\.\.[\d.e+]+ rows=([\d.e+]+) loops=(\d+)\)")
+
+
+@dataclass
+class Statement:
+    """One SQL statement to audit."""
+    name: str
+    sql: str
+    params: tuple = ()
+    ranged: bool = False  # reads a date range (dashboard), so gets the larger budget
+    budget: int = ROWS_BUDGET
+    problems: list = field(default_factory=list)
+    plan: str = ""
+
+
+# ---------- Collecting: dashboard ----------
+class _DashboardProbe:
+    """Stands in for a DashboardFrame: its real loaders run, _fetch records the SQL."""
+    def __init__(self, get_connection):
+        self.get_connection = get_connection
+        self.catalog = get_catalog(get_connection)
+        self.recorded = []
+
+    def _fetch(self, query, params=None):
+        self.recorded.append((query, tuple(params or ())))
+        return []
+
+for _name in ("_has_col", "_service_name_col", "_service_revenue_query",
+              "_build_service_revenue_query", "_revenue_source", *LOADER_TABLES):
+    setattr(_DashboardProbe, _name, DashboardFrame.__dict__[_name])
+
+
+def collect_dashboard(get_connection, days):
+    end = date.today()
+    start = end - timedelta(days=days)
+    probe = _DashboardProbe(get_connection)
+    statements = []
+    for loader in LOADER_TABLES:
+        probe.recorded.clear()
+        getattr(probe, loader)(start, end)
+        for index, (sql, params) in enumerate(probe.recorded):
+            suffix = f".{index}" if index else ""
+            statements.append(Statement(f"dashboard.{loader}{suffix}", sql, params, ranged=True))
+    return statements
+
+
+# ---------- Collecting: grids and search ----------
+GRIDS = {"customers": app.CUSTOMER_GRID, "vehicles": app.VEHICLE_GRID,
+         "appointments": app.APPOINTMENT_GRID, "payments": app.PAYMENT_GRID}
+
+SEARCHES = {"customers": search.customer_search_source, "vehicles": search.vehicle_search_source}
+
+
+def _first_row(get_connection, sql, params):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+        cur.close()
+        return rows[-1] if rows else None
+    finally:
+        conn.close()
+
+
+def collect_grids(get_connection, search_terms=("a", "an")):
+    """First and follow-on pages for every sortable column and direction, row lookups and searches."""
+    statements = []
+    for page, spec in GRIDS.items():
+        for index, (heading, _, sortable) in enumerate(spec.columns):
+            if not sortable:
+                continue
+            for descending in (False, True):
+                label = f"grid.{page}.{heading}.{'desc' if descending else 'asc'}"
+                sql, params = build_page_query(spec, index, descending)
+                statements.append(Statement(label + ".first", sql, params))
+                last = _first_row(get_connection, sql, params)
+                if last is not None:
+                    sql, params = build_page_query(spec, index, descending, after=(last[index], last[0]))
+                    statements.append(Statement(label + ".next", sql, params))
+        sql, params = build_row_query(spec, 1)
+        statements.append(Statement(f"grid.{page}.row", sql, params))
+
+        make_source = SEARCHES.get(page)
+        for term in search_terms if make_source else ():
+            source, source_params = make_source(term)
+            sql, params = build_page_query(spec, source=source, source_params=source_params)
+            statements.append(Statement(f"search.{page}.{term!r}", sql, params))
+    return statements
+
+
+def collect_exports(days):
+    """Date-range exports (unfiltered exports read whole tables by design, and JoinDate has no index)."""
+    end = date.today()
+    start = end - timedelta(days=days)
+    statements = []
+    for kind in ("payments", "appointments"):
+        sql, params, count_sql = build_export_query(EXPORTS[kind], start, end)
+        statements.append(Statement(f"export.{kind}", sql, params, ranged=True))
+        statements.append(Statement(f"export.{kind}.count", count_sql, params, ranged=True))
+    return statements
+
+
+# ---------- Collecting: CRUD writes ----------
+UPDATE_RE = re.compile(r"^\s*UPDATE\s+(.*?)\s+SET\s+.*?(?:\s+WHERE\s+(.*))?$", re.IGNORECASE | re.DOTALL)
+DELETE_RE = re.compile(r"^\s*DELETE\s+FROM\s+(\w+)(?:\s+WHERE\s+(.*))?$", re.IGNORECASE | re.DOTALL)
+
+
+def _literal_text(node):
+    """Text of a str constant or f-string ('{}' for interpolated parts), else None."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return "".join(v.value if isinstance(v, ast.Constant) else "{}" for v in node.values)
+    return None
+
+
+def write_as_select(sql):
+    """
+    'UPDATE refs SET .. [WHERE cond]' / 'DELETE FROM t [WHERE cond]' -> 'SELECT 1 FROM refs [WHERE cond]',
+    which reads the same rows the write would. None for anything else.
+    """
+    m = UPDATE_RE.match(sql) or DELETE_RE.match(sql)
+    if not m:
+        return None
+    tables, where = m.group(1), m.group(2)
+    if "{}" in tables or (where and "{}" in where):
+        return None
+    return f"SELECT 1 FROM {tables}" + (f" WHERE {where.strip()}" if where else "")
+
+
+def collect_writes(path="nathan_auto_ui.py"):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    statements, seen = [], set()
+    fragments = {id(v) for n in ast.walk(tree) if isinstance(n, ast.JoinedStr) for v in n.values}
+    for node in ast.walk(tree):
+        if id(node) in fragments:
+            continue
+        text = _literal_text(node)
+        if not text:
+            continue
+        sql = write_as_select(text)
+        if sql is None or sql in seen:
+            continue
+        seen.add(sql)
+        params = tuple(1 for _ in range(sql.count("%s")))
+        statements.append(Statement(f"ui.line{node.lineno}", sql, params))
+    return statements
+
+
+# ---------- Collecting: schema.sql ----------
+STATEMENT_START = re.compile(r"^\s*(SELECT|UPDATE|DELETE|INSERT)\b", re.IGNORECASE | re.MULTILINE)
+
+
+def sample_literal(name):
+    """A representative SQL literal for a trigger column or procedure parameter."""
+    n = name.lower()
+    if n.endswith("id"):
+        return "1"
+    if "date" in n or n in ("pfrom", "pto"):
+        return "CURDATE()"
+    if "time" in n:
+        return "'11:00:00'" if n.startswith("end") else "'10:00:00'"
+    if "status" in n:
+        return "'completed'"
+    if "amount" in n:
+        return "100.00"
+    if "interval" in n:
+        return "30"
+    if "phone" in n:
+        return "'5551234567'"
+    return "NULL"
+
+
+def _body_statements(body, names):
+    """The reads of a routine body's statements, as SELECTs with sample values."""
+    body = re.sub(r"\b(?:NEW|OLD)\.(\w+)", lambda m: sample_literal(m.group(1)), body)
+    for name in names:
+        body = re.sub(rf"\b{name}\b", sample_literal(name), body)
+    out = []
+    for chunk in body.split(";"):
+        m = STATEMENT_START.search(chunk)
+        if not m:
+            continue
+        sql = chunk[m.start():].strip()
+        keyword = m.group(1).upper()
+        if keyword == "INSERT":
+            select = re.search(r"\bSELECT\b", sql, re.IGNORECASE)
+            if not select:
+                continue  # INSERT .. VALUES reads nothing
+            sql = sql[select.start():]
+        elif keyword == "SELECT":
+            sql = re.sub(r"\bINTO\s+\w+(\s*,\s*\w+)*\s+(?=FROM\b)", "", sql, flags=re.IGNORECASE)
+        else:
+            sql = write_as_select(sql)
+            if sql is None:
+                continue
+        out.append(sql)
+    return out
+
+
+def collect_schema(path="schema.sql"):
+    with open(path, encoding="utf-8") as f:
+        text = re.sub(r"--[^\n]*", "", f.read())
+    statements = []
+    for view in re.findall(r"CREATE\s+VIEW\s+(\w+)\s+AS", text, re.IGNORECASE):
+        statements.append(Statement(f"schema.view.{view}", f"SELECT * FROM {view}", ranged=True))
+
+    routine = re.compile(r"CREATE\s+(PROCEDURE|TRIGGER)\s+(\w+)(.*?)\bBEGIN\b(.*?)\bEND\s*//",
+                         re.IGNORECASE | re.DOTALL)
+    for kind, name, header, body in routine.findall(text):
+        params = re.findall(r"\b(?:IN|OUT|INOUT)\s+(\w+)", header) if kind.upper() == "PROCEDURE" else []
+        for index, sql in enumerate(_body_statements(body, params)):
+            statements.append(Statement(f"schema.{kind.lower()}.{name}.{index}", sql))
+    return statements
+
+
+# ---------- Plan checks ----------
+def _rows(line):
+    """(rows, loops) from a plan line: actual values when analyzed, else the estimate."""
+    m = ACTUAL_ROWS.search(line)
+    if m:
+        return float(m.group(1)), int(m.group(2))
+    m = EST_ROWS.search(line)
+    return (float(m.group(1)), 1) if m else (0.0, 1)
+
+
+def _op(line):
+    return re.split(r"\s+\((?:cost|actual|never)", line.strip().lstrip("-> ").strip(), maxsplit=1)[0]
+
+
+def check_plan(stmt, plan, table_rows, large_table_rows, sort_rows):
+    lines = [l for l in plan.splitlines() if l.strip().startswith("->")]
+    examined = 0.0
+    for i, line in enumerate(lines):
+        op = _op(line)
+        rows, loops = _rows(line)
+        if ACCESS_OPS.match(op):
+            examined += rows * loops
+        scan = SCAN_OPS.match(op)
+        if scan:
+            table = scan.group(1)
+            if not table.startswith("<") and table_rows.get(table.lower(), 0) >= large_table_rows:
+                stmt.problems.append(f"full scan on {table} ({table_rows[table.lower()]} rows)")
+        if SORT_OPS.match(op) and i + 1 < len(lines):
+            child_rows, child_loops = _rows(lines[i + 1])
+            if child_rows * child_loops > sort_rows:
+                stmt.problems.append(f"filesort of {int(child_rows * child_loops)} rows ({op})")
+    if examined > stmt.budget:
+        stmt.problems.append(f"examines {int(examined)} rows (budget {stmt.budget})")
+
+
+def table_sizes(cur):
+    cur.execute("SELECT TABLE_NAME, TABLE_ROWS FROM INFORMATION_SCHEMA.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'")
+    return {str(name).lower(): int(rows or 0) for name, rows in cur.fetchall()}
+
+
+def explain(cur, stmt):
+    cur.execute("EXPLAIN ANALYZE " + stmt.sql.strip().rstrip(";"), stmt.params)
+    return "\n".join(str(row[0]) for row in cur.fetchall())
+
+
+# ---------- Main ----------
+def run(get_connection, statements, large_table_rows=LARGE_TABLE_ROWS, sort_rows=SORT_ROWS):
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        sizes = table_sizes(cur)
+        for stmt in statements:
+            try:
+                stmt.plan = explain(cur, stmt)
+            except mysql.connector.Error as err:
+                stmt.problems.append(f"EXPLAIN failed: {err}")
+                continue
+            check_plan(stmt, stmt.plan, sizes, large_table_rows, sort_rows)
+        cur.close()
+    finally:
+        conn.close()
+    return statements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database", default=app.DB_CONFIG["database"])
+    parser.add_argument("--generate", type=int, metavar="APPOINTMENTS",
+                        help="first replace the data with a generated dataset of this size")
+    parser.add_argument("--seed", type=int, default=42, help="seed for --generate")
+    parser.add_argument("--days", type=int, default=90, help="dashboard date range to audit")
+    parser.add_argument("--large-table-rows", type=int, default=LARGE_TABLE_ROWS)
+    parser.add_argument("--sort-rows", type=int, default=SORT_ROWS)
+    parser.add_argument("--rows-budget", type=int, default=ROWS_BUDGET)
+    parser.add_argument("--range-rows-budget", type=int, default=RANGE_ROWS_BUDGET)
+    parser.add_argument("--only", help="audit statements whose name contains this text")
+    parser.add_argument("--show-plans", action="store_true")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    config = dict(app.DB_CONFIG, database=args.database)
+    get_connection = lambda: mysql.connector.connect(**config)
+
+    if args.generate:
+        conn = get_connection()
+        try:
+            generate(DatabaseWriter(conn), args.generate, seed=args.seed)
+            cur = conn.cursor()
+            cur.execute(f"ANALYZE TABLE {', '.join(TABLE_COLUMNS)}, DailyRevenue")
+            cur.fetchall()
+            cur.close()
+        finally:
+            conn.close()
+
+    statements = (collect_dashboard(get_connection, args.days) + collect_grids(get_connection)
+                  + collect_exports(args.days) + collect_writes() + collect_schema())
+    for stmt in statements:
+        stmt.budget = args.range_rows_budget if stmt.ranged else args.rows_budget
+    if args.only:
+        statements = [s for s in statements if args.only in s.name]
+
+    run(get_connection, statements, args.large_table_rows, args.sort_rows)
+
+    failed = 0
+    for stmt in statements:
+        waiver = WAIVERS.get(stmt.name)
+        status = "PASS" if not stmt.problems else ("WAIVED" if waiver else "FAIL")
+        failed += status == "FAIL"
+        print(f"{status:6} {stmt.name}")
+        for problem in stmt.problems:
+            print(f"         {problem}")
+        if waiver and stmt.problems:
+            print(f"         waived: {waiver}")
+        if args.show_plans or status == "FAIL":
+            print("\n".join("         " + l for l in stmt.plan.splitlines()))
+    print(f"\n{len(statements)} statements, {failed} failed")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([{"name": s.name, "sql": s.sql, "problems": s.problems, "plan": s.plan,
+                        "waived": s.name in WAIVERS} for s in statements], f, indent=2, default=str)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
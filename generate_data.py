@@ -0,0 +1,439 @@
+# generate_data.py
+"""
+Synthetic dataset generator for development and performance work.
+
+    python generate_data.py --appointments 100000 --seed 7
+    python generate_data.py --appointments 1000000 --out bench_data.sql
+
+Replaces all existing rows (like sample_data.sql) with a dataset of roughly
+--appointments appointments (1k .. 10M) and matching customers, vehicles,
+employees, service / add-on line items, payments (some refunded) and reviews:
+  • repeat customers, most with one vehicle and some with two or three
+  • seasonal bookings (spring/summer and Saturday peaks) over --years of history
+    plus --future-days of scheduled work
+  • phone numbers are 10 digits (validate_phone_* triggers), plates and VINs are
+    unique, and a vehicle never has two appointments on one day, so
+    prevent_overbooking never fires
+Rows are written with multi-row INSERTs in --batch-size chunks, parents before
+children. The same --seed and --end-date always produce the same data.
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+import mysql.connector
+
+# ---------- Reference data ----------
+SERVICES = [
+    # (name, description, base price, minutes, category)
+    ("Full Detail", "Complete interior and exterior cleaning", 150.00, 180, "full detail"),
+    ("Interior Detail", "Thorough vacuum and shampoo of interior", 85.00, 90, "interior detail"),
+    ("Exterior Wash", "Exterior wash and dry with wax", 60.00, 45, "exterior wash"),
+    ("Monthly Maintenance", "Basic touch-up detail", 50.00, 30, "monthly maintenance detail"),
+    ("Deluxe Wax", "Advanced wax treatment", 90.00, 60, "wax full detail"),
+    ("Quick Wash", "Basic quick exterior wash", 35.00, 20, "exterior wash"),
+    ("Engine Bay Detail", "Clean and detail engine compartment", 40.00, 30, "exterior wash"),
+    ("Pet Hair Removal", "Removes excessive pet hair", 35.00, 30, "interior detail"),
+    ("Odor Treatment", "Neutralizes interior odors", 25.00, 20, "interior detail"),
+    ("Clay Bar Treatment", "Removes surface contaminants", 70.00, 60, "wax full detail"),
+    ("Ceramic Coating", "Durable paint protection", 300.00, 240, "full detail"),
+    ("Window Cleaning", "Streak-free windows", 20.00, 15, "interior detail"),
+    ("Tire Shine", "Restores gloss to tires", 10.00, 10, "exterior wash"),
+    ("Seat Shampoo", "Deep clean fabric seats", 45.00, 40, "interior detail"),
+    ("Dashboard Detail", "Cleans and protects dashboard", 20.00, 15, "interior detail"),
+]
+SERVICE_WEIGHTS = [14, 12, 20, 10, 6, 16, 3, 3, 3, 3, 1, 4, 5, 3, 3]
+
+ADDONS = [
+    # (name, description, price, minutes)
+    ("Tire Shine", "Restore tire gloss", 10.00, 10),
+    ("Window Cleaning", "Streak-free windows", 20.00, 15),
+    ("Seat Shampoo", "Deep clean fabric seats", 45.00, 40),
+    ("Headlight Restoration", "Clear oxidized headlights", 35.00, 30),
+    ("Air Freshener", "Long-lasting scent", 5.00, 5),
+    ("Trim Restore", "Revive faded plastic trim", 25.00, 20),
+]
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+               "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+               "Thomas", "Sarah", "Charles", "Karen", "Chris", "Nancy", "Daniel", "Lisa", "Matthew",
+               "Betty", "Anthony", "Sandra", "Mark", "Ashley", "Steven", "Emily", "Kevin", "Megan"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+              "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor",
+              "Moore", "Jackson", "Martin", "Lee", "Thompson", "White", "Harris", "Clark", "Lewis",
+              "Walker", "Young", "Allen", "King", "Wright", "Scott", "Hill", "Green", "Adams"]
+CITIES = [("Springfield", "IL", "627"), ("Peoria", "IL", "616"), ("Chicago", "IL", "606"),
+          ("Naperville", "IL", "605"), ("Decatur", "IL", "625"), ("Champaign", "IL", "618"),
+          ("Rockford", "IL", "611"), ("Aurora", "IL", "605"), ("Joliet", "IL", "604"),
+          ("Evanston", "IL", "602")]
+STREETS = ["Elm St", "Oak St", "Maple Rd", "Birch Blvd", "Cedar Ave", "Walnut St", "Ash Ln",
+           "Cherry Dr", "Poplar Ct", "Fir Cir", "Beech Ave", "Spruce St"]
+REFERRALS = ["Google", "Yelp", "Friend", "Drive-by", "Facebook", "Instagram", "Referral", "Flyer", None]
+VEHICLES = [
+    # (make, model, type)
+    ("Toyota", "Camry", "sedan"), ("Honda", "Civic", "sedan"), ("Ford", "F-150", "truck"),
+    ("Chevrolet", "Malibu", "sedan"), ("Nissan", "Altima", "sedan"), ("Jeep", "Wrangler", "SUV"),
+    ("Subaru", "Outback", "SUV"), ("BMW", "X5", "SUV"), ("Chevy", "Silverado", "truck"),
+    ("Tesla", "Model 3", "sedan"), ("Kia", "Sorento", "SUV"), ("Mazda", "CX-5", "SUV"),
+    ("Ford", "Escape", "SUV"), ("Ram", "1500", "truck"), ("Hyundai", "Elantra", "sedan"),
+]
+COLORS = ["Black", "White", "Silver", "Gray", "Red", "Blue", "Green"]
+PAYMENT_METHODS = ["Credit Card", "Debit Card", "Cash", "Venmo"]
+PAYMENT_METHOD_WEIGHTS = [55, 20, 15, 10]
+REVIEW_RATINGS = ["5", "4", "3", "2", "1"]
+REVIEW_WEIGHTS = [45, 30, 13, 7, 5]
+REVIEW_COMMENTS = {"5": "Looks brand new!", "4": "Great job overall", "3": "Average experience",
+                   "2": "Missed a few spots", "1": "Not happy with the result"}
+
+# Booking seasonality: Jan..Dec and Mon..Sun multipliers
+MONTH_WEIGHTS = [0.6, 0.6, 0.9, 1.2, 1.4, 1.5, 1.5, 1.4, 1.1, 0.9, 0.7, 0.6]
+WEEKDAY_WEIGHTS = [1.0, 1.0, 1.0, 1.1, 1.3, 1.6, 0.3]
+
+OPEN_MINUTE, CLOSE_MINUTE, SLOT_MINUTES = 8 * 60, 19 * 60, 30
+
+# Parent tables first, so a flush never inserts a child before its parent
+TABLE_COLUMNS = {
+    "Employees": ("EmployeeID", "FirstName", "LastName", "Email", "Phone", "HireDate", "PositionType", "Active"),
+    "Services": ("ServiceID", "ServiceName", "Descriptions", "BasePrice", "EstimatedTime", "Category", "Active"),
+    "ServiceAddOns": ("AddOnID", "AddOnName", "Description", "Price", "EstimatedAdditionalTime", "Active"),
+    "Customers": ("CustomerID", "FirstName", "LastName", "Email", "Phone", "Address", "City", "State",
+                  "ZipCode", "JoinDate", "ReferralSource"),
+    "Vehicles": ("VehicleID", "CustomerID", "Make", "Model", "Year", "Color", "LicensePlate", "VIN",
+                 "VehicleType", "SpecialNotes"),
+    "Appointments": ("AppointmentID", "CustomerID", "VehicleID", "EmployeeID", "AppointmentDate",
+                     "StartTime", "EndTime", "Status"),
+    "AppointmentServices": ("AppointmentID", "ServiceID", "ActualPrice", "Notes"),
+    "AppointmentAddOns": ("AppointmentID", "AddOnID", "ActualPrice"),
+    "Payments": ("AppointmentID", "Amount", "PaymentDate", "PaymentMethod", "TransactionID", "Status"),
+    "Reviews": ("AppointmentID", "Rating", "Comments", "DateSubmitted"),
+}
+
+CLEAR_TABLES = ["AppointmentAddOns", "AppointmentServices", "Reviews", "Payments", "Appointments",
+                "Vehicles", "ServiceAddOns", "Services", "Employees", "Customers", "DailyRevenue"]
+
+
+# ---------- Unique identifiers ----------
+PLATE_ALPHABET = "0123456789ABCDEFGHJKLMNPRSTUVWXYZ"  # no I, O or Q
+VIN_ALPHABET = "0123456789ABCDEFGHJKLMNPRSTUVWXYZ"
+
+
+def _scramble(n, alphabet, length, multiplier):
+    """Bijective, random-looking code for n < len(alphabet)**length (multiplier is coprime to it)."""
+    space = len(alphabet) ** length
+    value = (n * multiplier) % space
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, len(alphabet))
+        chars.append(alphabet[digit])
+    return "".join(reversed(chars))
+
+
+def license_plate(vehicle_id):
+    return _scramble(vehicle_id, PLATE_ALPHABET, 7, 1000003)
+
+
+def vin(vehicle_id):
+    return "1" + _scramble(vehicle_id, VIN_ALPHABET, 16, 2147483647)
+
+
+def phone(customer_id):
+    # 10 digits, no symbols: passes validate_phone_insert; unique below 10M customers
+    return f"555{customer_id % 10_000_000:07d}"
+
+
+# ---------- Generator ----------
+class DataGenerator:
+    """
+    Yields (table, row) tuples for a dataset of about `appointments` appointments.
+    Rows carry explicit primary keys where children refer to them.
+
+    Args:
+        appointments: target appointment count
+        seed: random seed (same seed + end_date = same data)
+        end_date: last bookable day; defaults to today + future_days
+        years: years of booking history before today
+        future_days: days of scheduled (future) appointments after today
+    """
+    def __init__(self, appointments, seed=42, end_date=None, years=3, future_days=30):
+        self.target = appointments
+        self.rng = random.Random(seed)
+        self.today = (end_date - timedelta(days=future_days)) if end_date else date.today()
+        self.end = self.today + timedelta(days=future_days)
+        self.start = self.today - timedelta(days=int(365 * years))
+        self.employees = max(2, min(50, appointments // 20000))
+
+        self.days = [self.start + timedelta(days=i) for i in range((self.end - self.start).days + 1)]
+        weights = [MONTH_WEIGHTS[d.month - 1] * WEEKDAY_WEIGHTS[d.weekday()] for d in self.days]
+        self.day_cum = list(accumulate(weights))
+        self.service_cum = list(accumulate(SERVICE_WEIGHTS))
+
+        self.customer_id = self.vehicle_id = self.appointment_id = 0
+
+    # ---------- Sampling helpers ----------
+    def _day(self):
+        return self.days[bisect_left(self.day_cum, self.rng.random() * self.day_cum[-1])]
+
+    def _distinct_days(self, k):
+        days = set()
+        while len(days) < min(k, len(self.days)):
+            days.add(self._day())
+        return sorted(days)
+
+    def _services(self):
+        count = self.rng.choices([1, 2, 3], weights=[60, 30, 10])[0]
+        picked = set()
+        while len(picked) < count:
+            picked.add(bisect_left(self.service_cum, self.rng.random() * self.service_cum[-1]))
+        return sorted(picked)
+
+    def _appointments_per_vehicle(self):
+        # Most vehicles come back: 1 + geometric, mean ~3
+        return 1 + int(self.rng.expovariate(1 / 2.0))
+
+    # ---------- Rows ----------
+    def rows(self):
+        yield from self._reference_rows()
+        while self.appointment_id < self.target:
+            yield from self._customer_rows()
+
+    def _reference_rows(self):
+        for i in range(1, self.employees + 1):
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            hired = self.start - timedelta(days=self.rng.randint(0, 700))
+            yield "Employees", (i, first, last, f"staff{i}@nateauto.local", phone(9_000_000 + i), hired,
+                                "Owner" if i == 1 else "Detail Technician", True)
+        for i, (name, desc, price, minutes, category) in enumerate(SERVICES, 1):
+            yield "Services", (i, name, desc, price, minutes, category, True)
+        for i, (name, desc, price, minutes) in enumerate(ADDONS, 1):
+            yield "ServiceAddOns", (i, name, desc, price, minutes, True)
+
+    def _customer_rows(self):
+        rng = self.rng
+        self.customer_id += 1
+        cid = self.customer_id
+
+        vehicles = []
+        for _ in range(rng.choices([1, 2, 3], weights=[70, 22, 8])[0]):
+            self.vehicle_id += 1
+            make, model, vtype = rng.choice(VEHICLES)
+            vehicles.append((self.vehicle_id, cid, make, model, rng.randint(2008, self.today.year + 1),
+                             rng.choice(COLORS), license_plate(self.vehicle_id), vin(self.vehicle_id),
+                             vtype, None))
+
+        # One appointment per vehicle per day at most, so prevent_overbooking never fires
+        bookings = []
+        if rng.random() >= 0.08:  # a few customers never book
+            for vehicle in vehicles:
+                for day in self._distinct_days(self._appointments_per_vehicle()):
+                    bookings.append((day, vehicle[0]))
+        bookings.sort()
+
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state, zip_prefix = rng.choice(CITIES)
+        first_visit = bookings[0][0] if bookings else self.today
+        joined = max(self.start - timedelta(days=365), first_visit - timedelta(days=rng.randint(0, 60)))
+        yield "Customers", (cid, first, last, f"{first}.{last}.{cid}@example.com".lower(), phone(cid),
+                            f"{rng.randint(1, 9999)} {rng.choice(STREETS)}", city, state,
+                            f"{zip_prefix}{rng.randint(0, 99):02d}", joined, rng.choice(REFERRALS))
+        for vehicle in vehicles:
+            yield "Vehicles", vehicle
+
+        for day, vehicle_id in bookings:
+            if self.appointment_id >= self.target:
+                break
+            yield from self._appointment_rows(cid, vehicle_id, day)
+
+    def _appointment_rows(self, customer_id, vehicle_id, day):
+        rng = self.rng
+        self.appointment_id += 1
+        aid = self.appointment_id
+
+        services = self._services()
+        addons = rng.sample(range(1, len(ADDONS) + 1), rng.choices([0, 1, 2], weights=[60, 30, 10])[0])
+        minutes = sum(SERVICES[s][3] for s in services) + sum(ADDONS[a - 1][3] for a in addons)
+        duration = min(300, max(SLOT_MINUTES, math.ceil(minutes / SLOT_MINUTES) * SLOT_MINUTES))
+        latest = (CLOSE_MINUTE - duration - OPEN_MINUTE) // SLOT_MINUTES
+        start = OPEN_MINUTE + rng.randint(0, max(latest, 0)) * SLOT_MINUTES
+        end = start + duration
+
+        if day > self.today:
+            status = "scheduled"
+        elif day == self.today:
+            status = rng.choices(["scheduled", "in progress", "completed"], weights=[40, 30, 30])[0]
+        else:
+            status = rng.choices(["completed", "canceled"], weights=[93, 7])[0]
+
+        yield "Appointments", (aid, customer_id, vehicle_id, rng.randint(1, self.employees), day,
+                               f"{start // 60:02d}:{start % 60:02d}:00", f"{end // 60:02d}:{end % 60:02d}:00",
+                               status)
+
+        total = 0.0
+        for s in services:
+            price = round(SERVICES[s][2] * rng.uniform(0.9, 1.15), 2)
+            total += price
+            yield "AppointmentServices", (aid, s + 1, price, None)
+        for a in addons:
+            price = ADDONS[a - 1][2]
+            total += price
+            yield "AppointmentAddOns", (aid, a, price)
+
+        if status == "completed":
+            paid = min(day + timedelta(days=rng.choices([0, 1, 2, 3], weights=[80, 10, 6, 4])[0]), self.today)
+            pay_status = rng.choices(["completed", "refunded", "pending"], weights=[95, 3, 2])[0]
+            yield "Payments", (aid, round(total, 2), paid,
+                               rng.choices(PAYMENT_METHODS, weights=PAYMENT_METHOD_WEIGHTS)[0],
+                               f"TXN{aid:09d}", pay_status)
+            if rng.random() < 0.25:
+                rating = rng.choices(REVIEW_RATINGS, weights=REVIEW_WEIGHTS)[0]
+                yield "Reviews", (aid, rating, REVIEW_COMMENTS[rating],
+                                  min(day + timedelta(days=rng.randint(0, 7)), self.today))
+
+
+# ---------- Writers ----------
+class BatchWriter(ABC):
+    """Buffers rows per table and writes them as multi-row INSERTs, parents before children."""
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.buffers = {table: [] for table in TABLE_COLUMNS}
+        self.buffered = 0
+        self.counts = {table: 0 for table in TABLE_COLUMNS}
+
+    def add(self, table, row):
+        self.buffers[table].append(row)
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for table, rows in self.buffers.items():
+            if rows:
+                self.write(table, TABLE_COLUMNS[table], rows)
+                self.counts[table] += len(rows)
+                rows.clear()
+        self.buffered = 0
+
+    @abstractmethod
+    def write(self, table, columns, rows):
+        """Write one buffered batch of `rows` for `table`."""
+
+    def close(self):
+        self.flush()
+
+
+class DatabaseWriter(BatchWriter):
+    """Loads straight into MySQL; each flush is one transaction."""
+    def __init__(self, conn, batch_size=1000):
+        super().__init__(batch_size)
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in CLEAR_TABLES:
+            self.cur.execute(f"TRUNCATE TABLE {table}")
+        self.cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+    def write(self, table, columns, rows):
+        placeholders = ", ".join(["%s"] * len(columns))
+        # executemany folds an INSERT .. VALUES into one multi-row statement
+        self.cur.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    def flush(self):
+        super().flush()
+        self.conn.commit()
+
+    def close(self):
+        super().close()
+        self.cur.close()
+
+
+def sql_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (date, datetime)):
+        return f"'{value.isoformat()}'"
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+class SqlFileWriter(BatchWriter):
+    """Writes a script for `SOURCE file.sql;` (or `mysql < file.sql`)."""
+    def __init__(self, path, database, batch_size=1000):
+        super().__init__(batch_size)
+        self.f = open(path, "w", encoding="utf-8")
+        self.f.write(f"-- Generated by generate_data.py\nUSE {database};\n\nSET FOREIGN_KEY_CHECKS = 0;\n")
+        for table in CLEAR_TABLES:
+            self.f.write(f"TRUNCATE TABLE {table};\n")
+        self.f.write("SET FOREIGN_KEY_CHECKS = 1;\n\n")
+
+    def write(self, table, columns, rows):
+        values = ",\n".join("(" + ",".join(sql_literal(v) for v in row) + ")" for row in rows)
+        self.f.write(f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n{values};\n")
+
+    def close(self):
+        super().close()
+        self.f.close()
+
+
+# ---------- Main ----------
+def generate(writer, appointments, seed=42, end_date=None, years=3, future_days=30, progress=None):
+    """Stream a dataset into `writer`; progress(appointments_done) is called every 10k appointments."""
+    generator = DataGenerator(appointments, seed=seed, end_date=end_date, years=years, future_days=future_days)
+    reported = 0
+    for table, row in generator.rows():
+        writer.add(table, row)
+        if progress and generator.appointment_id - reported >= 10000:
+            reported = generator.appointment_id
+            progress(reported)
+    writer.close()
+    return writer.counts
+
+
+def main(argv=None):
+    from nathan_auto_ui import DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic Nathan Auto Detail dataset.")
+    parser.add_argument("--appointments", type=int, default=10000, help="about 1000 .. 10000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=lambda s: datetime.strptime(s, "%Y-%m-%d").date(),
+                        help="last bookable day (YYYY-MM-DD); fix it for byte-identical output")
+    parser.add_argument("--years", type=float, default=3, help="years of history")
+    parser.add_argument("--future-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per multi-row INSERT")
+    parser.add_argument("--database", default=DB_CONFIG["database"])
+    parser.add_argument("--out", help="write a .sql script here instead of loading the database")
+    args = parser.parse_args(argv)
+
+    if args.out:
+        writer = SqlFileWriter(args.out, args.database, args.batch_size)
+        conn = None
+    else:
+        conn = mysql.connector.connect(**dict(DB_CONFIG, database=args.database))
+        writer = DatabaseWriter(conn, args.batch_size)
+
+    started = time.perf_counter()
+    def progress(done):
+        rate = done / max(time.perf_counter() - started, 1e-6)
+        print(f"\r{done:,} / {args.appointments:,} appointments ({rate:,.0f}/s)", end="", flush=True)
+
+    try:
+        counts = generate(writer, args.appointments, seed=args.seed, end_date=args.end_date,
+                          years=args.years, future_days=args.future_days, progress=progress)
+    finally:
+        if conn is not None:
+            conn.close()
+    print(f"\nDone in {time.perf_counter() - started:.1f}s")
+    for table, count in counts.items():
+        print(f"  {table:20} {count:>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,37 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 import mysql.connector
-from PIL import Image, ImageTk
-import customtkinter as ctk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import re
+from datetime import datetime
 import threading
 import time
-from dashboard import DashboardFrame
+from dashboard_config import LOADER_TABLES, LOADER_TTLS, create_result_cache
+from db_pool import ConnectionPool
+from task_runner import BackgroundRunner
+from data_grid import DataGrid, GridSpec
+from row_cache import RowCache
+from page_manager import PageManager
+from unit_of_work import FlushResult, UnitOfWork
+from theme import THEMES, TREEVIEW_STYLE, Theme
+from availability import AvailabilityEngine
+import bulk_import
+import data_export
+from report_stream import REPORTS, ProgressiveTreeFiller, stream_procedure
+import search
 
 # Global variables
 current_page = {"name": None}
 current_page_loader = None
-TREEVIEW_STYLE = "Dark.Treeview"
 page_refreshers = {}
 current_dashboard = None  # Track the current dashboard instance
+runner = None  # BackgroundRunner for DB work (created with the main window)
+pages = None  # PageManager for the content area (created with the main window)
+pending_label = None  # sidebar count of unsaved form edits (created with the main window)
+theme = Theme("dark")  # colours come from its option / style tables (see theme.py)
 
-# --- Custom LabelFrame that gets colors automatically ---
+# --- LabelFrame (colours come from the option database) ---
 def create_label_frame(parent, text):
     lf = tk.LabelFrame(parent, text=text)
-    set_theme(lf)
     return lf, lf
 
 # --- Database config ---
@@ -30,9 +42,367 @@ DB_CONFIG = {
     'database': 'nathan_auto_detail'
 }
 
+# --- Connection pool config ---
+POOL_CONFIG = {
+    'size': 5,                     # max open connections
+    'prewarm': 2,                  # connections opened at startup
+    'health_check_interval': 30,   # ping connections idle longer than this (seconds)
+    'timeout': 10                  # wait this long for a free connection (seconds)
+}
+
+# --- Page cache config ---
+PAGE_CACHE_CONFIG = {
+    'max_pages': 5,       # built pages kept alive; the least recently shown beyond this are rebuilt on return
+    'max_rows': 20000,    # Treeview rows hidden pages may hold before the oldest are dropped
+    'max_age': 300        # reload a hidden page's rows when it is shown after this long (seconds)
+}
+
+# --- Write batching config ---
+WRITE_BATCH_CONFIG = {
+    'flush_delay_ms': 3000,   # save queued form edits this long after the last one
+    'max_pending': 25,        # ...or straight away once this many are queued
+    'retry_max_ms': 60000     # a failed flush is retried after a growing delay, up to this
+}
+
+db_pool = ConnectionPool(
+    DB_CONFIG,
+    size=POOL_CONFIG['size'],
+    health_check_interval=POOL_CONFIG['health_check_interval'],
+    timeout=POOL_CONFIG['timeout']
+)
+
 def get_connection():
+    """Check out a pooled connection; conn.close() returns it to the pool."""
+    return db_pool.get_connection()
+
+def open_dedicated_connection():
+    """
+    A new connection outside the pool, for streamed reports and exports: when
+    they are cancelled the connection is dropped instead of draining its rows.
+    """
     return mysql.connector.connect(**DB_CONFIG)
 
+# Rows of every grid page, reused when switching back to a page whose tables are unchanged
+row_cache = RowCache(get_connection, max_bytes=32 * 1024 * 1024)
+
+# Dashboard query results; outlives each DashboardFrame and is invalidated after every write
+dashboard_cache = create_result_cache()
+
+# Interval index of booked appointments for the slot finder; dropped whenever Appointments changes
+availability = AvailabilityEngine(get_connection)
+
+# Tables whose rows a DELETE on the key table also removes (ON DELETE CASCADE)
+DELETE_CASCADES = {
+    "Customers": ("Vehicles", "Appointments", "AppointmentServices", "Payments"),
+    "Vehicles": ("Appointments", "AppointmentServices", "Payments"),
+    "Appointments": ("AppointmentServices", "Payments"),
+}
+
+def written_tables(query):
+    """Tables an INSERT/UPDATE/DELETE statement changes, including delete cascades."""
+    m = re.match(r"\s*(INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)", query, re.IGNORECASE)
+    if not m:
+        return ()
+    table = m.group(2)
+    if m.group(1).upper().startswith("DELETE"):
+        return (table,) + DELETE_CASCADES.get(table, ())
+    return (table,)
+
+def prewarm_pool():
+    """Open the startup connections in the background so the login window stays responsive."""
+    threading.Thread(target=db_pool.prewarm, args=(POOL_CONFIG['prewarm'],), daemon=True).start()
+
+def run_in_background(fetch, on_done, owner, error_title="Database Error"):
+    """
+    Run fetch() off the Tk thread and pass its result to on_done() on the Tk thread.
+    Each page's work shares one channel ("page.<name>"), so a newer request on that page drops
+    the stale result; pages stay alive while hidden, so work from another page is left alone.
+    """
+    return runner.submit(fetch, channel=f"page.{current_page['name']}", owner=owner, on_done=on_done,
+                         on_error=lambda err: messagebox.showerror(error_title, str(err)))
+
+# Tables behind the slot finder's services / add-ons / employees
+CATALOG_TABLES = frozenset(("Services", "ServiceAddOns", "Employees"))
+
+def invalidate_tables(*tables):
+    """After a write: drop dashboard results and slot indexes built from `tables`, and mark hidden pages stale."""
+    dashboard_cache.invalidate(*tables)
+    if "Appointments" in tables:
+        availability.invalidate(catalog=not CATALOG_TABLES.isdisjoint(tables))
+    elif not CATALOG_TABLES.isdisjoint(tables):
+        availability.invalidate()
+    if pages is not None:
+        pages.invalidate(*tables)
+
+# Form edits, saved together in one transaction per flush (see unit_of_work.py)
+pending_writes = UnitOfWork(get_connection)
+flush_state = {"after": None, "running": False, "retry_ms": 0, "closing": False}
+
+def queue_write(query, params, label, on_done=None, on_error=None):
+    """
+    Queue one INSERT/UPDATE/DELETE from a form; the next flush saves it.
+    on_done(row id for inserts, else True) runs once it is committed, on_error(message) if it is rejected.
+    """
+    pending_writes.add(query, params, label, written_tables(query), on_done, on_error)
+    show_pending()
+    if pending_writes.pending >= WRITE_BATCH_CONFIG['max_pending']:
+        flush_writes()
+    else:
+        schedule_flush()
+
+def schedule_flush(delay_ms=None):
+    """(Re)start the background flush timer; each new edit pushes it back."""
+    if flush_state["after"] is not None:
+        root.after_cancel(flush_state["after"])
+    flush_state["after"] = root.after(delay_ms or WRITE_BATCH_CONFIG['flush_delay_ms'], flush_writes)
+
+def flush_writes():
+    """Save the queued edits on a worker thread (Save Now, the flush timer or a full queue)."""
+    if flush_state["after"] is not None:
+        root.after_cancel(flush_state["after"])
+        flush_state["after"] = None
+    if flush_state["running"] or not pending_writes.pending:
+        return  # a running flush reschedules itself for edits queued meanwhile
+
+    def done(result):
+        flush_state["running"] = False
+        writes_flushed(result)
+        if flush_state["closing"]:
+            close_main_window(result)
+        elif pending_writes.pending and result.error is None:
+            schedule_flush()
+
+    def failed(err):
+        flush_state["running"] = False
+        show_pending()
+        messagebox.showerror("Save Error", str(err))
+        if flush_state["closing"]:
+            close_main_window(FlushResult(error=str(err)))
+
+    flush_state["running"] = True
+    # No channel: a flush commits, so its result must never be dropped for a newer one
+    runner.submit(pending_writes.flush, on_done=done, on_error=failed)
+
+def writes_flushed(result):
+    """Refresh what the committed writes changed and report the rejected ones, row by row."""
+    show_pending()
+    if result.error is not None:
+        # Retry with a doubling delay; only the first failure in a row is reported
+        first = flush_state["retry_ms"] == 0
+        flush_state["retry_ms"] = min(max(2 * flush_state["retry_ms"], WRITE_BATCH_CONFIG['flush_delay_ms']),
+                                      WRITE_BATCH_CONFIG['retry_max_ms'])
+        schedule_flush(flush_state["retry_ms"])
+        if first:
+            messagebox.showerror("Save Error", f"Nothing was saved; {pending_writes.pending} edit(s) are "
+                                               f"still queued. Saving is retried in the background, "
+                                               f"or click Save Now.\n\n{result.error}")
+        return
+    flush_state["retry_ms"] = 0
+    if result.tables:
+        invalidate_tables(*result.tables)
+    pending_writes.deliver(result)
+    if result.failed:
+        lines = [f"• {write.label}: {message}" for write, message in result.failed]
+        messagebox.showerror("Some Edits Were Rejected",
+                             f"Saved {len(result.saved)} edit(s); {len(result.failed)} rejected:\n\n"
+                             + "\n".join(lines))
+
+def close_main_window(result=None):
+    """
+    WM_DELETE_WINDOW for the main window: save what is still queued on the worker
+    (waiting for a flush that is already running), then close. Called again with
+    each flush's result while closing; stays open if something was not saved.
+    """
+    if flush_state["after"] is not None:
+        root.after_cancel(flush_state["after"])
+        flush_state["after"] = None
+    saved_cleanly = result is None or (result.error is None and not result.failed)
+    if saved_cleanly and (flush_state["running"] or pending_writes.pending):
+        flush_state["closing"] = True
+        pending_label.configure(text="Saving…")
+        flush_writes()  # a running flush comes back here when it is done
+        return
+    flush_state["closing"] = False
+    if not saved_cleanly and not messagebox.askyesno("Unsaved Edits", "Some edits were not saved. Close anyway?"):
+        if pending_writes.pending:
+            schedule_flush(flush_state["retry_ms"])
+        return
+    root.destroy()
+
+def show_pending():
+    if pending_label is None:
+        return
+    count = pending_writes.pending
+    pending_label.configure(text=f"{count} unsaved edit{'s' if count != 1 else ''}" if count else "")
+
+def refill(entries, values):
+    """on_error for a queued form: put the rejected values back, unless the form is in use again."""
+    def restore(_message):
+        try:
+            if any(e.get() for e in entries):
+                return
+            for e, value in zip(entries, values):
+                e.insert(0, value)
+        except tk.TclError:
+            pass  # page was closed
+    return restore
+
+# --- Grid definitions (first column is the primary key; sortable columns are indexed) ---
+CUSTOMER_GRID = GridSpec(
+    columns=[("ID", "c.CustomerID", True), ("First", "c.FirstName", True), ("Last", "c.LastName", True),
+             ("Email", "c.Email", True), ("Phone", "c.Phone", True)],
+    from_sql="Customers c",
+    tables=(("Customers", "CustomerID"),))
+
+VEHICLE_GRID = GridSpec(
+    columns=[("ID", "v.VehicleID", True), ("First", "c.FirstName", False), ("Last", "c.LastName", False),
+             ("Make", "v.Make", True), ("Model", "v.Model", True), ("Plate", "v.LicensePlate", True)],
+    from_sql="Vehicles v JOIN Customers c ON v.CustomerID = c.CustomerID",
+    tables=(("Vehicles", "VehicleID"), ("Customers", "CustomerID")))
+
+APPOINTMENT_GRID = GridSpec(
+    columns=[("ID", "a.AppointmentID", True), ("Customer", "c.FirstName", False), ("Vehicle", "v.Make", False),
+             ("Date", "a.AppointmentDate", True), ("Start", "a.StartTime", False), ("End", "a.EndTime", False),
+             # Not sortable: an ENUM sorts by its index, but keyset paging compares its values as strings
+             ("Status", "a.Status", False)],
+    from_sql="Appointments a JOIN Customers c ON a.CustomerID = c.CustomerID "
+             "JOIN Vehicles v ON a.VehicleID = v.VehicleID",
+    tables=(("Appointments", "AppointmentID"), ("Customers", "CustomerID"), ("Vehicles", "VehicleID")))
+
+PAYMENT_GRID = GridSpec(
+    columns=[("ID", "PaymentID", True), ("Appointment ID", "AppointmentID", True), ("Date", "PaymentDate", True),
+             ("Amount", "Amount", False), ("Method", "PaymentMethod", False)],
+    from_sql="Payments",
+    tables=(("Payments", "PaymentID"),))
+
+def create_grid(parent, spec):
+    """Keyset-paginated, server-sorted grid packed into its own frame."""
+    tree_frame = tk.Frame(parent); tree_frame.pack(fill='both', expand=True)
+    grid = DataGrid(tree_frame, spec, get_connection, runner, style=TREEVIEW_STYLE, cache=row_cache)
+    grid.pack(fill='both', expand=True, padx=10, pady=10)
+    return grid
+
+SEARCH_DEBOUNCE_MS = 300
+
+def create_search_bar(parent, on_search):
+    """
+    Search entry that calls on_search(term) once typing pauses, instead of on every key.
+    An empty term means "no filter".
+    """
+    bar = tk.Frame(parent); bar.pack(fill='x', padx=10)
+    tk.Label(bar, text="Search").pack(side='left')
+    entry = tk.Entry(bar, width=40); entry.pack(side='left', padx=5)
+    pending = {"id": None, "term": ""}
+
+    def fire():
+        pending["id"] = None
+        term = entry.get().strip()
+        if term != pending["term"]:
+            pending["term"] = term
+            on_search(term)
+
+    def on_key(_event=None):
+        if pending["id"] is not None:
+            entry.after_cancel(pending["id"])
+        pending["id"] = entry.after(SEARCH_DEBOUNCE_MS, fire)
+
+    def clear():
+        entry.delete(0, tk.END)
+        on_key()
+
+    entry.bind("<KeyRelease>", on_key)
+    entry.bind("<Return>", lambda e: fire())
+    tk.Button(bar, text="Clear", command=clear).pack(side='left')
+    return entry
+
+def search_grid(grid, make_source):
+    """on_search callback that restricts `grid` to make_source(term), or shows everything for ''."""
+    def run(term):
+        if term:
+            grid.set_source(*make_source(term))
+        else:
+            grid.set_source(None)
+    return run
+
+def create_export_panel(parent, kinds):
+    """
+    Export controls (data_export.py): kind, date range, status filter and a Save As dialog.
+    The export streams on a worker with its own connection, a progress bar and a Cancel button.
+    """
+    panel_container, panel = create_label_frame(parent, "Export")
+    panel_container.pack(fill='x', padx=10, pady=5)
+
+    kind = tk.StringVar(value=kinds[0])
+    if len(kinds) > 1:
+        tk.OptionMenu(panel, kind, *kinds).pack(side='left', padx=5)
+    tk.Label(panel, text="From").pack(side='left')
+    from_e = tk.Entry(panel, width=11); from_e.pack(side='left', padx=5)
+    tk.Label(panel, text="To").pack(side='left')
+    to_e = tk.Entry(panel, width=11); to_e.pack(side='left', padx=5)
+    tk.Label(panel, text="Status").pack(side='left')
+    status_e = tk.Entry(panel, width=18); status_e.pack(side='left', padx=5)
+    export_button = tk.Button(panel, text="Export...", command=lambda: start())
+    export_button.pack(side='left', padx=5)
+    cancel_button = tk.Button(panel, text="Cancel", state='disabled', command=lambda: cancel())
+    cancel_button.pack(side='left', padx=5)
+    bar = ttk.Progressbar(panel, length=160, maximum=1.0); bar.pack(side='left', padx=5)
+    status = tk.Label(panel, text=""); status.pack(side='left', padx=5)
+    current = {"task": None}
+
+    def idle():
+        export_button.config(state='normal'); cancel_button.config(state='disabled')
+
+    def start():
+        try:
+            dates = [datetime.strptime(e.get().strip(), "%Y-%m-%d").date() if e.get().strip() else None
+                     for e in (from_e, to_e)]
+        except ValueError:
+            return messagebox.showerror("Export", "Dates must be YYYY-MM-DD.")
+        statuses = tuple(s.strip() for s in status_e.get().split(",") if s.strip())
+        chosen = kind.get()
+        spec = data_export.EXPORTS[chosen]
+        unknown = [s for s in statuses if s not in spec.statuses]
+        if unknown:
+            allowed = ", ".join(spec.statuses) or "none for this export"
+            return messagebox.showerror("Export", f"Unknown status {', '.join(unknown)} (allowed: {allowed}).")
+        path = filedialog.asksaveasfilename(
+            title="Export to", initialfile=f"{chosen}.csv", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Gzip CSV", "*.csv.gz"), ("Parquet", "*.parquet")])
+        if not path:
+            return
+
+        def show_progress(result):
+            bar["value"] = result.rows / result.total if result.total else 1.0
+            status.config(text=f"{result.rows:,} / {result.total:,} rows")
+
+        def finished(result):
+            idle()
+            show_progress(result)
+            messagebox.showinfo("Export", f"Wrote {result.rows:,} rows to\n{result.path}")
+
+        def failed(err):
+            idle()
+            messagebox.showerror("Export", str(err))
+
+        bar["value"] = 0
+        status.config(text="Exporting...")
+        export_button.config(state='disabled'); cancel_button.config(state='normal')
+        # No channel: the Payments and Reports panels both stay alive and must not cancel each other
+        current["task"] = runner.submit(
+            lambda task: data_export.export(open_dedicated_connection, chosen, path, dates[0], dates[1], statuses,
+                                            progress=task.report, cancelled=lambda: task.cancelled),
+            pass_task=True, owner=bar,
+            on_progress=show_progress, on_done=finished, on_error=failed)
+
+    def cancel():
+        # The worker stops before its next batch and removes the partial file
+        if current["task"] is not None:
+            current["task"].cancel()
+        idle()
+        status.config(text="Export cancelled.")
+
+    return panel
+
 def verify_login(username, password):
     return username == 'user' and password == 'pass'
 
@@ -56,16 +426,22 @@ def safe_destroy_dashboard():
 
 def add_simple_dashboard_content(content_frame):
     """Add simple placeholder content for dashboard."""
-    info_frame = tk.Frame(content_frame, bg="#2a2a2a", relief="ridge", bd=2)
+    info_frame = theme.frame(content_frame, role="panel", relief="ridge", bd=2)
     info_frame.pack(pady=20, padx=20, fill="x")
     
-    tk.Label(info_frame, text="Quick Stats (Placeholder)", 
-             fg="white", bg="#2a2a2a", font=("Arial", 14, "bold")).pack(pady=10)
-    tk.Label(info_frame, text="• Total Customers: Click 'Customers' to view\n• Active Appointments: Click 'Appointments' to view\n• Recent Payments: Click 'Payments' to view", 
-             fg="lightgray", bg="#2a2a2a", font=("Arial", 10), justify="left").pack(pady=10)
+    theme.label(info_frame, role="panel_title", text="Quick Stats (Placeholder)",
+                font=("Arial", 14, "bold")).pack(pady=10)
+    theme.label(info_frame, role="panel_text", text="• Total Customers: Click 'Customers' to view\n• Active Appointments: Click 'Appointments' to view\n• Recent Payments: Click 'Payments' to view", 
+                font=("Arial", 10), justify="left").pack(pady=10)
 
 def clear_frame(frame):
     """Safely clear all widgets from a frame, handling CustomTkinter widgets."""
+    # Drop results of page loads that are still running
+    if runner is not None:
+        runner.cancel_prefix("page.")
+        runner.cancel_prefix("grid.")
+        runner.cancel("report")
+
     # Use the safe dashboard cleanup function
     safe_destroy_dashboard()
     
@@ -88,115 +464,8 @@ def clear_frame(frame):
             print(f"Warning: Could not destroy widget {widget.__class__.__name__}: {e}")
             pass
 
-# --- Apply dark theme to ALL tk widgets ---
-def set_theme(widget):
-    # Dark theme colors
-    bg = "#1e1e1e"
-    fg = "#ffffff"
-    entry_bg = "#2a2a2a"
-    disabled_fg = "#9a9a9a"
-    highlight = "#3a3a3a"
-
-    # Only style plain tkinter widgets directly
-    try:
-        import customtkinter as ctk
-        CTKBase = (ctk.CTkBaseClass,) if hasattr(ctk, "CTkBaseClass") else tuple()
-    except Exception:
-        CTKBase = tuple()
-
-    import tkinter as tk
-    from tkinter import ttk
-
-    # Apply to plain tk widgets
-    if not isinstance(widget, (ttk.Widget,) + CTKBase):
-        if isinstance(widget, (tk.Frame, tk.LabelFrame)):
-            try:
-                widget.configure(bg=bg)
-            except tk.TclError:
-                pass
-        elif isinstance(widget, tk.Label):
-            try:
-                widget.configure(bg=bg, fg=fg)
-            except tk.TclError:
-                pass
-        elif isinstance(widget, (tk.Entry, tk.Text)):
-            try:
-                widget.configure(
-                    bg=entry_bg,
-                    fg=fg,
-                    insertbackground=fg,
-                    selectbackground=highlight,
-                    selectforeground=fg,
-                    disabledforeground=disabled_fg,
-                    highlightbackground=highlight,
-                    highlightcolor=highlight,
-                    relief="flat", borderwidth=1
-                )
-            except tk.TclError:
-                pass
-        elif isinstance(widget, tk.Button):
-            try:
-                widget.configure(
-                    bg=highlight,  # Use a slightly lighter bg for buttons to make them visible
-                    fg=fg, 
-                    activebackground=bg, 
-                    activeforeground=fg,
-                    relief="flat",
-                    borderwidth=1
-                )
-            except tk.TclError:
-                pass
-        elif isinstance(widget, tk.Checkbutton):
-            try:
-                widget.configure(bg=bg, fg=fg, activebackground=bg, activeforeground=fg, selectcolor=bg)
-            except tk.TclError:
-                pass
-        elif isinstance(widget, tk.Radiobutton):
-            try:
-                widget.configure(bg=bg, fg=fg, activebackground=bg, activeforeground=fg, selectcolor=bg)
-            except tk.TclError:
-                pass
-        elif isinstance(widget, tk.Listbox):
-            try:
-                widget.configure(bg=entry_bg, fg=fg, selectbackground=highlight, selectforeground=fg)
-            except tk.TclError:
-                pass
-        elif isinstance(widget, tk.Scale):
-            try:
-                widget.configure(bg=bg, fg=fg, highlightbackground=bg)
-            except tk.TclError:
-                pass
-        elif isinstance(widget, tk.Spinbox):
-            try:
-                widget.configure(bg=entry_bg, fg=fg, disabledforeground=disabled_fg)
-            except tk.TclError:
-                pass
-
-    # Recurse into all children
-    for child in widget.winfo_children():
-        set_theme(child)
-
-# --- Apply dark theme defaults for NEW tk widgets ---
-def apply_defaults_to(root):
-    bg, fg, entry_bg, active_bg = "#1e1e1e", "#ffffff", "#2a2a2a", "#444444"
-
-    root.option_add("*Background", bg)
-    root.option_add("*foreground", fg)
-    root.option_add("*Frame.background", bg)
-    root.option_add("*Label.background", bg)
-    root.option_add("*Label.foreground", fg)
-    root.option_add("*Entry.background", entry_bg)
-    root.option_add("*Entry.foreground", fg)
-    root.option_add("*Entry.insertBackground", fg)
-    root.option_add("*Button.background", active_bg)
-    root.option_add("*Button.foreground", fg)
-    root.option_add("*Button.activeBackground", "#555555")
-    root.option_add("*Button.activeforeground", fg)
-    root.option_add("*Button.relief", "flat")
-
 # ---------- CUSTOMERS ----------
 def load_customers(parent):
-    clear_frame(parent)
     tk.Label(parent, text="Customer Management", font=('Arial', 16)).pack()
 
     input_container = tk.Frame(parent)
@@ -221,18 +490,10 @@ def load_customers(parent):
         fn, ln, em, ph = fn_e.get(), ln_e.get(), em_e.get(), ph_e.get()
         if not all([fn, ln, em, ph]):
             return messagebox.showerror("Error", "All fields required.")
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("""INSERT INTO Customers
+        queue_write("""INSERT INTO Customers
                 (FirstName, LastName, Email, Phone, JoinDate)
-                VALUES (%s,%s,%s,%s,CURDATE())""", (fn, ln, em, ph))
-            conn.commit()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Insert Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
-        load()
+                VALUES (%s,%s,%s,%s,CURDATE())""", (fn, ln, em, ph), f"Add customer {fn} {ln}",
+                    on_done=grid.refresh_row, on_error=refill((fn_e, ln_e, em_e, ph_e), (fn, ln, em, ph)))
         for e in (fn_e, ln_e, em_e, ph_e): e.delete(0, tk.END)
 
     tk.Button(add_frame, text="Add Customer", command=add).grid(row=4, column=0, columnspan=2, pady=10)
@@ -265,58 +526,36 @@ def load_customers(parent):
         if ph_update.get(): fields.append("Phone=%s");     values.append(ph_update.get())
         if not fields: return messagebox.showwarning("No Update", "No fields to update.")
         q = f"UPDATE Customers SET {', '.join(fields)} WHERE CustomerID=%s"; values.append(cid)
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute(q, tuple(values)); conn.commit()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Update Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
-        load()
-        for e in (cid_update, fn_update, ln_update, em_update, ph_update): e.delete(0, tk.END)
+        entries = (cid_update, fn_update, ln_update, em_update, ph_update)
+        queue_write(q, tuple(values), f"Update customer {cid}", on_done=lambda _: grid.refresh_row(cid),
+                    on_error=refill(entries, [e.get() for e in entries]))
+        for e in entries: e.delete(0, tk.END)
 
     tk.Button(update_frame, text="Update Customer", command=update_customer).grid(row=3, column=0, columnspan=4, pady=10)
 
-    tree_frame = tk.Frame(parent); tree_frame.pack(fill='both', expand=True)
-    tree = ttk.Treeview(tree_frame, columns=("ID", "First", "Last", "Email", "Phone"), show='headings')
-    tree.configure(style=TREEVIEW_STYLE)
-    for col in tree["columns"]: tree.heading(col, text=col)
-    tree.pack(fill='both', expand=True, padx=10, pady=10)
+    create_search_bar(parent, lambda term: search_grid(grid, search.customer_search_source)(term))
+    grid = create_grid(parent, CUSTOMER_GRID)
+    tree = grid.tree
 
     def delete_customer():
         sel = tree.selection()
         if not sel: return messagebox.showwarning("Delete", "No row selected.")
         cid = tree.item(sel[0])['values'][0]
         if messagebox.askyesno("Confirm", f"Delete customer ID {cid}?"):
-            try:
-                conn = get_connection(); cur = conn.cursor()
-                cur.execute("DELETE FROM Customers WHERE CustomerID=%s", (cid,))
-                conn.commit()
-            except mysql.connector.Error as err:
-                messagebox.showerror("Delete Error", str(err))
-            finally:
-                try: cur.close(); conn.close()
-                except: pass
-            load()
+            queue_write("DELETE FROM Customers WHERE CustomerID=%s", (cid,), f"Delete customer {cid}",
+                        on_done=lambda _: grid.remove_row(cid))
 
     tk.Button(parent, text="Delete Selected", command=delete_customer).pack(pady=5)
+    tk.Button(parent, text="Refresh", command=lambda: load()).pack(pady=5)
 
     def load():
-        tree.delete(*tree.get_children())
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("SELECT CustomerID, FirstName, LastName, Email, Phone FROM Customers")
-            for row in cur.fetchall(): tree.insert('', 'end', values=row)
-            cur.close(); conn.close()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
+        grid.reload()
 
     load()
+    return load
 
 # ---------- VEHICLES ----------
 def load_vehicles(parent):
-    clear_frame(parent)
     tk.Label(parent, text="Vehicle Management", font=('Arial', 16)).pack()
 
     input_container = tk.Frame(parent); input_container.pack(pady=10, fill='x')
@@ -327,37 +566,17 @@ def load_vehicles(parent):
     update_frame_container, update_frame = create_label_frame(input_container, "Update Vehicle Info")
     update_frame_container.pack(side='left', padx=10, fill='both', expand=True)
 
-    tree_frame = tk.Frame(parent); tree_frame.pack(fill='both', expand=True)
-
     def load():
-        tree.delete(*tree.get_children())
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("""
-                SELECT v.VehicleID, c.FirstName, c.LastName, v.Make, v.Model, v.LicensePlate
-                FROM Vehicles v
-                JOIN Customers c ON v.CustomerID = c.CustomerID
-            """)
-            for row in cur.fetchall(): tree.insert('', 'end', values=row)
-            cur.close(); conn.close()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
+        grid.reload()
 
     def add():
         cid, make, model, plate = cid_e.get(), mk_e.get(), md_e.get(), lp_e.get()
         if not all([cid, make, model, plate]):
             return messagebox.showerror("Error", "All fields required.")
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("""INSERT INTO Vehicles (CustomerID, Make, Model, LicensePlate)
-                           VALUES (%s,%s,%s,%s)""", (cid, make, model, plate))
-            conn.commit()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Insert Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
-        load()
+        queue_write("""INSERT INTO Vehicles (CustomerID, Make, Model, LicensePlate)
+                       VALUES (%s,%s,%s,%s)""", (cid, make, model, plate), f"Add vehicle {plate}",
+                    on_done=grid.refresh_row,
+                    on_error=refill((cid_e, mk_e, md_e, lp_e), (cid, make, model, plate)))
         for e in (cid_e, mk_e, md_e, lp_e): e.delete(0, tk.END)
 
     def delete_vehicle():
@@ -365,16 +584,8 @@ def load_vehicles(parent):
         if not sel: return messagebox.showwarning("Delete", "No row selected.")
         vid = tree.item(sel[0])['values'][0]
         if messagebox.askyesno("Confirm", f"Delete vehicle ID {vid}?"):
-            try:
-                conn = get_connection(); cur = conn.cursor()
-                cur.execute("DELETE FROM Vehicles WHERE VehicleID=%s", (vid,))
-                conn.commit()
-            except mysql.connector.Error as err:
-                messagebox.showerror("Delete Error", str(err))
-            finally:
-                try: cur.close(); conn.close()
-                except: pass
-            load()
+            queue_write("DELETE FROM Vehicles WHERE VehicleID=%s", (vid,), f"Delete vehicle {vid}",
+                        on_done=lambda _: grid.remove_row(vid))
 
     def update_vehicle():
         vid = vid_update.get()
@@ -385,16 +596,10 @@ def load_vehicles(parent):
         if plate_update.get(): fields.append("LicensePlate=%s"); values.append(plate_update.get())
         if not fields: return messagebox.showwarning("No Update", "No fields to update.")
         q = f"UPDATE Vehicles SET {', '.join(fields)} WHERE VehicleID=%s"; values.append(vid)
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute(q, tuple(values)); conn.commit()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Update Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
-        load()
-        for e in (vid_update, make_update, model_update, plate_update): e.delete(0, tk.END)
+        entries = (vid_update, make_update, model_update, plate_update)
+        queue_write(q, tuple(values), f"Update vehicle {vid}", on_done=lambda _: grid.refresh_row(vid),
+                    on_error=refill(entries, [e.get() for e in entries]))
+        for e in entries: e.delete(0, tk.END)
 
     tk.Label(add_frame, text="Customer ID").grid(row=0, column=0)
     cid_e = tk.Entry(add_frame, width=30); cid_e.grid(row=0, column=1)
@@ -424,18 +629,18 @@ def load_vehicles(parent):
 
     tk.Button(update_frame, text="Update Vehicle", command=update_vehicle).grid(row=4, column=0, columnspan=2, pady=10)
 
-    tree = ttk.Treeview(tree_frame, columns=("ID", "First", "Last", "Make", "Model", "Plate"), show='headings')
-    tree.configure(style=TREEVIEW_STYLE)
-    for col in tree["columns"]: tree.heading(col, text=col)
-    tree.pack(fill='both', expand=True, padx=10, pady=10)
+    create_search_bar(parent, lambda term: search_grid(grid, search.vehicle_search_source)(term))
+    grid = create_grid(parent, VEHICLE_GRID)
+    tree = grid.tree
 
     tk.Button(parent, text="Delete Selected", command=delete_vehicle).pack(pady=5)
+    tk.Button(parent, text="Refresh", command=load).pack(pady=5)
 
     load()
+    return load
 
 # ---------- APPOINTMENTS ----------
 def load_appointments(parent):
-    clear_frame(parent)
     tk.Label(parent, text="Appointments Management", font=('Arial', 16)).pack()
 
     container_frame = tk.Frame(parent); container_frame.pack(pady=10, fill='x')
@@ -471,60 +676,113 @@ def load_appointments(parent):
 
     tk.Button(update_frame, text="Update Status", command=lambda: update_status()).grid(row=2, column=0, columnspan=2, pady=10)
 
-    tree_frame = tk.Frame(parent); tree_frame.pack(fill='both', expand=True)
-    tree = ttk.Treeview(tree_frame, columns=("ID", "Customer", "Vehicle", "Date", "Start", "End", "Status"), show='headings')
-    tree.configure(style=TREEVIEW_STYLE)
-    for col in tree["columns"]: tree.heading(col, text=col)
-    tree.pack(fill='both', expand=True, padx=10, pady=10)
+    slot_frame_container, slot_frame = create_label_frame(container_frame, "Find Available Slots")
+    slot_frame_container.pack(side='left', padx=10, fill='both', expand=True)
+
+    tk.Label(slot_frame, text="Vehicle ID").grid(row=0, column=0, padx=5, pady=5)
+    slot_veh_e = tk.Entry(slot_frame, width=12); slot_veh_e.grid(row=0, column=1, padx=5, pady=5, sticky='w')
+
+    tk.Label(slot_frame, text="From (YYYY-MM-DD)").grid(row=0, column=2, padx=5, pady=5)
+    slot_from_e = tk.Entry(slot_frame, width=12); slot_from_e.grid(row=0, column=3, padx=5, pady=5, sticky='w')
+
+    tk.Label(slot_frame, text="Services").grid(row=1, column=0, padx=5, pady=5)
+    services_lb = tk.Listbox(slot_frame, selectmode='multiple', exportselection=False, height=5, width=24)
+    services_lb.grid(row=1, column=1, padx=5, pady=5)
+
+    tk.Label(slot_frame, text="Add-ons").grid(row=1, column=2, padx=5, pady=5)
+    addons_lb = tk.Listbox(slot_frame, selectmode='multiple', exportselection=False, height=5, width=24)
+    addons_lb.grid(row=1, column=3, padx=5, pady=5)
+
+    tk.Button(slot_frame, text="Next 5 Slots", command=lambda: find_slots()).grid(row=2, column=0, columnspan=4, pady=5)
+
+    slots_lb = tk.Listbox(slot_frame, exportselection=False, height=5, width=52)
+    slots_lb.grid(row=3, column=0, columnspan=4, padx=5, pady=5)
+    slots_lb.bind("<Double-Button-1>", lambda _e: book_slot())
+    tk.Button(slot_frame, text="Book Selected Slot", command=lambda: book_slot()).grid(row=4, column=0, columnspan=4, pady=5)
+
+    grid = create_grid(parent, APPOINTMENT_GRID)
+    tree = grid.tree
+    found = {"slots": [], "request": None,  # last search results and (vehicle, services, add-ons)
+             "services": [], "addons": []}    # the catalog the listboxes show
 
     def load():
-        tree.delete(*tree.get_children())
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("""
-                SELECT a.AppointmentID, c.FirstName, v.Make, a.AppointmentDate, a.StartTime, a.EndTime, a.Status
-                FROM Appointments a
-                JOIN Customers c ON a.CustomerID = c.CustomerID
-                JOIN Vehicles v ON a.VehicleID = v.VehicleID
-            """)
-            for row in cur.fetchall(): tree.insert('', 'end', values=row)
-            cur.close(); conn.close()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
+        grid.reload()
+        # Emptied by Wipe ALL Data (or a write to the catalog tables); old slots may name gone employees
+        if not availability.services:
+            found["slots"] = []
+            slots_lb.delete(0, tk.END)
+            run_in_background(availability.load_catalog, show_catalog, owner=services_lb,
+                              error_title="Availability Error")
 
     def add_appointment():
         cid, vid, date, start, end = cust_id_e.get(), veh_id_e.get(), date_e.get(), start_e.get(), end_e.get()
         if not all([cid, vid, date, start, end]):
             return messagebox.showerror("Error", "All fields are required.")
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("""
+        entries = (cust_id_e, veh_id_e, date_e, start_e, end_e)
+        queue_write("""
                 INSERT INTO Appointments (CustomerID, VehicleID, AppointmentDate, StartTime, EndTime, Status)
                 VALUES (%s,%s,%s,%s,%s,'scheduled')
-            """, (cid, vid, date, start, end))
-            conn.commit()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Insert Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
-        load()
-        for e in (cust_id_e, veh_id_e, date_e, start_e, end_e): e.delete(0, tk.END)
+            """, (cid, vid, date, start, end), f"Add appointment for vehicle {vid} on {date} {start}",
+                    on_done=grid.refresh_row, on_error=refill(entries, (cid, vid, date, start, end)))
+        for e in entries: e.delete(0, tk.END)
+
+    def show_catalog(engine):
+        found["services"], found["addons"] = list(engine.services), list(engine.addons)
+        services_lb.delete(0, tk.END); addons_lb.delete(0, tk.END)
+        for _sid, name, minutes, _price in engine.services: services_lb.insert(tk.END, f"{name} ({minutes} min)")
+        for _aid, name, minutes, _price in engine.addons: addons_lb.insert(tk.END, f"{name} (+{minutes} min)")
+
+    def find_slots():
+        vid, start = slot_veh_e.get().strip(), slot_from_e.get().strip()
+        if not vid.isdigit():
+            return messagebox.showerror("Error", "Enter a numeric Vehicle ID.")
+        try:
+            after = datetime.strptime(start, "%Y-%m-%d") if start else None
+        except ValueError:
+            return messagebox.showerror("Error", "From date must be YYYY-MM-DD.")
+        service_ids = [found["services"][i][0] for i in services_lb.curselection()]
+        addon_ids = [found["addons"][i][0] for i in addons_lb.curselection()]
+        if not service_ids:
+            return messagebox.showerror("Error", "Select at least one service.")
+        if after is not None and after.date() < datetime.now().date():
+            after = None  # never offer slots in the past
+        duration = availability.duration(service_ids, addon_ids)
+
+        def show(slots):
+            found["slots"], found["request"] = slots, (int(vid), service_ids, addon_ids)
+            slots_lb.delete(0, tk.END)
+            for slot in slots: slots_lb.insert(tk.END, f"{slot}   ({duration} min, employee {slot.employee_id})")
+            if not slots: slots_lb.insert(tk.END, "No open slots in the next 60 days.")
+
+        run_in_background(lambda: availability.next_slots(duration, int(vid), after=after),
+                          show, owner=slots_lb, error_title="Availability Error")
+
+    def book_slot():
+        sel = slots_lb.curselection()
+        if not sel or sel[0] >= len(found["slots"]):
+            return messagebox.showwarning("Book", "Select a slot first.")
+        slot = found["slots"][sel[0]]
+        vid, service_ids, addon_ids = found["request"]
+
+        def booked(new_id):
+            invalidate_tables("Appointments", "AppointmentServices", "AppointmentAddOns")
+            grid.refresh_row(new_id)
+            found["slots"] = []
+            slots_lb.delete(0, tk.END)
+            slots_lb.insert(tk.END, f"Booked appointment {new_id}: {slot}")
+
+        # Own task (no channel): a later search must not cancel a booking before it runs
+        runner.submit(availability.book, slot, vid, service_ids, addon_ids, owner=slots_lb, on_done=booked,
+                      on_error=lambda err: messagebox.showerror("Booking Error", str(err)))
 
     def update_status():
         aid, new_status = appt_id_e.get(), status_e.get()
         if not aid or not new_status:
             return messagebox.showerror("Error", "Both fields required.")
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("UPDATE Appointments SET Status=%s WHERE AppointmentID=%s", (new_status, aid))
-            conn.commit()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Update Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
-        load()
+        queue_write("UPDATE Appointments SET Status=%s WHERE AppointmentID=%s",
+                    (new_status, aid), f"Set appointment {aid} to {new_status}",
+                    on_done=lambda _: grid.refresh_row(aid),
+                    on_error=refill((appt_id_e, status_e), (aid, new_status)))
         for e in (appt_id_e, status_e): e.delete(0, tk.END)
 
     def delete_appointment():
@@ -532,24 +790,20 @@ def load_appointments(parent):
         if not sel: return messagebox.showwarning("Delete", "No row selected.")
         appt_id = tree.item(sel[0])['values'][0]
         if messagebox.askyesno("Confirm", f"Delete appointment ID {appt_id}?"):
-            try:
-                conn = get_connection(); cur = conn.cursor()
-                cur.execute("DELETE FROM Appointments WHERE AppointmentID=%s", (appt_id,))
-                conn.commit()
-            except mysql.connector.Error as err:
-                messagebox.showerror("Delete Error", str(err))
-            finally:
-                try: cur.close(); conn.close()
-                except: pass
-            load()
+            queue_write("DELETE FROM Appointments WHERE AppointmentID=%s",
+                        (appt_id,), f"Delete appointment {appt_id}",
+                        on_done=lambda _: grid.remove_row(appt_id))
 
     tk.Button(parent, text="Delete Selected", command=delete_appointment).pack(pady=5)
+    tk.Button(parent, text="Refresh", command=load).pack(pady=5)
 
+    if availability.services:
+        show_catalog(availability)
     load()
+    return load
 
 # ---------- PAYMENTS ----------
 def load_payments(parent):
-    clear_frame(parent)
     tk.Label(parent, text="Payments Management", font=('Arial', 16)).pack()
 
     input_frame = tk.Frame(parent)
@@ -568,65 +822,51 @@ def load_payments(parent):
     method_e = tk.Entry(input_frame, width=50); method_e.grid(row=3, column=1)
 
     def load():
-        tree.delete(*tree.get_children())
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("SELECT PaymentID, AppointmentID, PaymentDate, Amount, PaymentMethod FROM Payments")
-            for row in cur.fetchall(): tree.insert('', 'end', values=row)
-            cur.close(); conn.close()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", str(err))
+        grid.reload()
 
     def add_payment():
         appt_id, date, amount, method = appt_id_e.get(), date_e.get(), amount_e.get(), method_e.get()
         if not all([appt_id, date, amount, method]):
             return messagebox.showerror("Error", "All fields are required.")
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.execute("""INSERT INTO Payments (AppointmentID, PaymentDate, Amount, PaymentMethod)
-                           VALUES (%s,%s,%s,%s)""", (appt_id, date, amount, method))
-            conn.commit()
-        except mysql.connector.Error as err:
-            messagebox.showerror("Insert Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
-        load()
-        for e in (appt_id_e, date_e, amount_e, method_e): e.delete(0, tk.END)
+        entries = (appt_id_e, date_e, amount_e, method_e)
+        queue_write("""INSERT INTO Payments (AppointmentID, PaymentDate, Amount, PaymentMethod)
+                       VALUES (%s,%s,%s,%s)""", (appt_id, date, amount, method),
+                    f"Add payment of {amount} for appointment {appt_id}",
+                    on_done=grid.refresh_row, on_error=refill(entries, (appt_id, date, amount, method)))
+        for e in entries: e.delete(0, tk.END)
 
     def delete_payment():
         sel = tree.selection()
         if not sel: return messagebox.showwarning("Delete", "No row selected.")
         pid = tree.item(sel[0])['values'][0]
         if messagebox.askyesno("Confirm", f"Delete payment ID {pid}?"):
-            try:
-                conn = get_connection(); cur = conn.cursor()
-                cur.execute("DELETE FROM Payments WHERE PaymentID=%s", (pid,))
-                conn.commit()
-            except mysql.connector.Error as err:
-                messagebox.showerror("Delete Error", str(err))
-            finally:
-                try: cur.close(); conn.close()
-                except: pass
-            load()
+            queue_write("DELETE FROM Payments WHERE PaymentID=%s", (pid,), f"Delete payment {pid}",
+                        on_done=lambda _: grid.remove_row(pid))
 
     tk.Button(input_frame, text="Add Payment", command=add_payment).grid(row=4, column=0, columnspan=2, pady=10)
 
-    tree_frame = tk.Frame(parent); tree_frame.pack(fill='both', expand=True)
-    tree = ttk.Treeview(tree_frame, columns=("ID", "Appointment ID", "Date", "Amount", "Method"), show='headings')
-    tree.configure(style=TREEVIEW_STYLE)
-    for col in tree["columns"]: tree.heading(col, text=col)
-    tree.pack(fill='both', expand=True, padx=10, pady=10)
+    create_export_panel(parent, ("payments",))
+
+    grid = create_grid(parent, PAYMENT_GRID)
+    tree = grid.tree
 
     tk.Button(parent, text="Delete Selected", command=delete_payment).pack(pady=5)
+    tk.Button(parent, text="Refresh", command=load).pack(pady=5)
 
     load()
+    return load
 
 # ---------- SETTINGS ----------
 def load_settings(parent):
-    clear_frame(parent)
     tk.Label(parent, text="Settings", font=('Arial', 16)).pack(pady=10)
 
+    appearance_frame = tk.Frame(parent); appearance_frame.pack(pady=5)
+    tk.Label(appearance_frame, text="Appearance").pack(side='left', padx=5)
+    appearance = tk.StringVar(value=theme.name)
+    # After the menu callback returns: switching rebuilds this page, menu included
+    tk.OptionMenu(appearance_frame, appearance, *THEMES,
+                  command=lambda name: parent.winfo_toplevel().after_idle(switch_theme, name)).pack(side='left', padx=5)
+
     desc = ("⚠️ Wipe ALL Data\n\n"
             "This will delete all rows from your database tables.\n"
             "Use only if you are sure. This action cannot be undone.")
@@ -637,18 +877,26 @@ def load_settings(parent):
             return
         if not messagebox.askyesno("Are you absolutely sure?", "This cannot be undone. Proceed?"):
             return
+        # Queued edits refer to rows that are about to go
+        pending_writes.discard()
+        show_pending()
         try:
             conn = get_connection(); cur = conn.cursor()
             cur.execute("SET FOREIGN_KEY_CHECKS=0")
             tables_in_order = [
                 "AppointmentAddOns","AppointmentServices","Reviews","Payments",
-                "Appointments","Vehicles","Services","ServiceAddOns","Customers"
+                "Appointments","Vehicles","Services","ServiceAddOns","Customers",
+                "DailyRevenue"  # TRUNCATE bypasses the rollup triggers
             ]
             for tbl in tables_in_order:
                 try: cur.execute(f"TRUNCATE TABLE {tbl}")
                 except mysql.connector.Error as e: print(f"Skipping {tbl}: {e}")
             cur.execute("SET FOREIGN_KEY_CHECKS=1")
             conn.commit()
+            row_cache.clear()
+            dashboard_cache.clear()
+            availability.invalidate()
+            pages.invalidate()
             messagebox.showinfo("Done", "All data has been wiped.")
         except mysql.connector.Error as err:
             messagebox.showerror("Error", f"Failed wiping  {err}")
@@ -656,43 +904,314 @@ def load_settings(parent):
             try: cur.close(); conn.close()
             except: pass
 
-    tk.Button(parent, text="Wipe ALL Data", command=clear_all_data,
-              bg="#b00020", fg="#ffffff", padx=10, pady=6).pack(pady=15)
+    theme.button(parent, role="danger", text="Wipe ALL Data", command=clear_all_data,
+                 padx=10, pady=6).pack(pady=15)
+
+    tk.Label(parent, text="Revenue Rollup\n\n"
+                          "Compare the DailyRevenue table used by the dashboard with Payments,\n"
+                          "and rebuild it if they disagree.", justify="left").pack(pady=5)
+
+    def call_procedure(name, args):
+        conn = get_connection()
+        try:
+            cur = conn.cursor()
+            cur.callproc(name, args)
+            rows = [row for result in cur.stored_results() for row in result.fetchall()]
+            conn.commit()
+            cur.close()
+            return rows
+        finally:
+            conn.close()
+
+    def rebuild_rollup():
+        def done(_):
+            invalidate_tables("Payments")
+            messagebox.showinfo("Revenue Rollup", "DailyRevenue has been rebuilt from Payments.")
+        run_in_background(lambda: call_procedure("BackfillDailyRevenue", (None, None)), done, parent)
+
+    def check_rollup():
+        def done(mismatches):
+            if not mismatches:
+                return messagebox.showinfo("Revenue Rollup", "DailyRevenue matches Payments.")
+            sample = "\n".join(f"{r[0]}: rollup {r[1]} vs actual {r[2]}" for r in mismatches[:10])
+            if messagebox.askyesno("Revenue Rollup",
+                                   f"{len(mismatches)} day(s) disagree:\n\n{sample}\n\nRebuild now?"):
+                rebuild_rollup()
+        run_in_background(lambda: call_procedure("CheckDailyRevenue", (None, None)), done, parent)
+
+    tk.Button(parent, text="Check Revenue Rollup", command=check_rollup, padx=10, pady=6).pack(pady=5)
+
+    tk.Label(parent, text="Bulk Import\n\n"
+                          "Load customers, vehicles or appointments from a CSV file whose header row\n"
+                          "uses the table's column names. Invalid rows are skipped and written to\n"
+                          "<file>.rejects.csv.", justify="left").pack(pady=5)
+
+    import_frame = tk.Frame(parent); import_frame.pack(pady=5)
+    import_kind = tk.StringVar(value="customers")
+    tk.OptionMenu(import_frame, import_kind, *sorted(bulk_import.IMPORTS)).pack(side='left', padx=5)
+    import_button = tk.Button(import_frame, text="Import CSV...", command=lambda: start_import())
+    import_button.pack(side='left', padx=5)
+    cancel_button = tk.Button(import_frame, text="Cancel", state='disabled', command=lambda: cancel_import())
+    cancel_button.pack(side='left', padx=5)
+    import_bar = ttk.Progressbar(parent, length=400, maximum=1.0)
+    import_bar.pack(pady=5)
+    import_status = tk.Label(parent, text="")
+    import_status.pack()
+    current_import = {"stop": None}
+
+    def start_import():
+        path = filedialog.askopenfilename(title="Choose a CSV file",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        kind = import_kind.get()
+        stop = current_import["stop"] = threading.Event()
+
+        def page_alive():
+            # The page may have been rebuilt (theme switch) or evicted while the import ran
+            try:
+                return bool(import_bar.winfo_exists())
+            except tk.TclError:
+                return False
+
+        def show_progress(result):
+            if not page_alive():
+                return
+            import_bar["value"] = result.fraction
+            import_status.config(text=f"{result.inserted:,} inserted, {result.rejected:,} rejected")
+
+        def finished(result):
+            # Committed batches must reach the caches whether or not this page is still there
+            if result.inserted:
+                invalidate_tables(bulk_import.IMPORTS[kind].table)
+            if not page_alive():
+                return
+            import_button.config(state='normal'); cancel_button.config(state='disabled')
+            show_progress(result)
+            if stop.is_set():
+                import_status.config(text=f"Import cancelled; {result.inserted:,} rows were already imported.")
+                return
+            message = f"{result.inserted:,} of {result.rows:,} rows imported."
+            if result.rejects_path:
+                message += f"\n\nRejected rows were written to:\n{result.rejects_path}"
+            messagebox.showinfo("Bulk Import", message)
+
+        def failed(err):
+            # Batches before the error were committed
+            invalidate_tables(bulk_import.IMPORTS[kind].table)
+            if page_alive():
+                import_button.config(state='normal'); cancel_button.config(state='disabled')
+            messagebox.showerror("Bulk Import", str(err))
+
+        import_bar["value"] = 0
+        import_status.config(text=f"Importing {kind}...")
+        import_button.config(state='disabled'); cancel_button.config(state='normal')
+        # No channel or owner: leaving or rebuilding the page must neither stop the import
+        # nor drop its result; Cancel sets `stop` instead, so finished() still runs
+        runner.submit(
+            lambda task: bulk_import.import_csv(get_connection, kind, path, progress=task.report,
+                                                cancelled=stop.is_set),
+            pass_task=True, on_progress=show_progress, on_done=finished, on_error=failed)
+
+    def cancel_import():
+        # Stops before the next batch; batches already committed stay
+        if current_import["stop"] is not None:
+            current_import["stop"].set()
+        cancel_button.config(state='disabled')
+        import_status.config(text="Cancelling import...")
 
 # ---------- REPORTS ----------
 def load_reports(parent):
-    clear_frame(parent)
     tk.Label(parent, text="Reports / Views", font=('Arial', 16)).pack()
 
-    tk.Label(parent, text="Enter # of days for recent payments summary:").pack()
-    days_entry = tk.Entry(parent); days_entry.pack()
-
-    tree = ttk.Treeview(parent, columns=("PaymentID", "AppointmentID", "Amount", "Date"), show='headings')
+    controls = tk.Frame(parent); controls.pack(pady=5)
+    report_name = tk.StringVar(value=next(iter(REPORTS)))
+    tk.OptionMenu(controls, report_name, *REPORTS, command=lambda _name: show_columns()).pack(side='left', padx=5)
+    param_label = tk.Label(controls); param_label.pack(side='left', padx=5)
+    param_entry = tk.Entry(controls, width=12); param_entry.pack(side='left', padx=5)
+    tk.Button(controls, text="Run Report", command=lambda: run_summary()).pack(side='left', padx=5)
+    cancel_button = tk.Button(controls, text="Cancel", state='disabled', command=lambda: cancel_report())
+    cancel_button.pack(side='left', padx=5)
+    stats_label = tk.Label(parent, text=""); stats_label.pack()
+
+    tree = ttk.Treeview(parent, show='headings')
     tree.configure(style=TREEVIEW_STYLE)
-    for col in tree["columns"]: tree.heading(col, text=col)
     tree.pack(fill='both', expand=True, padx=10, pady=10)
 
+    state = {"task": None, "running": False}
+
+    def show_stats(count, total):
+        text = f"{count:,} rows"
+        if total is not None:
+            text += f"   Total: ${total:,.2f}"
+        if state["running"] or filler.busy:
+            text += "   (loading...)"
+        stats_label.config(text=text)
+
+    filler = ProgressiveTreeFiller(tree, on_stats=show_stats)
+
+    def show_columns():
+        spec = REPORTS[report_name.get()]
+        cancel_report()
+        filler.start()
+        tree["columns"] = spec.columns
+        for col in spec.columns: tree.heading(col, text=col)
+        param_label.config(text=spec.param_label)
+        stats_label.config(text="")
+
+    def finished(_count=None):
+        state["running"] = False
+        cancel_button.config(state='disabled')
+        show_stats(filler.count, filler.total if filler.total_column is not None else None)
+
     def run_summary():
-        tree.delete(*tree.get_children())
+        spec = REPORTS[report_name.get()]
         try:
-            days = int(days_entry.get())
+            arg = int(param_entry.get())
         except ValueError:
-            return messagebox.showerror("Error", "Please enter a whole number of days.")
-        try:
-            conn = get_connection(); cur = conn.cursor()
-            cur.callproc("SummarizeRecentPayments", [days])
-            for result in cur.stored_results():
-                for row in result.fetchall():
-                    tree.insert('', 'end', values=row)
-        except mysql.connector.Error as err:
+            return messagebox.showerror("Error", f"{spec.param_label} must be a whole number.")
+
+        filler.total_column = spec.total_column
+        state["running"] = True
+        filler.start()
+        cancel_button.config(state='normal')
+
+        def failed(err):
+            finished()
             messagebox.showerror("DB Error", str(err))
-        finally:
-            try: cur.close(); conn.close()
-            except: pass
 
-    tk.Button(parent, text="Run Report", command=run_summary).pack(pady=10)
+        # Rows arrive in chunks (on_progress) and are inserted a slice per after() tick.
+        # Own channel: the report keeps streaming into its page while another page is shown.
+        # Own connection (not the pool's), so Cancel can drop it without draining the rest
+        state["task"] = runner.submit(
+            lambda task: stream_procedure(task, open_dedicated_connection, spec.procedure, (arg,)),
+            pass_task=True, channel="report", owner=tree,
+            on_progress=filler.feed, on_done=finished, on_error=failed)
+
+    def cancel_report():
+        if state["task"] is not None:
+            state["task"].cancel()
+            state["task"] = None
+        filler.cancel()
+        if state["running"]:
+            finished()
+            stats_label.config(text=stats_label.cget("text") + "   (cancelled)")
+
+    show_columns()
+
+    create_export_panel(parent, tuple(data_export.EXPORTS))
 
 # ---------- LOGIN & MAIN UI ----------
+_dashboard_class = None
+
+def load_dashboard_class():
+    """Import the dashboard (customtkinter + matplotlib) the first time it is shown."""
+    global _dashboard_class
+    if _dashboard_class is None:
+        import customtkinter as ctk
+        ctk.set_appearance_mode(theme.name)
+        from dashboard import DashboardFrame
+        _dashboard_class = DashboardFrame
+    return _dashboard_class
+
+def load_logo(label, size):
+    """Show NADLOGO.png in `label`; PIL is imported here rather than at startup."""
+    try:
+        from PIL import Image, ImageTk
+        logo = ImageTk.PhotoImage(Image.open("NADLOGO.png").resize((size, size)))
+        label.configure(image=logo)
+        label.image = logo
+    except Exception as e:
+        print("Logo failed to load:", e)
+
+def after_first_paint(window, callback):
+    """
+    Run callback once `window` has been exposed and drawn, for startup work that
+    can wait until the window is on screen (the redraws queued by the first
+    Expose are idle handlers too, and run before this one).
+    """
+    state = {"done": False}
+    def on_expose(event):
+        if not state["done"]:
+            state["done"] = True
+            window.after_idle(callback)
+    window.bind("<Expose>", on_expose, add="+")
+
+def grid_tables(spec):
+    """Tables a grid page shows, from its GridSpec."""
+    return [table for table, _key in spec.tables]
+
+def page_builder(name, title, loader):
+    """PageManager builder for a load_* page: built once; a page that fails is rebuilt next visit."""
+    def build(frame):
+        try:
+            return loader(frame)
+        except Exception as e:
+            print(f"Error in {loader.__name__}: {e}")
+            theme.label(frame, role="warning", text=f"{title} functionality temporarily unavailable").pack(pady=10)
+            pages.discard(name)
+    return build
+
+def switch_theme(name):
+    """
+    Swap the colour tables. ttk, customtkinter and factory-made widgets follow at
+    once; pages are rebuilt because plain tk widgets keep their creation colours.
+    """
+    if name == theme.name:
+        return
+    theme.use(name)
+    if pages is not None:
+        pages.rebuild()
+
+def build_dashboard_page(frame):
+    """PageManager builder for the dashboard; its refresh is served from dashboard_cache while fresh."""
+    global current_dashboard
+
+    # Add header
+    tk.Label(frame, text="Dashboard", font=("Arial", 24)).pack(pady=20)
+
+    # Create a dedicated container for the dashboard
+    dashboard_container = tk.Frame(frame)
+    dashboard_container.pack(fill="both", expand=True, pady=10)
+
+    try:
+        print("Attempting to load dashboard...")
+
+        # Test database connection first (served from the pool, no new handshake)
+        try:
+            test_conn = get_connection()
+            test_conn.close()
+            print(f"Database connection successful (pool: {db_pool.stats()})")
+        except Exception as db_e:
+            raise Exception(f"Database connection failed: {db_e}")
+
+        dash = load_dashboard_class()(
+            dashboard_container,
+            get_connection=get_connection,
+            get_is_dark=lambda: theme.is_dark,
+            runner=runner,
+            cache=dashboard_cache
+        )
+        current_dashboard = dash
+        dash.pack(fill="both", expand=True, pady=10)
+        print("Dashboard loaded successfully")
+        return dash.refresh_all
+
+    except ImportError as import_e:
+        print(f"Dashboard import error: {import_e}")
+        theme.label(frame, role="notice", text="📊 Dashboard module not found - using simple view",
+                    font=("Arial", 12)).pack(pady=10)
+
+    except Exception as dash_e:
+        print(f"Dashboard error: {dash_e}")
+        theme.label(frame, role="warning", text="📊 Dashboard temporarily unavailable",
+                    font=("Arial", 12)).pack(pady=10)
+        theme.label(frame, role="error", text=f"Error: {dash_e}", font=("Arial", 10)).pack(pady=5)
+
+    # Simple placeholder content; the real dashboard is tried again on the next visit
+    add_simple_dashboard_content(dashboard_container)
+    pages.discard("dashboard")
+
 def open_main_ui():
     login.destroy()
     global root, sidebar, content_frame
@@ -705,373 +1224,104 @@ def open_main_ui():
     root.title("Nathan Auto Detail - Dashboard")
     root.geometry("1000x600")
 
-    # Apply dark theme defaults
-    apply_defaults_to(root)
-
-    # Set CTk to dark mode
-    ctk.set_appearance_mode("dark")
-    
-    # Setup ttk styles
-    style = ttk.Style()
-    style.theme_use("clam")
-    
-    # Colors
-    APP_BG = "#1e1e1e"
-    FG = "#ffffff"
-    ENTRY_BG = "#2a2a2a"
-    HOVER_BG = "#555555"
-    ACTIVE_BG = "#444444"
-    BORDER = "#3a3a3a"
-    
-    # Configure basic styles
-    style.configure(".", background=APP_BG, foreground=FG)
-    style.map(".", background=[("!disabled", APP_BG)], foreground=[("!disabled", FG)])
-    
-    style.configure("TFrame", background=APP_BG)
-    style.configure("TLabel", background=APP_BG, foreground=FG)
-    style.configure("TLabelframe", background=APP_BG, bordercolor=BORDER)
-    style.configure("TLabelframe.Label", background=APP_BG, foreground=FG)
-    
-    # Entry style
-    style.configure(
-        "Theme.TEntry",
-        fieldbackground=ENTRY_BG,
-        background=ENTRY_BG,
-        foreground=FG,
-        bordercolor=BORDER,
-        lightcolor=BORDER,
-        darkcolor=BORDER,
-        padding=3
-    )
-    style.map(
-        "Theme.TEntry",
-        fieldbackground=[("readonly", ENTRY_BG), ("focus", ENTRY_BG)],
-        foreground=[("disabled", FG), ("!disabled", FG)]
-    )
-    
-    # Button styles
-    style.configure("TButton", background=ACTIVE_BG, foreground=FG, bordercolor=BORDER, relief="flat", padding=(8, 4))
-    style.map("TButton", background=[("active", HOVER_BG), ("!active", ACTIVE_BG)], foreground=[("!disabled", FG)])
-    
-    style.configure("Nav.TButton", background=ACTIVE_BG, foreground=FG, bordercolor=BORDER, relief="flat", padding=(10, 6))
-    style.map("Nav.TButton", background=[("pressed", HOVER_BG), ("active", HOVER_BG), ("!active", ACTIVE_BG)],
-                             foreground=[("!disabled", FG)])
-    
-    # Treeview
-    global TREEVIEW_STYLE
-    tv_style = "Dark.Treeview"
-    style.configure(tv_style, background=APP_BG, fieldbackground=APP_BG, foreground=FG, bordercolor=BORDER, rowheight=25)
-    style.map(tv_style, background=[("selected", HOVER_BG), ("!selected", APP_BG)], foreground=[("selected", FG), ("!selected", FG)])
-    style.layout(tv_style, [("Treeview.treearea", {"sticky": "nswe"})])
-    style.configure("Treeview.Heading", background=ACTIVE_BG, foreground=FG, relief="flat", bordercolor=BORDER)
-    style.map("Treeview.Heading", background=[("active", HOVER_BG), ("!active", ACTIVE_BG)], foreground=[("!disabled", FG)])
-    
-    TREEVIEW_STYLE = tv_style
+    # Colours for every widget created from here on (ttk styles follow after the first paint)
+    theme.install(root)
 
     # Create main layout
-    sidebar = tk.Frame(root)
+    sidebar = theme.frame(root, role="surface")
     sidebar.pack(side='left', fill='y')
 
-    content_frame = tk.Frame(root)
+    content_frame = theme.frame(root, role="surface")
     content_frame.pack(side='right', expand=True, fill='both', padx=(20, 0))  # Add 20px left padding
     
-    # Configure root, sidebar and content frame colors
-    try:
-        root.configure(bg=APP_BG)
-        sidebar.configure(bg=APP_BG, highlightbackground=APP_BG, highlightcolor=APP_BG)
-        content_frame.configure(bg=APP_BG, highlightbackground=APP_BG, highlightcolor=APP_BG)
-    except Exception:
-        pass
-    
-    # Apply theme to existing widgets
-    set_theme(root)
-
-    def show_dashboard():
-        global current_page_loader, current_dashboard
-        current_page_loader = show_dashboard
-        current_page["name"] = "dashboard"
-        print("show_dashboard called")  # Debug print
-
-        try:
-            clear_frame(content_frame)
-            content_frame.configure(bg="#1e1e1e")
-            
-            # Add header
-            tk.Label(content_frame, text="Dashboard", fg="white", bg="#1e1e1e", 
-                    font=("Arial", 24)).pack(pady=20)
-            
-            # Create a dedicated container for the dashboard
-            dashboard_container = tk.Frame(content_frame, bg="#1e1e1e")
-            dashboard_container.pack(fill="both", expand=True, pady=10)
-            
-            # Try to load the actual dashboard
-            try:
-                print("Attempting to load dashboard...")
-                
-                # Make sure any existing dashboard is cleaned up first
-                safe_destroy_dashboard()
-                
-                # Test database connection first
-                try:
-                    test_conn = get_connection()
-                    test_conn.close()
-                    print("Database connection successful")
-                except Exception as db_e:
-                    raise Exception(f"Database connection failed: {db_e}")
-                
-                dash = DashboardFrame(
-                    dashboard_container,  # Use the dedicated container instead of content_frame
-                    get_connection=get_connection,
-                    get_is_dark=lambda: True  # Always return True since we're always in dark mode
-                )
-                
-                # Store reference to dashboard instance
-                global current_dashboard
-                current_dashboard = dash
-                
-                dash.pack(fill="both", expand=True, pady=10)
-                print("Dashboard loaded successfully")
-                
-            except ImportError as import_e:
-                print(f"Dashboard import error: {import_e}")
-                tk.Label(content_frame, text="📊 Dashboard module not found - using simple view", 
-                         fg="yellow", bg="#1e1e1e", font=("Arial", 12)).pack(pady=10)
-                # Add simple placeholder content
-                add_simple_dashboard_content(dashboard_container)
-                
-            except Exception as dash_e:
-                print(f"Dashboard error: {dash_e}")
-                tk.Label(content_frame, text="📊 Dashboard temporarily unavailable", 
-                         fg="orange", bg="#1e1e1e", font=("Arial", 12)).pack(pady=10)
-                tk.Label(content_frame, text=f"Error: {dash_e}", 
-                         fg="red", bg="#1e1e1e", font=("Arial", 10)).pack(pady=5)
-                # Add simple placeholder content
-                add_simple_dashboard_content(dashboard_container)
-                
-        except Exception as e:
-            print(f"Error in show_dashboard: {e}")
-            clear_frame(content_frame)
-            tk.Label(content_frame, text=f"Dashboard Error: {e}", 
-                    fg="red", bg="#1e1e1e", font=("Arial", 16)).pack(expand=True)
-
-    def show_customers():
-        global current_page_loader
-        current_page_loader = show_customers
-        current_page["name"] = "customers"
-        print("show_customers called")  # Debug print
+    # Background DB work; the sidebar shows a busy indicator while queries run
+    global runner
+    runner = BackgroundRunner(root)
+    busy_label = theme.label(sidebar, role="accent", text="")
+    busy_label.pack(side='bottom', pady=10)
+
+    def on_busy(busy):
+        busy_label.configure(text="Loading…" if busy else "")
         try:
-            clear_frame(content_frame)
-            content_frame.configure(bg="#1e1e1e")
-            
-            # Simple test content first
-            tk.Label(content_frame, text="Customers", fg="white", bg="#1e1e1e", 
-                    font=("Arial", 24)).pack(pady=20)
-            tk.Label(content_frame, text="Customer Management Page", 
-                    fg="white", bg="#1e1e1e", font=("Arial", 14)).pack(pady=10)
-            
-            # Try to load the actual customers content
-            try:
-                load_customers(content_frame)
-                set_theme(content_frame)
-            except Exception as load_e:
-                print(f"Error in load_customers: {load_e}")
-                tk.Label(content_frame, text="Customer functionality temporarily unavailable", 
-                         fg="orange", bg="#1e1e1e").pack(pady=10)
-                
-        except Exception as e:
-            print(f"Error in show_customers: {e}")
-            clear_frame(content_frame)
-            tk.Label(content_frame, text=f"Customers Error: {e}", 
-                    fg="red", bg="#1e1e1e").pack()
-
-    def show_vehicles():
-        global current_page_loader
-        current_page_loader = show_vehicles
-        current_page["name"] = "vehicles"
-        print("show_vehicles called")  # Debug print
-        try:
-            clear_frame(content_frame)
-            content_frame.configure(bg="#1e1e1e")
-            
-            # Simple test content
-            tk.Label(content_frame, text="Vehicles", fg="white", bg="#1e1e1e", 
-                    font=("Arial", 24)).pack(pady=20)
-            tk.Label(content_frame, text="Vehicle Management Page", 
-                    fg="white", bg="#1e1e1e", font=("Arial", 14)).pack(pady=10)
-                    
-            try:
-                load_vehicles(content_frame)
-                set_theme(content_frame)
-            except Exception as load_e:
-                print(f"Error in load_vehicles: {load_e}")
-                tk.Label(content_frame, text="Vehicle functionality temporarily unavailable", 
-                         fg="orange", bg="#1e1e1e").pack(pady=10)
-                         
-        except Exception as e:
-            print(f"Error in show_vehicles: {e}")
-            clear_frame(content_frame)
-            tk.Label(content_frame, text=f"Vehicles Error: {e}", fg="red", bg="#1e1e1e").pack()
-
-    def show_appointments():
+            root.configure(cursor="watch" if busy else "")
+        except tk.TclError:
+            pass
+    runner.add_busy_listener(on_busy)
+
+    # Unsaved form edits: flushed in the background after a pause, or now with Save Now
+    global pending_label
+    save_frame = theme.frame(sidebar, role="surface")
+    save_frame.pack(side='bottom', pady=5)
+    pending_label = theme.label(save_frame, role="warning", text="")
+    pending_label.pack()
+    theme.button(save_frame, role="nav", text="Save Now", command=flush_writes,
+                 relief="flat", borderwidth=1, pady=4, width=25).pack(pady=5)
+
+    root.protocol("WM_DELETE_WINDOW", close_main_window)
+
+    # Pages are built on first visit and kept (see PAGE_CACHE_CONFIG)
+    global pages, page_refreshers
+    pages = PageManager(content_frame,
+                        max_pages=PAGE_CACHE_CONFIG['max_pages'],
+                        max_rows=PAGE_CACHE_CONFIG['max_rows'])
+    max_age = PAGE_CACHE_CONFIG['max_age']
+    pages.add("dashboard", build_dashboard_page,
+              tables={t for tables in LOADER_TABLES.values() for t in tables},
+              max_age=min(LOADER_TTLS.values()), on_evict=safe_destroy_dashboard)
+    pages.add("customers", page_builder("customers", "Customer", load_customers),
+              tables=grid_tables(CUSTOMER_GRID), max_age=max_age)
+    pages.add("vehicles", page_builder("vehicles", "Vehicle", load_vehicles),
+              tables=grid_tables(VEHICLE_GRID), max_age=max_age)
+    pages.add("appointments", page_builder("appointments", "Appointment", load_appointments),
+              tables=grid_tables(APPOINTMENT_GRID), max_age=max_age)
+    pages.add("payments", page_builder("payments", "Payment", load_payments),
+              tables=grid_tables(PAYMENT_GRID), max_age=max_age)
+    pages.add("reports", page_builder("reports", "Reports", load_reports))
+    pages.add("settings", page_builder("settings", "Settings", load_settings))
+
+    def show_page(name):
         global current_page_loader
-        current_page_loader = show_appointments
-        current_page["name"] = "appointments"
-        print("show_appointments called")  # Debug print
+        current_page_loader = page_refreshers[name]
+        current_page["name"] = name
         try:
-            clear_frame(content_frame)
-            content_frame.configure(bg="#1e1e1e")
-            
-            # Simple test content first
-            tk.Label(content_frame, text="Appointments", fg="white", bg="#1e1e1e", 
-                    font=("Arial", 24)).pack(pady=20)
-            tk.Label(content_frame, text="Appointment Management Page", 
-                    fg="white", bg="#1e1e1e", font=("Arial", 14)).pack(pady=10)
-                    
-            try:
-                load_appointments(content_frame)
-                set_theme(content_frame)
-            except Exception as load_e:
-                print(f"Error in load_appointments: {load_e}")
-                tk.Label(content_frame, text="Appointment functionality temporarily unavailable", 
-                         fg="orange", bg="#1e1e1e").pack(pady=10)
-                         
+            pages.show(name)
         except Exception as e:
-            print(f"Error in show_appointments: {e}")
-            clear_frame(content_frame)
-            tk.Label(content_frame, text=f"Appointments Error: {e}", fg="red", bg="#1e1e1e").pack()
+            print(f"Error in show_page({name}): {e}")
+            messagebox.showerror("Page Error", f"The {name} page could not be shown: {e}")
 
-    def show_payments():
-        global current_page_loader
-        current_page_loader = show_payments
-        current_page["name"] = "payments"
-        print("show_payments called")  # Debug print
-        try:
-            clear_frame(content_frame)
-            content_frame.configure(bg="#1e1e1e")
-            
-            # Simple test content first
-            tk.Label(content_frame, text="Payments", fg="white", bg="#1e1e1e", 
-                    font=("Arial", 24)).pack(pady=20)
-            tk.Label(content_frame, text="Payment Management Page", 
-                    fg="white", bg="#1e1e1e", font=("Arial", 14)).pack(pady=10)
-                    
-            try:
-                load_payments(content_frame)
-                set_theme(content_frame)
-            except Exception as load_e:
-                print(f"Error in load_payments: {load_e}")
-                tk.Label(content_frame, text="Payment functionality temporarily unavailable", 
-                         fg="orange", bg="#1e1e1e").pack(pady=10)
-                         
-        except Exception as e:
-            print(f"Error in show_payments: {e}")
-            clear_frame(content_frame)
-            tk.Label(content_frame, text=f"Payments Error: {e}", fg="red", bg="#1e1e1e").pack()
+    page_refreshers = {name: (lambda name=name: show_page(name))
+                       for name in ("dashboard", "customers", "vehicles", "appointments",
+                                    "payments", "reports", "settings")}
 
-    def show_reports():
-        global current_page_loader
-        current_page_loader = show_reports
-        current_page["name"] = "reports"
-        print("show_reports called")  # Debug print
-        try:
-            clear_frame(content_frame)
-            content_frame.configure(bg="#1e1e1e")
-            
-            # Simple test content first
-            tk.Label(content_frame, text="Reports", fg="white", bg="#1e1e1e", 
-                    font=("Arial", 24)).pack(pady=20)
-            tk.Label(content_frame, text="Reports and Analytics Page", 
-                    fg="white", bg="#1e1e1e", font=("Arial", 14)).pack(pady=10)
-                    
-            try:
-                load_reports(content_frame)
-                set_theme(content_frame)
-            except Exception as load_e:
-                print(f"Error in load_reports: {load_e}")
-                tk.Label(content_frame, text="Reports functionality temporarily unavailable", 
-                         fg="orange", bg="#1e1e1e").pack(pady=10)
-                         
-        except Exception as e:
-            print(f"Error in show_reports: {e}")
-            clear_frame(content_frame)
-            tk.Label(content_frame, text=f"Reports Error: {e}", fg="red", bg="#1e1e1e").pack()
-
-    def show_settings():
-        global current_page_loader
-        current_page_loader = show_settings
-        current_page["name"] = "settings"
-        print("show_settings called")  # Debug print
-        try:
-            clear_frame(content_frame)
-            content_frame.configure(bg="#1e1e1e")
-            
-            # Simple test content first
-            tk.Label(content_frame, text="Settings", fg="white", bg="#1e1e1e", 
-                    font=("Arial", 24)).pack(pady=20)
-            tk.Label(content_frame, text="Application Settings Page", 
-                    fg="white", bg="#1e1e1e", font=("Arial", 14)).pack(pady=10)
-                    
-            try:
-                load_settings(content_frame)
-                set_theme(content_frame)
-            except Exception as load_e:
-                print(f"Error in load_settings: {load_e}")
-                tk.Label(content_frame, text="Settings functionality temporarily unavailable", 
-                         fg="orange", bg="#1e1e1e").pack(pady=10)
-                         
-        except Exception as e:
-            print(f"Error in show_settings: {e}")
-            clear_frame(content_frame)
-            tk.Label(content_frame, text=f"Settings Error: {e}", fg="red", bg="#1e1e1e").pack()
-
-    # Define page refreshers
-    global page_refreshers
-    page_refreshers = {
-        "dashboard": show_dashboard,
-        "customers": show_customers,
-        "vehicles": show_vehicles,
-        "appointments": show_appointments,
-        "payments": show_payments,
-        "reports": show_reports,
-        "settings": show_settings,
-    }
-
-    # Load logo
-    try:
-        logo_img = Image.open("NADLOGO.png").resize((100, 100))
-        logo = ImageTk.PhotoImage(logo_img)
-        logo_label = tk.Label(sidebar, image=logo)
-        logo_label.image = logo
-        logo_label.pack(pady=10)
-    except Exception as e:
-        print("Logo failed to load:", e)
+    # Logo (filled in after the first paint)
+    logo_label = theme.label(sidebar, role="surface")
+    logo_label.pack(pady=10)
 
     # Create navigation buttons - use tk.Button to ensure visibility
-    tk.Button(sidebar, text="Dashboard", command=show_dashboard, 
-              bg=ACTIVE_BG, fg=FG, activebackground=HOVER_BG, activeforeground=FG,
-              relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
-    tk.Button(sidebar, text="Customers", command=show_customers,
-              bg=ACTIVE_BG, fg=FG, activebackground=HOVER_BG, activeforeground=FG,
-              relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
-    tk.Button(sidebar, text="Vehicles", command=show_vehicles,
-              bg=ACTIVE_BG, fg=FG, activebackground=HOVER_BG, activeforeground=FG,
-              relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
-    tk.Button(sidebar, text="Appointments", command=show_appointments,
-              bg=ACTIVE_BG, fg=FG, activebackground=HOVER_BG, activeforeground=FG,
-              relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
-    tk.Button(sidebar, text="Payments", command=show_payments,
-              bg=ACTIVE_BG, fg=FG, activebackground=HOVER_BG, activeforeground=FG,
-              relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
-    tk.Button(sidebar, text="Reports", command=show_reports,
-              bg=ACTIVE_BG, fg=FG, activebackground=HOVER_BG, activeforeground=FG,
-              relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
-    tk.Button(sidebar, text="Settings", command=show_settings,
-              bg=ACTIVE_BG, fg=FG, activebackground=HOVER_BG, activeforeground=FG,
-              relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
-
-    # Show dashboard initially
-    show_dashboard()
+    theme.button(sidebar, role="nav", text="Dashboard", command=page_refreshers["dashboard"],
+                 relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
+    theme.button(sidebar, role="nav", text="Customers", command=page_refreshers["customers"],
+                 relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
+    theme.button(sidebar, role="nav", text="Vehicles", command=page_refreshers["vehicles"],
+                 relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
+    theme.button(sidebar, role="nav", text="Appointments", command=page_refreshers["appointments"],
+                 relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
+    theme.button(sidebar, role="nav", text="Payments", command=page_refreshers["payments"],
+                 relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
+    theme.button(sidebar, role="nav", text="Reports", command=page_refreshers["reports"],
+                 relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
+    theme.button(sidebar, role="nav", text="Settings", command=page_refreshers["settings"],
+                 relief="flat", borderwidth=1, pady=6, width=25).pack(pady=5)
+
+    # Styles, logo and the dashboard (customtkinter + matplotlib) wait until the window is on screen
+    def finish_startup():
+        theme.install_styles()
+        load_logo(logo_label, 100)
+        page_refreshers["dashboard"]()
+    after_first_paint(root, finish_startup)
     root.mainloop()
+    runner.shutdown()
+    db_pool.close_all()
 
 def try_login():
     if verify_login(user_e.get(), pass_e.get()):
@@ -1079,27 +1329,32 @@ def try_login():
     else:
         messagebox.showerror("Login Failed", "Incorrect username or password.")
 
-# Create login window
-login = tk.Tk()
-try:
-    login.iconbitmap("NADLOGO.ico")
-except tk.TclError:
-    pass
-login.title("Login")
-login.geometry("300x300")
-
-try:
-    logo_img = Image.open("NADLOGO.png").resize((120, 120))
-    logo = ImageTk.PhotoImage(logo_img)
-    logo_label = tk.Label(login, image=logo)
-    logo_label.image = logo
+def create_login_window():
+    """Build the login window. Only tkinter is needed; the logo is loaded after the first paint."""
+    global login, user_e, pass_e
+    login = tk.Tk()
+    try:
+        login.iconbitmap("NADLOGO.ico")
+    except tk.TclError:
+        pass
+    login.title("Login")
+    login.geometry("300x300")
+
+    logo_label = tk.Label(login)
     logo_label.pack(pady=10)
-except Exception as e:
-    print("Login logo failed to load:", e)
-
-tk.Label(login, text="Username").pack(pady=5)
-user_e = tk.Entry(login); user_e.pack()
-tk.Label(login, text="Password").pack(pady=5)
-pass_e = tk.Entry(login, show="*"); pass_e.pack()
-tk.Button(login, text="Login", command=try_login).pack(pady=15)
-login.mainloop()
\ No newline at end of file
+    after_first_paint(login, lambda: load_logo(logo_label, 120))
+
+    tk.Label(login, text="Username").pack(pady=5)
+    user_e = tk.Entry(login); user_e.pack()
+    tk.Label(login, text="Password").pack(pady=5)
+    pass_e = tk.Entry(login, show="*"); pass_e.pack()
+    tk.Button(login, text="Login", command=try_login).pack(pady=15)
+    user_e.focus_set()
+    return login
+
+if __name__ == "__main__":
+    # Warm up the connection pool while the user logs in
+    prewarm_pool()
+
+    create_login_window()
+    login.mainloop()
\ No newline at end of file
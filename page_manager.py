@@ -0,0 +1,182 @@
+# page_manager.py
+import time
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+
+
+def count_tree_rows(widget):
+    """Top-level Treeview items under `widget`; the bulk of a hidden page's memory."""
+    rows = len(widget.get_children()) if isinstance(widget, ttk.Treeview) else 0
+    return rows + sum(count_tree_rows(child) for child in widget.winfo_children())
+
+
+class Page:
+    """One registered page: how to build it, and its frame once built."""
+    def __init__(self, name, build, tables, max_age, on_evict):
+        self.name = name
+        self.build = build
+        self.tables = frozenset(tables)
+        self.max_age = max_age
+        self.on_evict = on_evict
+        self.frame = None
+        self.refresh = None
+        self.loaded_at = 0.0
+        self.stale = False
+        self.discarded = False
+        self.rows = 0   # Treeview rows held, counted when the page was hidden
+
+
+class PageManager:
+    """
+    Builds each page once into its own frame, stacked in a single grid cell of
+    `container`, and switches pages with tkraise() instead of destroying and
+    rebuilding them. A page that is shown again keeps its widgets, scroll
+    position, search term and entries.
+
+    A hidden page refreshes its data when it is next shown, and only if it is
+    stale: one of its tables was written in the meantime (invalidate()), or it
+    was loaded more than max_age seconds ago (writes from other clients). The
+    visible page keeps itself current after its own writes.
+    Built pages are kept least-recently-shown first; beyond max_pages, or when
+    the hidden pages hold more than max_rows Treeview rows, the oldest are destroyed
+    and rebuilt on their next visit.
+
+    Args:
+        container: frame the pages are stacked in (its children are gridded)
+        max_pages: pages kept alive, the visible one included
+        max_rows: cap on Treeview rows held by hidden pages (None = no cap)
+    """
+    def __init__(self, container, max_pages=5, max_rows=None):
+        self.container = container
+        self.max_pages = max(1, int(max_pages))
+        self.max_rows = max_rows
+        self.current = None
+        self._pages = {}
+        self._built = OrderedDict()  # name -> Page, least recently shown first
+        container.grid_rowconfigure(0, weight=1)
+        container.grid_columnconfigure(0, weight=1)
+        self.builds = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    def add(self, name, build, tables=(), max_age=None, on_evict=None):
+        """
+        Register a page. build(frame) fills a new frame and returns the page's
+        refresh callable, or None for a page without data to reload.
+
+        Args:
+            tables: tables the page shows; writes to them mark it stale
+            max_age: seconds before a hidden page is refreshed anyway (None = never)
+            on_evict: called before the page's frame is destroyed
+        """
+        self._pages[name] = Page(name, build, tables, max_age, on_evict)
+
+    # ---------- Switching ----------
+    def show(self, name):
+        """Raise page `name`, building it on first use and refreshing it if stale."""
+        page = self._pages[name]
+        previous = self._built.get(self.current) if self.current != name else None
+        # Current before building, so the builder can discard() its own page
+        self.current = name
+        self._built[name] = page
+        self._built.move_to_end(name)
+
+        if page.frame is None:
+            frame = tk.Frame(self.container)
+            frame.grid(row=0, column=0, sticky="nsew")
+            page.frame = frame
+            try:
+                page.refresh = page.build(frame)
+            except Exception:
+                self._built.pop(name, None)
+                page.frame = None
+                page.discarded = False
+                frame.destroy()
+                self.current = previous.name if previous is not None else None
+                raise
+            page.loaded_at = time.monotonic()
+            page.stale = False
+            self.builds += 1
+        elif self._is_stale(page):
+            page.stale = False
+            page.loaded_at = time.monotonic()
+            self.refreshes += 1
+            page.refresh()
+
+        page.frame.tkraise()
+        # Keystrokes must not keep going to an entry on the page underneath
+        page.frame.focus_set()
+
+        if previous is not None:
+            if previous.discarded:
+                self._destroy(previous)
+            else:
+                previous.rows = count_tree_rows(previous.frame)
+        self._evict()
+
+    def _is_stale(self, page):
+        if page.refresh is None:
+            return False
+        if page.stale:
+            return True
+        return page.max_age is not None and time.monotonic() - page.loaded_at > page.max_age
+
+    # ---------- Invalidation ----------
+    def invalidate(self, *tables):
+        """Mark hidden pages that show any of `tables` stale (no tables = every hidden page)."""
+        for page in self._built.values():
+            if page.name != self.current and (not tables or page.tables.intersection(tables)):
+                page.stale = True
+
+    def discard(self, name):
+        """Destroy a page so it is rebuilt next time; the visible page goes when another is shown."""
+        page = self._built.get(name)
+        if page is None:
+            return
+        if name == self.current:
+            page.discarded = True
+        else:
+            self._destroy(page)
+
+    def rebuild(self):
+        """Destroy every built page and build the visible one again (e.g. after a theme change)."""
+        current = self.current
+        for page in list(self._built.values()):
+            self._destroy(page)
+        self.current = None
+        if current is not None:
+            self.show(current)
+
+    # ---------- Eviction ----------
+    def _evict(self):
+        hidden = [page for name, page in self._built.items() if name != self.current]
+        rows = sum(page.rows for page in hidden)
+        while hidden and (len(self._built) > self.max_pages
+                          or (self.max_rows is not None and rows > self.max_rows)):
+            page = hidden.pop(0)
+            rows -= page.rows
+            self._destroy(page)
+            self.evictions += 1
+
+    def _destroy(self, page):
+        self._built.pop(page.name, None)
+        if page.on_evict is not None:
+            try:
+                page.on_evict()
+            except Exception as e:
+                print(f"Page {page.name} cleanup error (will continue): {e}")
+        try:
+            page.frame.destroy()
+        except tk.TclError:
+            pass
+        page.frame = None
+        page.refresh = None
+        page.stale = False
+        page.discarded = False
+        page.rows = 0
+
+    def stats(self):
+        return {"built": list(self._built), "current": self.current, "builds": self.builds,
+                "refreshes": self.refreshes, "evictions": self.evictions,
+                "hidden_rows": sum(p.rows for n, p in self._built.items() if n != self.current)}
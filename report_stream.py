@@ -0,0 +1,140 @@
+# report_stream.py
+from dataclasses import dataclass
+from decimal import Decimal
+
+
+@dataclass
+class ReportSpec:
+    """
+    A stored-procedure report for the Reports page.
+
+    Args:
+        procedure: procedure name (one IN parameter)
+        param_label: label for that parameter's entry
+        columns: Treeview column headings, in result-set order
+        total_column: index of the column summed into the running total, or None
+    """
+    procedure: str
+    param_label: str
+    columns: tuple
+    total_column: int = None
+
+
+REPORTS = {
+    "Recent payments": ReportSpec("SummarizeRecentPayments", "Days back",
+                                  ("PaymentID", "AppointmentID", "Amount", "Date"), total_column=2),
+    "Customer history": ReportSpec("CustomerAppointmentHistory", "Customer ID",
+                                   ("Date", "Service", "Rating", "Comments")),
+}
+
+
+def stream_procedure(task, connect, procedure, args, chunk_size=500):
+    """
+    Worker-thread half of a streamed report: CALL `procedure` on an unbuffered
+    cursor and hand its rows to task.report() in chunks of `chunk_size`, instead
+    of fetchall()ing everything first. Stops early when the task is cancelled.
+    Returns the number of rows read.
+
+    connect() must return a dedicated connection, not a pooled one: a cancelled
+    report abandons the rest of its result set and the connection is dropped
+    (returning it to the pool would read every remaining row first).
+
+    (callproc() is not used because it buffers every result set before returning.)
+    """
+    conn = connect()
+    finished = False
+    try:
+        cur = conn.cursor(buffered=False)
+        cur.execute(f"CALL {procedure}({', '.join(['%s'] * len(args))})", tuple(args))
+        count = 0
+        while not task.cancelled:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                finished = True
+                break
+            count += len(rows)
+            task.report(rows)
+        return count
+    finally:
+        if finished:
+            try: conn.close()
+            except Exception: pass
+        else:
+            # Skip reading the rest of an abandoned result set: drop the socket instead
+            try:
+                conn.shutdown()
+            except Exception:
+                try: conn.close()
+                except Exception: pass
+
+
+class ProgressiveTreeFiller:
+    """
+    Tk-thread half of a streamed report: queues the chunks delivered by
+    stream_procedure() and inserts at most `rows_per_tick` of them per after()
+    callback, so the window keeps repainting and responding while a large
+    result arrives. on_stats(count, total) runs after every tick.
+
+    Args:
+        tree: ttk.Treeview to fill (cleared by start())
+        total_column: index of the column to sum, or None
+        on_stats: callback for the running row count and total
+        rows_per_tick: rows inserted per after() callback
+    """
+    def __init__(self, tree, total_column=None, on_stats=None, rows_per_tick=200):
+        self.tree = tree
+        self.total_column = total_column
+        self.on_stats = on_stats
+        self.rows_per_tick = rows_per_tick
+        self._pending = []
+        self._after_id = None
+        self.count = 0
+        self.total = Decimal(0)
+
+    def start(self):
+        self.cancel()
+        self.tree.delete(*self.tree.get_children())
+        self.count = 0
+        self.total = Decimal(0)
+        self._report()
+
+    @property
+    def busy(self):
+        """True while queued rows are still being inserted."""
+        return bool(self._pending) or self._after_id is not None
+
+    def feed(self, rows):
+        """on_progress callback: queue one chunk of rows."""
+        self._pending.extend(rows)
+        if self._after_id is None:
+            self._after_id = self.tree.after(0, self._drain)
+
+    def cancel(self):
+        """Drop rows that have not been inserted yet."""
+        self._pending = []
+        if self._after_id is not None:
+            try:
+                self.tree.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _drain(self):
+        self._after_id = None
+        if not self.tree.winfo_exists():
+            self._pending = []
+            return
+        batch = self._pending[:self.rows_per_tick]
+        del self._pending[:self.rows_per_tick]
+        for row in batch:
+            self.tree.insert('', 'end', values=row)
+            if self.total_column is not None and row[self.total_column] is not None:
+                self.total += Decimal(row[self.total_column])
+        self.count += len(batch)
+        self._report()
+        if self._pending:
+            self._after_id = self.tree.after(1, self._drain)
+
+    def _report(self):
+        if self.on_stats is not None:
+            self.on_stats(self.count, self.total if self.total_column is not None else None)
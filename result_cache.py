@@ -0,0 +1,89 @@
+# result_cache.py
+import threading
+import time
+
+
+class ResultCache:
+    """
+    Cache of loader results keyed by (loader name, arguments), e.g. a dashboard
+    query for one date range.
+
+    Each loader has a TTL (seconds) and the tables it reads. invalidate(table)
+    drops every entry built from that table, so local writes show up at once; the
+    TTL bounds how stale a result can get from writes made elsewhere.
+    Hit / miss counters per loader are kept for tuning (see stats()).
+
+    Args:
+        default_ttl: TTL for loaders without their own
+        ttls: {loader_name: ttl_seconds}
+    """
+    def __init__(self, default_ttl=120, ttls=None):
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self._lock = threading.Lock()
+        self._entries = {}     # (name, args) -> (expires_at, tables, value)
+        self._generation = 0   # bumped by every invalidation
+        self._hits = {}
+        self._misses = {}
+
+    # ---------- Lookups ----------
+    def lookup(self, name, args):
+        """(True, value) for a live entry, else (False, None). Counts a hit or a miss."""
+        key = (name, tuple(args))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._hits[name] = self._hits.get(name, 0) + 1
+                return True, entry[2]
+            if entry is not None:
+                del self._entries[key]
+            self._misses[name] = self._misses.get(name, 0) + 1
+            return False, None
+
+    def store(self, name, args, value, tables=(), generation=None):
+        """
+        Cache `value`. Pass the generation() read before computing it, so a result
+        that raced with an invalidation is not stored.
+        """
+        ttl = self.ttls.get(name, self.default_ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[(name, tuple(args))] = (time.monotonic() + ttl, frozenset(tables), value)
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    # ---------- Invalidation ----------
+    def invalidate(self, *tables):
+        """Drop every entry that reads any of `tables`."""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, e in self._entries.items() if e[1].intersection(tables)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    # ---------- Stats ----------
+    def stats(self):
+        """{'hits', 'misses', 'hit_rate', 'entries', 'loaders': {name: {'hits', 'misses'}}}"""
+        with self._lock:
+            hits, misses = sum(self._hits.values()), sum(self._misses.values())
+            names = set(self._hits) | set(self._misses)
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "entries": len(self._entries),
+                "loaders": {n: {"hits": self._hits.get(n, 0), "misses": self._misses.get(n, 0)}
+                            for n in sorted(names)},
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits.clear()
+            self._misses.clear()
@@ -0,0 +1,124 @@
+# row_cache.py
+import sys
+import threading
+from collections import OrderedDict
+
+from schema_catalog import get_catalog
+
+
+def estimate_row_bytes(row):
+    """Rough in-memory size of one fetched row (tuple plus its values)."""
+    return sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row)
+
+
+class CacheEntry:
+    """Rows a grid had loaded, plus the fingerprint of the tables they came from."""
+    def __init__(self, fingerprint, rows, cursor, exhausted):
+        self.fingerprint = fingerprint
+        self.rows = list(rows)
+        self.cursor = cursor
+        self.exhausted = exhausted
+        self.size = sum(estimate_row_bytes(r) for r in self.rows)
+
+
+class RowCache:
+    """
+    Client-side cache of grid rows shared by every page, so switching back to a
+    page whose tables have not changed skips the row fetch entirely.
+
+    Each entry is stored with a fingerprint of its tables: row count, max primary
+    key and max UpdatedAt (when the table has that column). Together these catch
+    inserts, deletes and updates, and all three are answered from indexes in one
+    round trip. Entries are evicted least-recently-used first once their estimated
+    size passes `max_bytes`.
+
+    Args:
+        get_connection: callable returning a mysql connection
+        max_bytes: memory cap across all tables
+    """
+    def __init__(self, get_connection, max_bytes=32 * 1024 * 1024):
+        self.get_connection = get_connection
+        self.catalog = get_catalog(get_connection)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> CacheEntry, least recently used first
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- Fingerprints ----------
+    def fingerprint_query(self, tables):
+        """One SELECT returning count / max key / max UpdatedAt for each (table, key_column)."""
+        parts = []
+        for table, key in tables:
+            parts.append(f"(SELECT COUNT(*) FROM {table})")
+            parts.append(f"(SELECT MAX({key}) FROM {table})")
+            if self.catalog.has_col(table, "UpdatedAt"):
+                parts.append(f"(SELECT MAX(UpdatedAt) FROM {table})")
+        return "SELECT " + ", ".join(parts)
+
+    def fingerprint(self, cur, tables):
+        """Read the current fingerprint with an open cursor (called from a worker thread)."""
+        cur.execute(self.fingerprint_query(tables))
+        return tuple(cur.fetchone() or ())
+
+    # ---------- Entries ----------
+    def get(self, key, fingerprint):
+        """Cached entry for `key` if its fingerprint still matches, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.fingerprint != fingerprint:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, fingerprint, rows, cursor, exhausted):
+        with self._lock:
+            self._drop(key)
+            entry = CacheEntry(fingerprint, rows, cursor, exhausted)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._size += entry.size
+            self._evict()
+
+    def extend(self, key, fingerprint, rows, cursor, exhausted):
+        """Append a further page to an entry, if it is still the one for `fingerprint`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.fingerprint != fingerprint:
+                return
+            added = sum(estimate_row_bytes(r) for r in rows)
+            entry.rows.extend(rows)
+            entry.cursor = cursor
+            entry.exhausted = exhausted
+            entry.size += added
+            self._size += added
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def discard(self, key):
+        with self._lock:
+            self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size,
+                    "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
@@ -16,6 +16,7 @@ TRUNCATE TABLE Services;
 TRUNCATE TABLE Inventory;
 TRUNCATE TABLE Employees;
 TRUNCATE TABLE Customers;
+TRUNCATE TABLE DailyRevenue; -- rebuilt by the Payments triggers as rows are inserted
 SET FOREIGN_KEY_CHECKS = 1;
 
 -- ==========================
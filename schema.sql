@@ -24,10 +24,18 @@ DROP TRIGGER IF EXISTS log_deleted_appointments;
 DROP TRIGGER IF EXISTS prevent_overbooking;
 DROP TRIGGER IF EXISTS validate_phone_insert;
 DROP TRIGGER IF EXISTS validate_phone_update;
+DROP TRIGGER IF EXISTS rollup_payment_insert;
+DROP TRIGGER IF EXISTS rollup_payment_update;
+DROP TRIGGER IF EXISTS rollup_payment_delete;
+DROP TRIGGER IF EXISTS rollup_appointment_delete;
+DROP TRIGGER IF EXISTS rollup_vehicle_delete;
+DROP TRIGGER IF EXISTS rollup_customer_delete;
 
 DROP PROCEDURE IF EXISTS UpdateAppointmentStatus;
 DROP PROCEDURE IF EXISTS CustomerAppointmentHistory;
 DROP PROCEDURE IF EXISTS SummarizeRecentPayments;
+DROP PROCEDURE IF EXISTS BackfillDailyRevenue;
+DROP PROCEDURE IF EXISTS CheckDailyRevenue;
 
 DROP TABLE IF EXISTS AppointmentAddOns;
 DROP TABLE IF EXISTS AppointmentServices;
@@ -40,6 +48,7 @@ DROP TABLE IF EXISTS Vehicles;
 DROP TABLE IF EXISTS Employees;
 DROP TABLE IF EXISTS Inventory;
 DROP TABLE IF EXISTS DeletedAppointmentsLog;
+DROP TABLE IF EXISTS DailyRevenue;
 DROP TABLE IF EXISTS Customers;
 
 SET FOREIGN_KEY_CHECKS = 1;
@@ -59,9 +68,19 @@ CREATE TABLE Customers (
   ZipCode        VARCHAR(10),
   JoinDate       DATE         NOT NULL DEFAULT (CURRENT_DATE),
   ReferralSource VARCHAR(100),
+  UpdatedAt      TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   CONSTRAINT uq_customers_email UNIQUE (Email)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Sort keys for the customer grid (InnoDB appends CustomerID, giving keyset order)
+CREATE INDEX idx_customers_first ON Customers(FirstName);
+CREATE INDEX idx_customers_last  ON Customers(LastName);
+CREATE INDEX idx_customers_phone ON Customers(Phone);
+-- High-water mark for the client row cache fingerprint
+CREATE INDEX idx_customers_updated ON Customers(UpdatedAt);
+-- Substring search for the customer grid (ngram handles partial names, emails and phones)
+CREATE FULLTEXT INDEX ft_customers_search ON Customers(FirstName, LastName, Email, Phone) WITH PARSER ngram;
+
 -- =====================
 -- Employees
 -- =====================
@@ -90,6 +109,7 @@ CREATE TABLE Vehicles (
   VIN           VARCHAR(50),
   VehicleType   ENUM('sedan','SUV','truck'),
   SpecialNotes  TEXT,
+  UpdatedAt     TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   CONSTRAINT fk_vehicles_customer
     FOREIGN KEY (CustomerID) REFERENCES Customers(CustomerID)
     ON UPDATE CASCADE ON DELETE CASCADE,
@@ -98,6 +118,11 @@ CREATE TABLE Vehicles (
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 CREATE INDEX idx_vehicles_customer ON Vehicles(CustomerID);
+CREATE INDEX idx_vehicles_make     ON Vehicles(Make);
+CREATE INDEX idx_vehicles_model    ON Vehicles(Model);
+CREATE INDEX idx_vehicles_updated  ON Vehicles(UpdatedAt);
+-- Substring search for the vehicle grid (partial plates / VINs)
+CREATE FULLTEXT INDEX ft_vehicles_search ON Vehicles(LicensePlate, VIN) WITH PARSER ngram;
 
 -- =====================
 -- Services & AddOns
@@ -133,6 +158,7 @@ CREATE TABLE Appointments (
   StartTime       TIME         NOT NULL,
   EndTime         TIME         NOT NULL,
   Status          ENUM('scheduled','in progress','completed','canceled') NOT NULL DEFAULT 'scheduled',
+  UpdatedAt       TIMESTAMP    NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   CONSTRAINT fk_appts_customer
     FOREIGN KEY (CustomerID) REFERENCES Customers(CustomerID)
     ON UPDATE CASCADE ON DELETE CASCADE,
@@ -149,6 +175,8 @@ CREATE INDEX idx_appts_customer ON Appointments(CustomerID);
 CREATE INDEX idx_appts_vehicle  ON Appointments(VehicleID);
 CREATE INDEX idx_appts_date     ON Appointments(AppointmentDate);
 CREATE INDEX idx_appts_employee ON Appointments(EmployeeID);
+CREATE INDEX idx_appts_status   ON Appointments(Status);
+CREATE INDEX idx_appts_updated  ON Appointments(UpdatedAt);
 
 -- =====================
 -- AppointmentServices (line items)
@@ -202,6 +230,7 @@ CREATE TABLE Payments (
   PaymentMethod  VARCHAR(50)   NOT NULL,
   TransactionID  VARCHAR(100),
   Status         ENUM('pending','completed','refunded') NOT NULL DEFAULT 'completed',
+  UpdatedAt      TIMESTAMP     NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   CONSTRAINT fk_payments_appt
     FOREIGN KEY (AppointmentID) REFERENCES Appointments(AppointmentID)
     ON UPDATE CASCADE ON DELETE CASCADE
@@ -209,6 +238,19 @@ CREATE TABLE Payments (
 
 CREATE INDEX idx_payments_appt ON Payments(AppointmentID);
 CREATE INDEX idx_payments_date ON Payments(PaymentDate);
+CREATE INDEX idx_payments_updated ON Payments(UpdatedAt);
+
+-- =====================
+-- Daily revenue rollup (maintained by the rollup_* triggers)
+-- =====================
+-- One row per payment date, so dashboard time series read a few hundred rows
+-- instead of every payment. Rebuild with CALL BackfillDailyRevenue(NULL, NULL);
+-- verify with CALL CheckDailyRevenue(NULL, NULL).
+CREATE TABLE DailyRevenue (
+  RevenueDate   DATE          PRIMARY KEY,
+  TotalAmount   DECIMAL(14,2) NOT NULL DEFAULT 0,
+  PaymentCount  INT           NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- =====================
 -- Inventory (standalone)
@@ -353,6 +395,46 @@ BEGIN
   WHERE AppointmentID = pAppointmentID;
 END //
 
+-- Rebuild DailyRevenue from Payments for a date range (NULL = unbounded)
+CREATE PROCEDURE BackfillDailyRevenue(IN pFrom DATE, IN pTo DATE)
+BEGIN
+  START TRANSACTION;
+  DELETE FROM DailyRevenue
+  WHERE (pFrom IS NULL OR RevenueDate >= pFrom)
+    AND (pTo   IS NULL OR RevenueDate <= pTo);
+  INSERT INTO DailyRevenue (RevenueDate, TotalAmount, PaymentCount)
+  SELECT PaymentDate, SUM(Amount), COUNT(*)
+  FROM Payments
+  WHERE (pFrom IS NULL OR PaymentDate >= pFrom)
+    AND (pTo   IS NULL OR PaymentDate <= pTo)
+  GROUP BY PaymentDate;
+  COMMIT;
+END //
+
+-- List dates where DailyRevenue disagrees with Payments (no rows = consistent)
+CREATE PROCEDURE CheckDailyRevenue(IN pFrom DATE, IN pTo DATE)
+BEGIN
+  SELECT RevenueDate,
+         SUM(RollupAmount) AS RollupAmount, SUM(ActualAmount) AS ActualAmount,
+         SUM(RollupCount)  AS RollupCount,  SUM(ActualCount)  AS ActualCount
+  FROM (
+    SELECT RevenueDate, TotalAmount AS RollupAmount, 0 AS ActualAmount,
+           PaymentCount AS RollupCount, 0 AS ActualCount
+    FROM DailyRevenue
+    WHERE (pFrom IS NULL OR RevenueDate >= pFrom)
+      AND (pTo   IS NULL OR RevenueDate <= pTo)
+    UNION ALL
+    SELECT PaymentDate, 0, SUM(Amount), 0, COUNT(*)
+    FROM Payments
+    WHERE (pFrom IS NULL OR PaymentDate >= pFrom)
+      AND (pTo   IS NULL OR PaymentDate <= pTo)
+    GROUP BY PaymentDate
+  ) combined
+  GROUP BY RevenueDate
+  HAVING SUM(RollupAmount) <> SUM(ActualAmount) OR SUM(RollupCount) <> SUM(ActualCount)
+  ORDER BY RevenueDate;
+END //
+
 DELIMITER ;
 
 -- -----------------------------------------------------
@@ -392,6 +474,83 @@ BEGIN
   END IF;
 END //
 
+-- Daily revenue rollup: direct writes to Payments
+CREATE TRIGGER rollup_payment_insert
+AFTER INSERT ON Payments
+FOR EACH ROW
+BEGIN
+  INSERT INTO DailyRevenue (RevenueDate, TotalAmount, PaymentCount)
+  VALUES (NEW.PaymentDate, NEW.Amount, 1)
+  ON DUPLICATE KEY UPDATE TotalAmount  = TotalAmount + NEW.Amount,
+                          PaymentCount = PaymentCount + 1;
+END //
+
+CREATE TRIGGER rollup_payment_update
+AFTER UPDATE ON Payments
+FOR EACH ROW
+BEGIN
+  IF NEW.PaymentDate <> OLD.PaymentDate OR NEW.Amount <> OLD.Amount THEN
+    UPDATE DailyRevenue
+    SET TotalAmount = TotalAmount - OLD.Amount, PaymentCount = PaymentCount - 1
+    WHERE RevenueDate = OLD.PaymentDate;
+    INSERT INTO DailyRevenue (RevenueDate, TotalAmount, PaymentCount)
+    VALUES (NEW.PaymentDate, NEW.Amount, 1)
+    ON DUPLICATE KEY UPDATE TotalAmount  = TotalAmount + NEW.Amount,
+                            PaymentCount = PaymentCount + 1;
+  END IF;
+END //
+
+CREATE TRIGGER rollup_payment_delete
+AFTER DELETE ON Payments
+FOR EACH ROW
+BEGIN
+  UPDATE DailyRevenue
+  SET TotalAmount = TotalAmount - OLD.Amount, PaymentCount = PaymentCount - 1
+  WHERE RevenueDate = OLD.PaymentDate;
+END //
+
+-- Daily revenue rollup: payments removed by ON DELETE CASCADE.
+-- Cascaded deletes do not fire triggers on the child table, so the parent
+-- subtracts its payments before they go.
+CREATE TRIGGER rollup_appointment_delete
+BEFORE DELETE ON Appointments
+FOR EACH ROW FOLLOWS log_deleted_appointments
+BEGIN
+  UPDATE DailyRevenue d
+  JOIN (SELECT PaymentDate, SUM(Amount) AS amt, COUNT(*) AS n
+        FROM Payments
+        WHERE AppointmentID = OLD.AppointmentID
+        GROUP BY PaymentDate) p ON p.PaymentDate = d.RevenueDate
+  SET d.TotalAmount = d.TotalAmount - p.amt, d.PaymentCount = d.PaymentCount - p.n;
+END //
+
+CREATE TRIGGER rollup_vehicle_delete
+BEFORE DELETE ON Vehicles
+FOR EACH ROW
+BEGIN
+  UPDATE DailyRevenue d
+  JOIN (SELECT py.PaymentDate, SUM(py.Amount) AS amt, COUNT(*) AS n
+        FROM Payments py
+        JOIN Appointments a ON a.AppointmentID = py.AppointmentID
+        WHERE a.VehicleID = OLD.VehicleID
+        GROUP BY py.PaymentDate) p ON p.PaymentDate = d.RevenueDate
+  SET d.TotalAmount = d.TotalAmount - p.amt, d.PaymentCount = d.PaymentCount - p.n;
+END //
+
+CREATE TRIGGER rollup_customer_delete
+BEFORE DELETE ON Customers
+FOR EACH ROW
+BEGIN
+  UPDATE DailyRevenue d
+  JOIN (SELECT py.PaymentDate, SUM(py.Amount) AS amt, COUNT(*) AS n
+        FROM Payments py
+        JOIN Appointments a ON a.AppointmentID = py.AppointmentID
+        WHERE a.CustomerID = OLD.CustomerID
+           OR a.VehicleID IN (SELECT VehicleID FROM Vehicles WHERE CustomerID = OLD.CustomerID)
+        GROUP BY py.PaymentDate) p ON p.PaymentDate = d.RevenueDate
+  SET d.TotalAmount = d.TotalAmount - p.amt, d.PaymentCount = d.PaymentCount - p.n;
+END //
+
 -- Phone number validation (10 digits, no symbols): INSERT
 CREATE TRIGGER validate_phone_insert
 BEFORE INSERT ON Customers
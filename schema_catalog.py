@@ -0,0 +1,130 @@
+# schema_catalog.py
+import threading
+import time
+
+
+class SchemaCatalog:
+    """
+    In-memory copy of the current database's tables and columns.
+
+    INFORMATION_SCHEMA is read once (one round trip) and every capability check
+    after that is answered from memory. The catalog re-reads itself only when
+    invalidate() is called, or when `recheck_interval` seconds have passed and a
+    cheap version probe shows the schema changed.
+
+    Args:
+        get_connection: callable returning a mysql connection
+        recheck_interval: seconds between schema version probes (None = once per session)
+    """
+    COLUMNS_QUERY = """
+        SELECT TABLE_NAME, COLUMN_NAME
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+    """
+    VERSION_QUERY = """
+        SELECT COUNT(*), MAX(CREATE_TIME)
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+    """
+
+    def __init__(self, get_connection, recheck_interval=None):
+        self.get_connection = get_connection
+        self.recheck_interval = recheck_interval
+        self._lock = threading.RLock()
+        self._tables = None      # {table_lower: {column_lower, ...}}
+        self._version = None
+        self._checked_at = 0.0
+        self._memo = {}
+
+    # ---------- Loading ----------
+    def _read(self, cur):
+        cur.execute(self.COLUMNS_QUERY)
+        tables = {}
+        for table, column in cur.fetchall():
+            tables.setdefault(str(table).lower(), set()).add(str(column).lower())
+        cur.execute(self.VERSION_QUERY)
+        version = tuple(cur.fetchone() or ())
+        return tables, version
+
+    def load(self):
+        """(Re)read the whole catalog in one connection."""
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            tables, version = self._read(cur)
+            cur.close()
+        finally:
+            conn.close()
+        with self._lock:
+            self._tables = tables
+            self._version = version
+            self._checked_at = time.monotonic()
+            self._memo.clear()
+
+    def _version_changed(self):
+        conn = self.get_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute(self.VERSION_QUERY)
+            version = tuple(cur.fetchone() or ())
+            cur.close()
+        finally:
+            conn.close()
+        return version != self._version
+
+    def ensure_loaded(self):
+        with self._lock:
+            if self._tables is None:
+                self.load()
+                return
+            if self.recheck_interval is None:
+                return
+            if time.monotonic() - self._checked_at < self.recheck_interval:
+                return
+            self._checked_at = time.monotonic()
+            if self._version_changed():
+                self.load()
+
+    def invalidate(self):
+        """Forget everything; the next lookup reloads the catalog."""
+        with self._lock:
+            self._tables = None
+            self._version = None
+            self._memo.clear()
+
+    # ---------- Lookups ----------
+    def has_table(self, table):
+        self.ensure_loaded()
+        return table.lower() in self._tables
+
+    def has_col(self, table, column):
+        self.ensure_loaded()
+        return column.lower() in self._tables.get(table.lower(), ())
+
+    def columns(self, table):
+        self.ensure_loaded()
+        return set(self._tables.get(table.lower(), ()))
+
+    def memo(self, key, compute):
+        """
+        Cache a value derived from the schema (e.g. which query strategy to use).
+        Cleared whenever the catalog reloads.
+        """
+        self.ensure_loaded()
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_catalog(get_connection, recheck_interval=None):
+    """Shared catalog per connection factory, so it outlives any one page or dashboard."""
+    with _catalogs_lock:
+        catalog = _catalogs.get(get_connection)
+        if catalog is None:
+            catalog = SchemaCatalog(get_connection, recheck_interval=recheck_interval)
+            _catalogs[get_connection] = catalog
+        return catalog
@@ -0,0 +1,78 @@
+# search.py
+"""
+Server-side search for the customer and vehicle grids.
+
+Each search is a UNION of index-backed branches, so MySQL can answer it without a
+full table scan:
+  • prefix matches (LIKE 'term%') on indexed columns use a B-tree range read
+  • substring matches use the ngram FULLTEXT indexes (ft_customers_search,
+    ft_vehicles_search) as a phrase query
+The matching keys are joined back to the base table, so the grid pages and
+sorts just the hits.
+"""
+
+MIN_FULLTEXT_LEN = 2  # ngram_token_size default; shorter terms only use prefix matching
+
+
+def escape_like(term):
+    """Escape LIKE wildcards so user input is matched literally."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _phrase(term):
+    # Boolean-mode phrase query; quotes inside the term would end the phrase early
+    return '"' + term.replace('"', " ") + '"'
+
+
+def _union(branches):
+    sql = " UNION ".join(b[0] for b in branches)
+    params = [p for b in branches for p in b[1]]
+    return sql, params
+
+
+def customer_match_sql(term):
+    """(sql, params) selecting CustomerID of customers whose name, email or phone match `term`."""
+    prefix = escape_like(term) + "%"
+    branches = [
+        ("SELECT CustomerID FROM Customers WHERE FirstName LIKE %s", [prefix]),
+        ("SELECT CustomerID FROM Customers WHERE LastName LIKE %s", [prefix]),
+        ("SELECT CustomerID FROM Customers WHERE Email LIKE %s", [prefix]),
+        ("SELECT CustomerID FROM Customers WHERE Phone LIKE %s", [prefix]),
+    ]
+    if len(term) >= MIN_FULLTEXT_LEN:
+        branches.append((
+            "SELECT CustomerID FROM Customers "
+            "WHERE MATCH(FirstName, LastName, Email, Phone) AGAINST (%s IN BOOLEAN MODE)",
+            [_phrase(term)]))
+    return _union(branches)
+
+
+def vehicle_match_sql(term):
+    """(sql, params) selecting VehicleID of vehicles whose plate, VIN or owner's name match `term`."""
+    prefix = escape_like(term) + "%"
+    owners_sql, owners_params = customer_match_sql(term)
+    branches = [
+        ("SELECT VehicleID FROM Vehicles WHERE LicensePlate LIKE %s", [prefix]),
+        ("SELECT VehicleID FROM Vehicles WHERE VIN LIKE %s", [prefix]),
+        (f"SELECT v2.VehicleID FROM ({owners_sql}) owners "
+         "JOIN Vehicles v2 ON v2.CustomerID = owners.CustomerID", owners_params),
+    ]
+    if len(term) >= MIN_FULLTEXT_LEN:
+        branches.append((
+            "SELECT VehicleID FROM Vehicles "
+            "WHERE MATCH(LicensePlate, VIN) AGAINST (%s IN BOOLEAN MODE)",
+            [_phrase(term)]))
+    return _union(branches)
+
+
+def customer_search_source(term):
+    """FROM clause (with params) for CUSTOMER_GRID restricted to matching customers."""
+    hits_sql, params = customer_match_sql(term)
+    return f"({hits_sql}) hits JOIN Customers c ON c.CustomerID = hits.CustomerID", params
+
+
+def vehicle_search_source(term):
+    """FROM clause (with params) for VEHICLE_GRID restricted to matching vehicles."""
+    hits_sql, params = vehicle_match_sql(term)
+    return (f"({hits_sql}) hits JOIN Vehicles v ON v.VehicleID = hits.VehicleID "
+            "JOIN Customers c ON v.CustomerID = c.CustomerID"), params
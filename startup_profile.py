@@ -0,0 +1,157 @@
+# startup_profile.py
+"""
+Startup profile of the login window.
+
+    python startup_profile.py
+    python startup_profile.py --budget-ms 400 --json startup.json
+
+Starts the app in a fresh interpreter under `python -X importtime`, so every
+module's own and cumulative import time is recorded, and times the init phases
+up to an interactive login window:
+  • import     - import nathan_auto_ui (and everything it imports at top level)
+  • build      - create_login_window()
+  • paint      - the first update() that maps and draws it
+After that it loads the dashboard modules the way the main window does on first
+use, to show what the lazy import keeps off the login path.
+
+The run fails (exit 1) when the login window is not interactive within
+--budget-ms, or when one of DEFERRED_MODULES was already imported by then, so a
+new top-level import of matplotlib, customtkinter or PIL is caught.
+Without a DISPLAY it starts Xvfb itself (or run it under xvfb-run).
+"""
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Modules that must not be imported before the login window is interactive
+DEFERRED_MODULES = ("matplotlib", "customtkinter", "PIL", "dashboard")
+
+DEFAULT_BUDGET_MS = 500
+MARKER = "STARTUP_PROFILE "
+
+
+# ---------- Child (the profiled interpreter) ----------
+def run_child():
+    """Time the startup phases in this interpreter and print them as one JSON line."""
+    phases = []
+    def mark(name):
+        phases.append((name, (time.perf_counter() - STARTED) * 1000))
+
+    import nathan_auto_ui as app
+    mark("import")
+    login = app.create_login_window()
+    mark("build")
+    login.update()
+    mark("paint")
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+    try:
+        app.load_dashboard_class()
+        mark("dashboard (deferred)")
+    except ImportError as e:
+        print(f"Dashboard modules not importable: {e}", file=sys.stderr)
+    login.destroy()
+    print(MARKER + json.dumps({"phases": phases, "loaded_before_login": loaded}), flush=True)
+
+
+# ---------- Parent ----------
+def parse_importtime(text):
+    """
+    `-X importtime` lines -> [{"module", "self_ms", "cumulative_ms", "depth"}] in import order.
+    Nesting shows as indentation of the module name (two spaces per level).
+    """
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue   # the header line
+        name = fields[2].rstrip()
+        imports.append({"module": name.strip(),
+                        "self_ms": int(fields[0]) / 1000,
+                        "cumulative_ms": int(fields[1]) / 1000,
+                        "depth": (len(name) - len(name.lstrip()) - 1) // 2})
+    return imports
+
+
+def profile(python=sys.executable, timeout=120):
+    """Run one profiled startup; returns (phases, loaded_before_login, imports, process wall ms)."""
+    started = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", os.path.abspath(__file__), "--child"],
+                          capture_output=True, text=True, timeout=timeout,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    wall = (time.perf_counter() - started) * 1000
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(MARKER)]
+    if proc.returncode != 0 or not lines:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        raise SystemExit("Profiled startup failed:\n" + "\n".join(errors[-20:]))
+    result = json.loads(lines[-1][len(MARKER):])
+    return result["phases"], result["loaded_before_login"], parse_importtime(proc.stderr), wall
+
+
+def report(phases, imports, wall, top):
+    """Print the init phases, this repo's modules and the slowest imports."""
+    print("Init phases (ms since interpreter start, excluding its own startup):")
+    previous = 0.0
+    for name, at in phases:
+        print(f"  {name:24} {at:9.1f}  (+{at - previous:.1f})")
+        previous = at
+    print(f"  {'process wall time':24} {wall:9.1f}")
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    local = [i for i in imports if os.path.exists(os.path.join(here, i["module"] + ".py"))]
+    print("\nThis repo's modules (self / cumulative ms):")
+    for i in local:
+        print(f"  {i['module']:24} {i['self_ms']:9.1f} {i['cumulative_ms']:9.1f}")
+
+    print(f"\nSlowest {top} imports by self time:")
+    for i in sorted(imports, key=lambda i: i["self_ms"], reverse=True)[:top]:
+        print(f"  {i['module']:40} {i['self_ms']:9.1f} {i['cumulative_ms']:9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile startup up to an interactive login window.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="fail when the login window takes longer than this")
+    parser.add_argument("--top", type=int, default=15, help="how many of the slowest imports to list")
+    parser.add_argument("--json", help="write phases and import times here")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child()
+        return 0
+
+    from benchmark import ensure_display
+    ensure_display()
+    phases, loaded, imports, wall = profile()
+    report(phases, imports, wall, args.top)
+
+    interactive = dict(phases)["paint"]
+    failures = []
+    if interactive > args.budget_ms:
+        failures.append(f"login window interactive after {interactive:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if loaded:
+        failures.append(f"imported before the login window: {', '.join(loaded)}")
+    print()
+    for failure in failures:
+        print("FAIL:", failure)
+    if not failures:
+        print(f"OK: login window interactive after {interactive:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"phases": phases, "loaded_before_login": loaded, "wall_ms": wall,
+                       "budget_ms": args.budget_ms, "imports": imports}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
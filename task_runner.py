@@ -0,0 +1,187 @@
+# task_runner.py
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Task:
+    """Handle for one piece of background work submitted to a BackgroundRunner."""
+    def __init__(self, channel, owner, on_done, on_error, on_progress):
+        self.channel = channel
+        self.owner = owner
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._cancel = threading.Event()
+        self._runner = None
+
+    def cancel(self):
+        """Drop this task's result; work that already started is left to finish."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def report(self, value):
+        """Called from the worker thread: deliver `value` to on_progress on the Tk thread."""
+        if self.on_progress is not None and not self.cancelled:
+            self._runner._results.put((self, "progress", value))
+
+
+class BackgroundRunner:
+    """
+    Runs DB work on a small thread pool so the Tk mainloop never blocks.
+
+    Results are handed back to the Tk thread by polling with widget.after(), so
+    callbacks can touch widgets safely. A task's result is dropped when:
+      • it was cancelled,
+      • a newer task was submitted on the same channel (e.g. a new page load), or
+      • its owner widget has been destroyed (e.g. the user navigated away).
+
+    Args:
+        widget: any Tk widget, used for after() scheduling
+        max_workers: number of worker threads
+        poll_ms: how often to check for finished work while tasks are pending
+    """
+    def __init__(self, widget, max_workers=4, poll_ms=30):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._current = {}  # channel -> latest Task
+        self._pending = 0
+        self._polling = False
+        self._busy_listeners = []
+
+    # ---------- Submitting ----------
+    def submit(self, fn, *args, channel=None, owner=None, on_done=None, on_error=None,
+               on_progress=None, pass_task=False):
+        """
+        Run fn(*args) on a worker thread (fn(task, *args) if pass_task is True, so
+        long jobs can check task.cancelled and call task.report()).
+        on_done(result) / on_error(exc) / on_progress(value) run on the Tk thread.
+        Must be called from the Tk thread.
+        """
+        task = Task(channel, owner, on_done, on_error, on_progress)
+        task._runner = self
+        if channel is not None:
+            with self._lock:
+                previous = self._current.get(channel)
+                self._current[channel] = task
+            if previous is not None:
+                previous.cancel()
+
+        was_idle = self._pending == 0
+        self._pending += 1
+        self._pool.submit(self._run, task, fn, args, pass_task)
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.poll_ms, self._poll)
+        if was_idle:
+            self._notify_busy(True)
+        return task
+
+    def _run(self, task, fn, args, pass_task):
+        if task.cancelled:
+            self._results.put((task, "cancelled", None))
+            return
+        try:
+            result = fn(task, *args) if pass_task else fn(*args)
+        except Exception as e:
+            self._results.put((task, "error", e))
+        else:
+            self._results.put((task, "done", result))
+
+    # ---------- Delivering ----------
+    def _is_stale(self, task):
+        if task.cancelled:
+            return True
+        if task.owner is not None:
+            try:
+                return not task.owner.winfo_exists()
+            except Exception:
+                return True
+        return False
+
+    def _poll(self):
+        while True:
+            try:
+                task, kind, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                if not self._is_stale(task):
+                    self._invoke(task.on_progress, payload)
+                continue
+
+            self._pending -= 1
+            if task.channel is not None:
+                with self._lock:
+                    if self._current.get(task.channel) is task:
+                        del self._current[task.channel]
+            if kind == "cancelled" or self._is_stale(task):
+                continue
+            if kind == "done":
+                self._invoke(task.on_done, payload)
+            else:
+                if task.on_error is not None:
+                    self._invoke(task.on_error, payload)
+                else:
+                    print(f"Background task error ({task.channel}): {payload}")
+
+        if self._pending > 0:
+            try:
+                self.widget.after(self.poll_ms, self._poll)
+                return
+            except Exception:
+                pass  # widget is gone; nothing left to deliver to
+        self._polling = False
+        self._notify_busy(False)
+
+    def _invoke(self, callback, value):
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Background task callback error: {e}")
+
+    # ---------- Cancellation / status ----------
+    def cancel(self, channel):
+        """Cancel the latest task on a channel (its result will be dropped)."""
+        with self._lock:
+            task = self._current.pop(channel, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_prefix(self, prefix):
+        """Cancel every channel whose name starts with `prefix`."""
+        with self._lock:
+            names = [name for name in self._current if str(name).startswith(prefix)]
+        for name in names:
+            self.cancel(name)
+
+    def is_busy(self, channel=None):
+        if channel is None:
+            return self._pending > 0
+        with self._lock:
+            return channel in self._current
+
+    def add_busy_listener(self, callback):
+        """callback(busy) is called on the Tk thread when work starts or all work finishes."""
+        self._busy_listeners.append(callback)
+
+    def _notify_busy(self, busy):
+        for callback in list(self._busy_listeners):
+            self._invoke(callback, busy)
+
+    def shutdown(self):
+        with self._lock:
+            tasks = list(self._current.values())
+            self._current.clear()
+        for task in tasks:
+            task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
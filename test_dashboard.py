@@ -0,0 +1,34 @@
+# test_dashboard.py
+from datetime import date
+
+from dashboard import DashboardFrame, trend_bucket
+
+
+class FakeDashboard:
+    """Just enough of a DashboardFrame for its loaders: records the SQL instead of running it."""
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.queries = []
+
+    def _revenue_source(self):
+        return "DailyRevenue", "RevenueDate", "TotalAmount"
+
+    def _fetch(self, query, params=()):
+        self.queries.append((query, params))
+        return self.rows
+
+
+def test_multi_year_trend_groups_by_month_with_a_plain_format():
+    start, end = date(2021, 1, 1), date(2024, 12, 31)
+    assert trend_bucket(start, end) == "month"
+
+    fake = FakeDashboard(rows=[("2021-01-01", 10), ("2021-02-01", 20)])
+    series = DashboardFrame.load_daily_revenue_trend(fake, start, end)
+
+    (query, params), = fake.queries
+    # mysql-connector only substitutes %s; a doubled %% would reach MySQL as-is
+    assert "DATE_FORMAT(RevenueDate, '%Y-%m-01')" in query
+    assert "%%" not in query
+    assert params == (start, end)
+    assert series.bucket == "month"
+    assert series.points == [("2021-01-01", 10.0), ("2021-02-01", 20.0)]
@@ -0,0 +1,236 @@
+# theme.py
+import sys
+import tkinter as tk
+from dataclasses import dataclass
+from tkinter import ttk
+
+# Named ttk style for every Treeview (grids and reports)
+TREEVIEW_STYLE = "App.Treeview"
+
+
+@dataclass(frozen=True)
+class Palette:
+    """Every colour the UI uses in one mode."""
+    mode: str           # "dark" / "light"; also the customtkinter appearance mode
+    bg: str
+    fg: str
+    entry_bg: str
+    select_bg: str      # selections, focus rings and borders
+    disabled_fg: str
+    button_bg: str
+    button_active: str
+    nav_bg: str
+    nav_active: str
+    panel_bg: str       # placeholder cards
+    muted_fg: str
+    accent: str         # busy indicator
+    notice: str
+    warning: str
+    error: str
+    danger_bg: str
+    danger_fg: str
+    chart_bg: str       # matplotlib figure
+    chart_ax: str
+    chart_fg: str
+    chart_grid: str
+
+
+THEMES = {
+    "dark": Palette(
+        mode="dark", bg="#1e1e1e", fg="#ffffff", entry_bg="#2a2a2a", select_bg="#3a3a3a",
+        disabled_fg="#9a9a9a", button_bg="#3a3a3a", button_active="#555555",
+        nav_bg="#444444", nav_active="#555555", panel_bg="#2a2a2a", muted_fg="#d3d3d3",
+        accent="#FF9800", notice="#ffff00", warning="#ffa500", error="#ff0000",
+        danger_bg="#b00020", danger_fg="#ffffff",
+        chart_bg="#242424", chart_ax="#1e1e1e", chart_fg="#eaeaea", chart_grid="#666666"),
+    "light": Palette(
+        mode="light", bg="#f0f0f0", fg="#000000", entry_bg="#ffffff", select_bg="#c8c8c8",
+        disabled_fg="#6d6d6d", button_bg="#e1e1e1", button_active="#cfcfcf",
+        nav_bg="#d6d6d6", nav_active="#c4c4c4", panel_bg="#ffffff", muted_fg="#444444",
+        accent="#e65100", notice="#8a6d00", warning="#d35400", error="#c62828",
+        danger_bg="#b00020", danger_fg="#ffffff",
+        chart_bg="#ffffff", chart_ax="#ffffff", chart_fg="#000000", chart_grid="#cccccc"),
+}
+
+
+# ---------- Style tables ----------
+def option_table(p):
+    """
+    Tk option database entries (by option name, so e.g. selectForeground is not
+    caught by a Background class pattern). Plain tk widgets read them when created.
+    """
+    return [
+        ("*background", p.bg),
+        ("*foreground", p.fg),
+        ("*highlightBackground", p.bg),
+        ("*highlightColor", p.select_bg),
+        ("*activeBackground", p.button_active),
+        ("*activeForeground", p.fg),
+        ("*disabledForeground", p.disabled_fg),
+        ("*selectBackground", p.select_bg),
+        ("*selectForeground", p.fg),
+        ("*insertBackground", p.fg),
+        ("*troughColor", p.entry_bg),
+        ("*selectColor", p.bg),
+        ("*Entry.background", p.entry_bg),
+        ("*Entry.relief", "flat"),
+        ("*Entry.borderWidth", 1),
+        ("*Text.background", p.entry_bg),
+        ("*Text.relief", "flat"),
+        ("*Spinbox.background", p.entry_bg),
+        ("*Listbox.background", p.entry_bg),
+        ("*Button.background", p.button_bg),
+        ("*Button.relief", "flat"),
+        ("*Button.borderWidth", 1),
+        ("*Menubutton.background", p.button_bg),
+        ("*Menu.background", p.entry_bg),
+    ]
+
+
+def ttk_styles(p):
+    """{style name: (configure options, state map)}; ttk widgets follow changes live."""
+    return {
+        ".": ({"background": p.bg, "foreground": p.fg},
+              {"background": [("!disabled", p.bg)], "foreground": [("!disabled", p.fg)]}),
+        "TFrame": ({"background": p.bg}, {}),
+        "TLabel": ({"background": p.bg, "foreground": p.fg}, {}),
+        "TLabelframe": ({"background": p.bg, "bordercolor": p.select_bg}, {}),
+        "TLabelframe.Label": ({"background": p.bg, "foreground": p.fg}, {}),
+        "Theme.TEntry": ({"fieldbackground": p.entry_bg, "background": p.entry_bg, "foreground": p.fg,
+                          "bordercolor": p.select_bg, "lightcolor": p.select_bg, "darkcolor": p.select_bg,
+                          "padding": 3},
+                         {"fieldbackground": [("readonly", p.entry_bg), ("focus", p.entry_bg)],
+                          "foreground": [("disabled", p.fg), ("!disabled", p.fg)]}),
+        "TButton": ({"background": p.nav_bg, "foreground": p.fg, "bordercolor": p.select_bg,
+                     "relief": "flat", "padding": (8, 4)},
+                    {"background": [("active", p.nav_active), ("!active", p.nav_bg)],
+                     "foreground": [("!disabled", p.fg)]}),
+        "Nav.TButton": ({"background": p.nav_bg, "foreground": p.fg, "bordercolor": p.select_bg,
+                         "relief": "flat", "padding": (10, 6)},
+                        {"background": [("pressed", p.nav_active), ("active", p.nav_active),
+                                        ("!active", p.nav_bg)],
+                         "foreground": [("!disabled", p.fg)]}),
+        TREEVIEW_STYLE: ({"background": p.bg, "fieldbackground": p.bg, "foreground": p.fg,
+                          "bordercolor": p.select_bg, "rowheight": 25},
+                         {"background": [("selected", p.nav_active), ("!selected", p.bg)],
+                          "foreground": [("selected", p.fg), ("!selected", p.fg)]}),
+        "Treeview.Heading": ({"background": p.nav_bg, "foreground": p.fg, "relief": "flat",
+                              "bordercolor": p.select_bg},
+                             {"background": [("active", p.nav_active), ("!active", p.nav_bg)],
+                              "foreground": [("!disabled", p.fg)]}),
+    }
+
+
+# Colours for widgets that differ from their class default, by role
+ROLES = {
+    "surface": lambda p: {"bg": p.bg, "highlightbackground": p.bg, "highlightcolor": p.bg},
+    "nav": lambda p: {"bg": p.nav_bg, "fg": p.fg, "activebackground": p.nav_active, "activeforeground": p.fg},
+    "danger": lambda p: {"bg": p.danger_bg, "fg": p.danger_fg},
+    "accent": lambda p: {"bg": p.bg, "fg": p.accent},
+    "notice": lambda p: {"bg": p.bg, "fg": p.notice},
+    "warning": lambda p: {"bg": p.bg, "fg": p.warning},
+    "error": lambda p: {"bg": p.bg, "fg": p.error},
+    "panel": lambda p: {"bg": p.panel_bg},
+    "panel_title": lambda p: {"bg": p.panel_bg, "fg": p.fg},
+    "panel_text": lambda p: {"bg": p.panel_bg, "fg": p.muted_fg},
+}
+
+
+class Theme:
+    """
+    The active palette and the tables built from it.
+
+    install() writes the option database for a root window, so plain tk widgets
+    are created already themed; install_styles() configures the named ttk
+    styles. use() swaps the palette and rewrites both tables: ttk widgets,
+    customtkinter widgets and widgets made by the factory methods (frame(),
+    label(), button()) follow at once, while plain tk widgets keep the colours
+    they were created with until they are rebuilt.
+
+    Args:
+        name: key of THEMES to start with
+    """
+    def __init__(self, name="dark"):
+        self.palette = THEMES[name]
+        self._root = None
+        self._style = None
+        self._styled = []   # (widget, role) made by the factory
+        self._prune_at = 200
+
+    @property
+    def name(self):
+        return self.palette.mode
+
+    @property
+    def is_dark(self):
+        return self.palette.mode == "dark"
+
+    def install(self, root):
+        """Write the option database for `root`; call before building its widgets."""
+        self._root = root
+        self._write_options()
+
+    def install_styles(self):
+        """Configure the named ttk styles (once; later palettes are applied by use())."""
+        if self._style is not None:
+            return
+        self._style = ttk.Style(self._root)
+        self._style.theme_use("clam")
+        self._style.layout(TREEVIEW_STYLE, [("Treeview.treearea", {"sticky": "nswe"})])
+        self._write_styles()
+
+    def use(self, name):
+        """Switch to THEMES[name]."""
+        self.palette = THEMES[name]
+        if self._root is None:
+            return
+        self._write_options()
+        if self._style is not None:
+            self._write_styles()
+        self._prune()
+        for widget, role in self._styled:
+            widget.configure(**ROLES[role](self.palette))
+
+    def _write_options(self):
+        for pattern, value in option_table(self.palette):
+            self._root.option_add(pattern, value)
+        self._root.configure(bg=self.palette.bg)
+        ctk = sys.modules.get("customtkinter")
+        if ctk is not None:
+            ctk.set_appearance_mode(self.palette.mode)
+
+    def _write_styles(self):
+        for name, (options, state_map) in ttk_styles(self.palette).items():
+            self._style.configure(name, **options)
+            if state_map:
+                self._style.map(name, **state_map)
+
+    # ---------- Widget factory ----------
+    def _make(self, cls, parent, role, options):
+        if role is None:
+            return cls(parent, **options)
+        widget = cls(parent, **{**ROLES[role](self.palette), **options})
+        self._styled.append((widget, role))
+        if len(self._styled) >= self._prune_at:
+            self._prune()
+            self._prune_at = max(200, 2 * len(self._styled))
+        return widget
+
+    def _prune(self):
+        alive = []
+        for widget, role in self._styled:
+            try:
+                if widget.winfo_exists():
+                    alive.append((widget, role))
+            except tk.TclError:
+                pass
+        self._styled = alive
+
+    def frame(self, parent, role=None, **options):
+        return self._make(tk.Frame, parent, role, options)
+
+    def label(self, parent, role=None, **options):
+        return self._make(tk.Label, parent, role, options)
+
+    def button(self, parent, role=None, **options):
+        return self._make(tk.Button, parent, role, options)
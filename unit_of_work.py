@@ -0,0 +1,175 @@
+# unit_of_work.py
+import threading
+from dataclasses import dataclass, field
+
+import mysql.connector
+
+# Errors after which MySQL has rolled back (or lost) the whole transaction, not just the statement
+TRANSACTION_ERRORS = {
+    1205,   # lock wait timeout (the whole transaction with innodb_rollback_on_timeout)
+    1213,   # deadlock
+    2006,   # server has gone away
+    2013,   # lost connection during query
+    2055,   # lost connection (SSL / socket)
+}
+
+# SIGNAL SQLSTATE '45000' from a trigger (phone validation, overbooking); its message is the reason
+TRIGGER_SIGNAL = 1644
+
+
+@dataclass
+class PendingWrite:
+    """
+    One queued INSERT/UPDATE/DELETE.
+
+    Args:
+        query: SQL with %s placeholders
+        params: values for the placeholders
+        label: what the row is, for error reports (e.g. "Add customer Jane Doe")
+        tables: tables the write changes
+        on_done: called with the new row id (inserts) or True after the write is committed
+        on_error: called with the error message if the write was rejected
+    """
+    query: str
+    params: tuple
+    label: str
+    tables: tuple = ()
+    on_done: object = None
+    on_error: object = None
+
+
+@dataclass
+class FlushResult:
+    """
+    What one flush() did.
+
+    saved: [(write, row id or True)] committed together
+    failed: [(write, message)] rejected rows, dropped from the queue
+    error: set when the transaction itself failed; nothing was saved and every write is still queued
+    """
+    saved: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+    error: str = None
+
+    @property
+    def tables(self):
+        """Tables changed by the committed writes."""
+        return tuple({t for write, _ in self.saved for t in write.tables})
+
+
+def describe_error(err):
+    """A per-row reason: the trigger's own message for SIGNALs, otherwise the full MySQL error."""
+    if getattr(err, "errno", None) == TRIGGER_SIGNAL and err.msg:
+        return err.msg
+    return str(err)
+
+
+class UnitOfWork:
+    """
+    Queues writes from the forms and saves them in one transaction per flush().
+
+    Writes run in the order they were added. A write that MySQL rejects (a
+    trigger SIGNAL, a foreign key, a duplicate) only rolls back its own
+    statement, so it is reported and dropped while the rest of the batch is
+    committed. If the transaction itself fails (deadlock, lost connection,
+    commit error) it is rolled back and every write stays queued for the next
+    flush.
+
+    add() and pending may be used from the Tk thread while flush() runs on a
+    worker; writes added during a flush wait for the next one. Only one flush
+    runs at a time.
+
+    Args:
+        get_connection: returns a (pooled) connection; close() gives it back
+    """
+    def __init__(self, get_connection):
+        self.get_connection = get_connection
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._queue = []
+        self.flushes = 0
+        self.saved = 0
+        self.rejected = 0
+
+    # ---------- Queue ----------
+    def add(self, query, params, label, tables=(), on_done=None, on_error=None):
+        """Queue one write; returns its PendingWrite."""
+        write = PendingWrite(query, tuple(params), label, tuple(tables), on_done, on_error)
+        with self._lock:
+            self._queue.append(write)
+        return write
+
+    @property
+    def pending(self):
+        """Number of queued writes (including any in a running flush)."""
+        with self._lock:
+            return len(self._queue)
+
+    def discard(self):
+        """Drop every queued write; returns them."""
+        with self._lock:
+            dropped, self._queue = self._queue, []
+        return dropped
+
+    # ---------- Flushing ----------
+    def flush(self):
+        """Save the queued writes in one transaction; returns a FlushResult. Safe on a worker thread."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._queue)
+            result = FlushResult()
+            if not batch:
+                return result
+
+            conn = cur = None
+            try:
+                conn = self.get_connection()
+                cur = conn.cursor()
+                for write in batch:
+                    try:
+                        cur.execute(write.query, write.params)
+                        result.saved.append((write, cur.lastrowid or True))
+                    except mysql.connector.Error as err:
+                        if err.errno in TRANSACTION_ERRORS or isinstance(err, mysql.connector.InterfaceError):
+                            raise
+                        # The failed statement rolled back itself; the rest of the batch is intact
+                        result.failed.append((write, describe_error(err)))
+                conn.commit()
+            except Exception as err:
+                try:
+                    if conn is not None:
+                        conn.rollback()
+                except Exception:
+                    pass
+                return FlushResult(error=str(err))
+            finally:
+                for handle in (cur, conn):
+                    try: handle.close()
+                    except Exception: pass
+
+            done = {id(write) for write, _ in result.saved + result.failed}
+            with self._lock:
+                self._queue = [w for w in self._queue if id(w) not in done]
+            self.flushes += 1
+            self.saved += len(result.saved)
+            self.rejected += len(result.failed)
+            return result
+
+    def deliver(self, result):
+        """Run the writes' on_done / on_error callbacks for `result` (on the Tk thread)."""
+        for write, row_id in result.saved:
+            self._call(write.on_done, row_id)
+        for write, message in result.failed:
+            self._call(write.on_error, message)
+
+    def _call(self, callback, value):
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Write callback error (will continue): {e}")
+
+    def stats(self):
+        return {"pending": self.pending, "flushes": self.flushes,
+                "saved": self.saved, "rejected": self.rejected}